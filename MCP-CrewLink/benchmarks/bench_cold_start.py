@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Cold-start regression check: fails when importing main.py exceeds a budget.
+
+Times `import main` and `python main.py --help` in fresh interpreters and
+checks that none of the heavy dependencies main.py defers (CrewAI, LiteLLM,
+OpenAI, WandB, MCP) are imported eagerly. Exits with status 1 on a regression,
+so it can run in CI.
+
+Usage:
+    python benchmarks/bench_cold_start.py --runs 5 --budget-ms 800
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+from startup import DEFERRED_MODULES  # noqa: E402
+
+CHECK_EAGER = (
+    "import sys, json, main\n"
+    f"print(json.dumps([name for name in {list(DEFERRED_MODULES)!r} if name in sys.modules]))"
+)
+
+
+def time_command(command, runs):
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter starts per measurement (median is used)")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "800")),
+                        help="Maximum median time for `import main` (default: COLD_START_BUDGET_MS or 800)")
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.runs)
+    import_main = time_command([sys.executable, "-c", "import main"], args.runs)
+    help_time = time_command([sys.executable, "main.py", "--help"], args.runs)
+    eager = json.loads(subprocess.run(
+        [sys.executable, "-c", CHECK_EAGER], cwd=PROJECT_DIR, check=True, capture_output=True, text=True
+    ).stdout.strip().splitlines()[-1])
+
+    print(f"⏱️ Median of {args.runs} cold starts")
+    print(f"python -c pass           {baseline:8.1f} ms")
+    print(f"import main              {import_main:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"main.py --help           {help_time:8.1f} ms")
+
+    failures = []
+    if import_main > args.budget_ms:
+        failures.append(f"import main took {import_main:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if eager:
+        failures.append(f"deferred modules imported eagerly: {', '.join(eager)}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        print("💡 Run `python main.py --profile-startup` for the import-time breakdown")
+        sys.exit(1)
+    print("✅ Cold start within budget, heavy imports deferred")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Wall-clock comparison of the sequential and parallel research crews.
+
+Runs the same topic/query through a resident worker in each crew mode
+(CREW_MODE / the job's "crew_mode") and reports the crew execution time
+and LLM usage per mode. Needs live LLM and search API keys; the run cache
+is disabled so every run goes through the crew.
+
+Usage:
+    python benchmarks/bench_crew_modes.py
+    python benchmarks/bench_crew_modes.py --runs 3 --topic "Vector databases"
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PROJECT_DIR, "main.py")
+
+CREW_MODES = ("sequential", "parallel")
+
+
+def run_jobs(jobs):
+    env = dict(os.environ)
+    env["RUN_CACHE_ENABLED"] = "false"
+    env.setdefault("WANDB_MODE", "disabled")
+    process = subprocess.Popen(
+        [sys.executable, MAIN_SCRIPT, "--worker"],
+        cwd=PROJECT_DIR,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    responses = []
+    try:
+        for job in jobs:
+            process.stdin.write(json.dumps(job) + "\n")
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            if not response.get("success"):
+                raise RuntimeError(f"{job['crew_mode']} job failed: {response.get('error')}")
+            responses.append(response)
+    finally:
+        process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+        process.stdin.close()
+        process.wait(timeout=60)
+    return responses
+
+
+def usage_totals(response):
+    tasks = response.get("llm_usage", {}).values()
+    return {
+        "llm_calls": sum(task.get("llm_calls", 0) for task in tasks),
+        "tokens": sum(task.get("prompt_tokens", 0) + task.get("completion_tokens", 0) for task in tasks),
+        "cost_usd": sum(task.get("cost_usd", 0.0) for task in tasks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1, help="Runs per crew mode")
+    parser.add_argument("--topic", default="Model Context Protocol")
+    parser.add_argument("--query", default="How does MCP work and what are its key components?")
+    args = parser.parse_args()
+
+    # Alternate the modes so both see the same API conditions
+    jobs = [
+        {"id": f"{mode}-{run}", "topic": args.topic, "query": args.query, "crew_mode": mode}
+        for run in range(args.runs) for mode in CREW_MODES
+    ]
+    responses = run_jobs(jobs)
+
+    print(f"⏱️ {args.runs} run(s) per crew mode of '{args.topic}'")
+    print(f"{'mode':<12}{'median time':>13}{'LLM calls':>11}{'tokens':>10}{'cost':>10}")
+    medians = {}
+    for mode in CREW_MODES:
+        mode_responses = [response for response in responses if response.get("crew_mode") == mode]
+        times = [response["execution_time"] for response in mode_responses]
+        totals = [usage_totals(response) for response in mode_responses]
+        medians[mode] = statistics.median(times)
+        print(f"{mode:<12}{medians[mode]:>11.2f} s"
+              f"{statistics.median(total['llm_calls'] for total in totals):>11.0f}"
+              f"{statistics.median(total['tokens'] for total in totals):>10.0f}"
+              f"{statistics.median(total['cost_usd'] for total in totals):>9.4f}$")
+    print(f"speedup of the parallel crew: {medians['sequential'] / medians['parallel']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
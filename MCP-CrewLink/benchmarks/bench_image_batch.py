@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark image generation: serial `generate_image` calls vs. one `generate_images` call.
+
+Runs against the local fake Images API from bench_image_server.py with a
+fixed per-request latency and the image cache disabled. With a model that
+accepts n > 1, the variants of a prompt come from a single request.
+
+Usage:
+    python benchmarks/bench_image_batch.py --prompts 4 --variants 2 --latency-ms 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_image_server import start_fake_images_api  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=4, help="Number of distinct prompts")
+    parser.add_argument("--variants", type=int, default=2, help="Variants per prompt")
+    parser.add_argument("--latency-ms", type=float, default=1000.0, help="Simulated Images API latency")
+    parser.add_argument("--model", default="gpt-image-1", help="Image model (dall-e-3 allows one image per request)")
+    args = parser.parse_args()
+
+    server, url = start_fake_images_api(args.latency_ms / 1000)
+    os.environ.update({
+        "OPENAI_BASE_URL": url,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "benchmark"),
+        "IMAGE_CACHE_ENABLED": "false",
+        "IMAGE_CONCURRENCY": str(args.prompts * args.variants),
+    })
+
+    from research_tools import ImageBatchTool, ImageGenerateTool
+    import run_outputs
+
+    with tempfile.TemporaryDirectory() as images_dir:
+        run_outputs.images_dir = images_dir
+        image_tool = ImageGenerateTool(image_model=args.model)
+        batch_tool = ImageBatchTool(image_tool=image_tool)
+        prompts = [f"model context protocol diagram {i}" for i in range(args.prompts)]
+
+        start_time = time.perf_counter()
+        for i, prompt in enumerate(prompts):
+            for variant in range(args.variants):
+                image_tool._run(prompt, f"serial_{i}_{variant}")
+        serial_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = batch_tool._run([
+            {"prompt": prompt, "filename": f"batch_{i}", "variants": args.variants}
+            for i, prompt in enumerate(prompts)
+        ])
+        batch_time = time.perf_counter() - start_time
+        saved = len([name for name in os.listdir(images_dir) if name.startswith("batch_")])
+
+    images = args.prompts * args.variants
+    print(f"⏱️ {images} images ({args.prompts} prompts x {args.variants} variants) at {args.latency_ms:.0f} ms per request, {args.model}")
+    print(f"serial generate_image  {serial_time:6.2f} s  ({images} tool calls)")
+    print(f"generate_images        {batch_time:6.2f} s  (1 tool call, {saved} images saved)")
+    print(f"🚀 Speedup: {serial_time / batch_time:.1f}x")
+    if saved != images:
+        print(f"❌ Expected {images} images:\n{result}")
+        sys.exit(1)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
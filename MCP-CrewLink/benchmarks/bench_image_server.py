@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent image_creation_openai calls against the MCP image server.
+
+Starts a local fake Images API with a fixed latency, launches
+servers/image_server.py over stdio pointed at it (cache disabled), and sends
+N concurrent generations through one MCP session: once with a single
+generation slot (serialized, like the old blocking tool) and once with N
+slots. With N slots the batch should take about one request's latency.
+
+Usage:
+    python benchmarks/bench_image_server.py --images 8 --latency-ms 1000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from mcp_sessions import MCPSessionManager, result_text  # noqa: E402
+
+# Smallest valid PNG (1x1 transparent pixel)
+PNG_BASE64 = base64.b64encode(bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)).decode("ascii")
+
+
+class FakeImagesHandler(BaseHTTPRequestHandler):
+    response_delay = 1.0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.response_delay)
+        images = [{"b64_json": PNG_BASE64}] * int(request.get("n") or 1)
+        body = json.dumps({"created": int(time.time()), "data": images}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_images_api(response_delay):
+    handler = type("Handler", (FakeImagesHandler,), {"response_delay": response_delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+async def generate_batch(manager, images):
+    async def generate(i):
+        result = await manager.acall_tool("image", "image_creation_openai", {
+            "query": f"benchmark image {i}", "image_name": f"bench_{i}"
+        })
+        return json.loads(result_text(result))
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*[generate(i) for i in range(images)])
+    elapsed = time.perf_counter() - start_time
+    failed = [result.get("error") for result in results if not result.get("success")]
+    if failed:
+        raise RuntimeError(f"{len(failed)} generations failed: {failed[0]}")
+    return elapsed
+
+
+def measure(url, output_dir, images, concurrency):
+    manager = MCPSessionManager(servers={"image": {
+        "command": sys.executable,
+        "args": [os.path.join(PROJECT_DIR, "servers", "image_server.py")],
+        "env": {
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": url,
+            "IMAGE_CACHE_ENABLED": "false",
+            "IMAGE_SERVER_OUTPUT_DIR": output_dir,
+            "IMAGE_SERVER_CONCURRENCY": str(concurrency),
+        },
+    }})
+    try:
+        # Start the server and warm up the client before timing
+        manager.list_tools("image")
+        asyncio.run(generate_batch(manager, 1))
+        return asyncio.run(generate_batch(manager, images))
+    finally:
+        manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=8, help="Concurrent generations")
+    parser.add_argument("--latency-ms", type=float, default=1000.0, help="Simulated Images API latency")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    server, url = start_fake_images_api(latency)
+    with tempfile.TemporaryDirectory() as output_dir:
+        serialized = measure(url, output_dir, args.images, 1)
+        concurrent = measure(url, output_dir, args.images, args.images)
+    server.shutdown()
+
+    print(f"⏱️ {args.images} concurrent generations at {args.latency_ms:.0f} ms each")
+    print(f"{'1 slot (serialized)':<22} {serialized:6.2f} s  ({serialized / latency:.1f}x latency)")
+    print(f"{f'{args.images} slots':<22} {concurrent:6.2f} s  ({concurrent / latency:.1f}x latency)")
+    print(f"🚀 Speedup: {serialized / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
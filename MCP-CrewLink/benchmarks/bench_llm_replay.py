@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Offline research benchmark: replay recorded LLM responses through a resident worker.
+
+Record once (online, pays for the LLM calls and fills the search and image
+caches), then replay any number of times without LLM calls. Replayed runs
+are deterministic, so their wall time measures everything but the LLM.
+A replayed call with no recorded response fails the job (LLMCacheMiss).
+
+Usage:
+    python benchmarks/bench_llm_replay.py --record
+    python benchmarks/bench_llm_replay.py --runs 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PROJECT_DIR, "main.py")
+DEFAULT_RECORDING = os.path.join(PROJECT_DIR, "cache", "llm_replay.sqlite3")
+
+
+def _worker_env(mode, recording):
+    env = dict(os.environ)
+    env.update({
+        "LLM_CACHE_MODE": mode,
+        "LLM_CACHE_PATH": recording,
+        # Searches and images of the recorded run are served from their caches
+        "SEARCH_CACHE_ENABLED": "true",
+        "SEARCH_CACHE_TTL": str(10 * 365 * 24 * 3600),
+        "IMAGE_CACHE_ENABLED": "true",
+        # Every run must go through the crew, not the run cache
+        "RUN_CACHE_ENABLED": "false",
+    })
+    env.setdefault("WANDB_MODE", "disabled")
+    return env
+
+
+def run_jobs(mode, recording, job, runs):
+    process = subprocess.Popen(
+        [sys.executable, MAIN_SCRIPT, "--worker"],
+        cwd=PROJECT_DIR,
+        env=_worker_env(mode, recording),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    responses = []
+    try:
+        for _ in range(runs):
+            process.stdin.write(json.dumps(job) + "\n")
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            if not response.get("success"):
+                raise RuntimeError(f"{mode} job failed: {response.get('error')}")
+            responses.append(response)
+    finally:
+        process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+        process.stdin.close()
+        process.wait(timeout=60)
+    return responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--record", action="store_true", help="Run once against the live LLM and record its responses")
+    parser.add_argument("--runs", type=int, default=3, help="Replayed runs")
+    parser.add_argument("--recording", default=DEFAULT_RECORDING, help="SQLite file of recorded responses")
+    parser.add_argument("--topic", default="Model Context Protocol")
+    parser.add_argument("--query", default="How does MCP work and what are its key components?")
+    args = parser.parse_args()
+
+    job = {"topic": args.topic, "query": args.query}
+    if args.record:
+        response = run_jobs("record", args.recording, job, 1)[0]
+        stats = response.get("llm_cache", {})
+        print(f"📼 Recorded {stats.get('llm_cache_stores', 0)} LLM responses in {response['execution_time']:.2f} s")
+        print(f"   {args.recording}")
+        return
+
+    if not os.path.exists(args.recording):
+        sys.exit(f"❌ No recording at {args.recording}; run with --record first")
+    responses = run_jobs("replay", args.recording, job, args.runs)
+    times = [response["execution_time"] for response in responses]
+    live_calls = sum(
+        task.get("llm_calls", 0) for response in responses for task in response.get("llm_usage", {}).values()
+    )
+    # Cache counters accumulate over the worker's jobs
+    stats = responses[-1].get("llm_cache", {})
+    hits = stats.get("llm_cache_hits", 0)
+    saved = stats.get("llm_cache_time_saved", 0.0) / args.runs
+
+    print(f"⏱️ {args.runs} replayed runs of '{args.topic}'")
+    print(f"median run time        {statistics.median(times):6.2f} s  (min {min(times):.2f} s, max {max(times):.2f} s)")
+    print(f"LLM time replayed      {saved:6.2f} s per run")
+    print(f"replayed LLM calls     {hits:6d}")
+    print(f"live LLM calls         {live_calls:6d}")
+    if live_calls:
+        print("❌ Replayed runs made live LLM calls")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
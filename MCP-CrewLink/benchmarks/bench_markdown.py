@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark report rendering: legacy format_content_for_display vs. markdown_renderer.
+
+Builds a synthetic markdown report of the requested size (headers, lists,
+tables, code blocks and long paragraphs) and times the old string-replace
+formatter, a cold single-pass render and a cached render of the same content.
+
+Usage:
+    python benchmarks/bench_markdown.py --size-mb 2 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from markdown_renderer import render_markdown, render_markdown_cached  # noqa: E402
+
+SECTION = """## Section {n}: Findings
+
+Model Context Protocol servers expose **tools**, *resources* and prompts over `stdio`.
+See [the specification](https://modelcontextprotocol.io/specification) for details.
+
+KEY POINTS:
+- Transport is JSON-RPC 2.0
+- Servers advertise capabilities
+  - Tools are invoked by name
+  - Resources are read by URI
+1. Start the server
+2. Initialize the session
+
+| Component | Role | Latency |
+|:----------|:-----|--------:|
+| Client | Sends requests | 12 ms |
+| Server | Runs tools | 48 ms |
+
+```python
+session = ClientSession(read, write)
+await session.initialize()
+```
+
+> Findings in this section were gathered from {n} sources.
+
+"""
+
+
+def legacy_format_content_for_display(content):
+    """The formatter used before markdown_renderer, kept for comparison."""
+    formatted = content.replace('\n\n', '</p><p>')
+    formatted = formatted.replace('\n', '<br>')
+
+    lines = content.split('\n')
+    formatted_lines = []
+
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            if (stripped.endswith(':') and len(stripped) < 100) or \
+               stripped.startswith('#') or \
+               (stripped.isupper() and len(stripped.split()) <= 10 and len(stripped) < 50):
+                formatted_lines.append(f'<h3 style="color: #2563eb; font-weight: bold; margin: 16px 0 8px 0;">{stripped}</h3>')
+            elif stripped.startswith(('- ', '• ', '* ')):
+                formatted_lines.append(f'<li style="margin: 4px 0;">{stripped[2:]}</li>')
+            elif any(stripped.startswith(f'{i}.') for i in range(1, 20)):
+                formatted_lines.append(f'<li style="margin: 4px 0;">{stripped}</li>')
+            else:
+                formatted_lines.append(f'<p style="margin: 8px 0; line-height: 1.6;">{stripped}</p>')
+        else:
+            formatted_lines.append('<br>')
+
+    result = '\n'.join(formatted_lines)
+    result = result.replace('<li', '<ul><li').replace('</li>\n<p', '</li></ul>\n<p')
+    result = result.replace('</li>\n<br>', '</li></ul>\n<br>')
+
+    return f'<div style="font-family: system-ui, -apple-system, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px;">{result}</div>'
+
+
+def build_report(size_bytes):
+    sections = ["# Research Report\n\n"]
+    total = len(sections[0])
+    n = 0
+    while total < size_bytes:
+        section = SECTION.format(n=n)
+        sections.append(section)
+        total += len(section)
+        n += 1
+    return "".join(sections)
+
+
+def best_time(func, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=2.0, help="Report size in megabytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per renderer (best is reported)")
+    args = parser.parse_args()
+
+    content = build_report(int(args.size_mb * 1024 * 1024))
+    size_mb = len(content.encode("utf-8")) / (1024 * 1024)
+
+    legacy_time = best_time(legacy_format_content_for_display, content, args.repeat)
+    render_time = best_time(render_markdown, content, args.repeat)
+    render_markdown_cached(content)
+    cached_time = best_time(render_markdown_cached, content, args.repeat)
+
+    print(f"📄 Report: {size_mb:.2f} MB, {content.count(chr(10))} lines")
+    print(f"legacy formatter       {legacy_time * 1000:9.1f} ms")
+    print(f"single-pass renderer   {render_time * 1000:9.1f} ms  ({size_mb / render_time:.1f} MB/s)")
+    print(f"cached render (hit)    {cached_time * 1000:9.1f} ms")
+    print(f"🚀 Cache hit vs cold render: {render_time / cached_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
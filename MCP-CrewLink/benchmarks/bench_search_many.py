@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark search fan-out: serial `web_search` calls vs. one `web_search_many` call.
+
+Runs against the local Brave stub from bench_search_pool.py with a fixed
+per-request latency and the search cache disabled.
+
+Usage:
+    python benchmarks/bench_search_many.py --queries 8 --latency-ms 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_search_pool import start_stub_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=8, help="Number of distinct queries")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Simulated search API latency")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(0.0, response_delay=args.latency_ms / 1000)
+    os.environ.update({
+        "BRAVE_SEARCH_URL": url,
+        "BRAVE_API_KEY": os.getenv("BRAVE_API_KEY", "benchmark"),
+        "SEARCH_CACHE_ENABLED": "false",
+        "HTTP2_ENABLED": "false",
+        "SEARCH_CONCURRENCY": str(args.queries),
+    })
+
+    from research_tools import WebSearchManyTool, WebSearchTool
+    from http_client import close_http_clients
+
+    search_tool = WebSearchTool()
+    many_tool = WebSearchManyTool(search_tool=search_tool)
+    queries = [f"model context protocol aspect {i}" for i in range(args.queries)]
+
+    start_time = time.perf_counter()
+    for query in queries:
+        search_tool._run(query)
+    serial_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    many_tool._run(queries)
+    concurrent_time = time.perf_counter() - start_time
+
+    print(f"⏱️ {args.queries} queries at {args.latency_ms:.0f} ms each")
+    print(f"serial web_search      {serial_time:6.2f} s")
+    print(f"web_search_many        {concurrent_time:6.2f} s")
+    print(f"🚀 Speedup: {serial_time / concurrent_time:.1f}x")
+
+    close_http_clients()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-query search latency: fresh connection per call vs. pooled client.
+
+Runs a local stub of the Brave search endpoint and issues the same queries
+through a throwaway httpx client per call (what `requests.get` did before)
+and through the shared keep-alive client from `http_client`.
+
+Usage:
+    python benchmarks/bench_search_pool.py --queries 50 --tls --connect-delay-ms 20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import close_http_clients, get_http_client  # noqa: E402
+
+STUB_RESPONSE = json.dumps({
+    "web": {
+        "results": [
+            {"title": f"Result {i}", "description": "Stub search result", "url": f"https://example.com/{i}"}
+            for i in range(5)
+        ]
+    }
+}).encode("utf-8")
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on reused connections
+    disable_nagle_algorithm = True
+    connect_delay = 0.0
+    response_delay = 0.0
+
+    def setup(self):
+        # Simulate the network round trips of a new TCP/TLS connection
+        time.sleep(self.connect_delay)
+        super().setup()
+
+    def do_GET(self):
+        # Simulate upstream search time
+        time.sleep(self.response_delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(connect_delay, tls_dir=None, response_delay=0.0):
+    handler = type("Handler", (StubSearchHandler,), {
+        "connect_delay": connect_delay,
+        "response_delay": response_delay,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    scheme = "http"
+    if tls_dir:
+        cert_path = os.path.join(tls_dir, "cert.pem")
+        key_path = os.path.join(tls_dir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key_path, "-out", cert_path],
+            check=True, capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/res/v1/web/search"
+
+
+def measure_fresh(url, queries):
+    timings = []
+    for i in range(queries):
+        start_time = time.perf_counter()
+        with httpx.Client(verify=False, timeout=10) as client:
+            client.get(url, params={"q": f"query {i}", "count": 5}).json()
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def measure_pooled(url, queries):
+    client = get_http_client()
+    timings = []
+    for i in range(queries):
+        start_time = time.perf_counter()
+        client.get(url, params={"q": f"query {i}", "count": 5}).json()
+        timings.append(time.perf_counter() - start_time)
+    close_http_clients()
+    return timings
+
+
+def _report(label, timings):
+    print(f"{label:<16} mean={statistics.mean(timings) * 1000:8.2f} ms  "
+          f"median={statistics.median(timings) * 1000:8.2f} ms  "
+          f"total={sum(timings):7.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50, help="Number of search queries per mode")
+    parser.add_argument("--tls", action="store_true", help="Serve the stub over HTTPS (needs openssl)")
+    parser.add_argument("--connect-delay-ms", type=float, default=20.0,
+                        help="Simulated handshake round-trip cost per new connection")
+    args = parser.parse_args()
+
+    tls_dir = tempfile.mkdtemp() if args.tls else None
+    # The pooled client reads its settings from the environment
+    os.environ.setdefault("HTTP2_ENABLED", "false")
+    try:
+        server, url = start_stub_server(args.connect_delay_ms / 1000, tls_dir)
+        if args.tls:
+            # Trust the self-signed stub certificate for the pooled client
+            os.environ["SSL_CERT_FILE"] = os.path.join(tls_dir, "cert.pem")
+
+        print(f"⏱️ Running {args.queries} queries per mode against {url}")
+        fresh = measure_fresh(url, args.queries)
+        pooled = measure_pooled(url, args.queries)
+
+        _report("fresh connection", fresh)
+        _report("pooled client", pooled)
+        print(f"🚀 Per-query speedup: {statistics.mean(fresh) / statistics.mean(pooled):.1f}x")
+        server.shutdown()
+    finally:
+        if tls_dir:
+            shutil.rmtree(tls_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
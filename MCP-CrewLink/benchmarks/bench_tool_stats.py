@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Check tool latency quantiles against exact percentiles and time the recording.
+
+Draws synthetic tool latencies from a long-tailed (log-normal) distribution,
+with a few slow outliers like timed-out Brave searches, records them in
+ToolStats and compares p50/p90/p99 with exact percentiles of the same sample.
+
+Usage:
+    python benchmarks/bench_tool_stats.py --calls 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tool_stats import QUANTILES, ToolStats  # noqa: E402
+
+
+def exact_quantile(sorted_values, q):
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000, help="Tool calls to record")
+    parser.add_argument("--accuracy", type=float, default=0.01, help="Relative accuracy of the histogram")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tools = {
+        # median seconds, spread, outlier rate
+        "web_search": (0.4, 0.6, 0.01),
+        "generate_image": (8.0, 0.4, 0.002),
+    }
+    samples = {}
+    for tool_name, (median, sigma, outliers) in tools.items():
+        samples[tool_name] = [
+            rng.uniform(20, 30) if rng.random() < outliers else rng.lognormvariate(0, sigma) * median
+            for _ in range(args.calls)
+        ]
+
+    stats = ToolStats(relative_accuracy=args.accuracy)
+    start_time = time.perf_counter()
+    for tool_name, values in samples.items():
+        for i, value in enumerate(values):
+            stats.record(tool_name, value, i % 50 != 0)
+    record_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    snapshot = stats.snapshot()
+    snapshot_time = time.perf_counter() - start_time
+
+    total_calls = args.calls * len(tools)
+    print(f"⏱️ {total_calls} calls recorded in {record_time * 1000:.1f} ms "
+          f"({record_time / total_calls * 1e6:.2f} µs/call), snapshot in {snapshot_time * 1000:.2f} ms")
+    worst_error = 0.0
+    for tool_name, values in samples.items():
+        ordered = sorted(values)
+        buckets = len(stats.histogram(tool_name).buckets)
+        print(f"🔧 {tool_name}: {snapshot[f'tool_{tool_name}_calls']} calls, "
+              f"{snapshot[f'tool_{tool_name}_errors']} errors, {buckets} buckets")
+        for label, q in QUANTILES.items():
+            exact = exact_quantile(ordered, q)
+            estimate = snapshot[f"tool_{tool_name}_latency_{label}"]
+            error = abs(estimate - exact) / exact
+            worst_error = max(worst_error, error)
+            print(f"   {label}: exact {exact:8.3f} s  histogram {estimate:8.3f} s  error {error * 100:5.2f}%")
+    status = "✅" if worst_error <= args.accuracy else "❌"
+    print(f"{status} Worst relative error {worst_error * 100:.2f}% (bound {args.accuracy * 100:.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark telemetry overhead on tool calls: synchronous vs. buffered WandBTracker.
+
+Replaces wandb.init with a stub run whose log() takes a fixed time (what a
+synchronous wandb.log costs in the calling thread) and counts the steps.
+Then times log_tool_usage calls as the tools make them. The local JSONL
+sink is timed too, for runs without access to the wandb service.
+
+Usage:
+    python benchmarks/bench_wandb_logging.py --calls 2000 --log-latency-ms 2
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import wandb  # noqa: E402
+from wandb_tracker import WandBTracker  # noqa: E402
+
+
+class StubRun:
+    name = "benchmark"
+    url = "http://localhost/benchmark"
+
+    def __init__(self, log_latency):
+        self.log_latency = log_latency
+        self.steps = 0
+
+    def log(self, metrics, step=None):
+        time.sleep(self.log_latency)
+        self.steps += 1
+
+    def finish(self):
+        pass
+
+
+def run(buffered, calls, log_latency, sink="wandb"):
+    stub_run = StubRun(log_latency)
+    wandb.init = lambda **kwargs: stub_run
+    tracker = WandBTracker(project="benchmark", config={}, buffered=buffered, flush_interval=0.5, sink=sink)
+
+    timings = []
+    for i in range(calls):
+        start_time = time.perf_counter()
+        tracker.log_tool_usage("web_search", 0.1, i % 10 != 0, extra_metrics={"search_cache_hits": i})
+        timings.append(time.perf_counter() - start_time)
+
+    drain_start = time.perf_counter()
+    tracker.finish_run()
+    drain_time = time.perf_counter() - drain_start
+    return timings, tracker.steps_logged, drain_time, tracker.metrics_dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="Tool calls to log")
+    parser.add_argument("--log-latency-ms", type=float, default=2.0, help="Simulated cost of one wandb.log call")
+    args = parser.parse_args()
+
+    print(f"⏱️ {args.calls} tool calls, wandb.log costs {args.log_latency_ms:.1f} ms")
+    metrics_dir = tempfile.mkdtemp(prefix="bench_metrics_")
+    os.environ["METRICS_SINK_PATH"] = os.path.join(metrics_dir, "metrics.jsonl")
+    modes = [
+        ("synchronous", False, "wandb"),
+        ("buffered", True, "wandb"),
+        ("jsonl sync", False, "jsonl"),
+        ("jsonl buffered", True, "jsonl"),
+    ]
+    for label, buffered, sink in modes:
+        timings, steps, drain_time, dropped = run(buffered, args.calls, args.log_latency_ms / 1000, sink)
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(f"{label:14} total {sum(timings) * 1000:8.1f} ms  p99 {p99 * 1e6:8.1f} µs/call  "
+              f"{steps:5d} steps  drain {drain_time * 1000:6.1f} ms  dropped {dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-job startup cost: cold `python3 main.py` spawn vs. resident worker.
+
+Both paths run a dry-run job, which builds the tools, LLM client, tracker and
+crew but stops before the first LLM call, so the numbers are pure startup.
+
+Usage:
+    python benchmarks/bench_worker_startup.py --jobs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PROJECT_DIR, "main.py")
+
+DRY_RUN_JOB = {"topic": "Model Context Protocol", "query": "How does MCP work?", "dry_run": True}
+
+
+def _worker_env():
+    env = dict(os.environ)
+    # Keep WandB offline so the benchmark measures local startup only
+    env.setdefault("WANDB_MODE", "disabled")
+    return env
+
+
+def _start_worker():
+    return subprocess.Popen(
+        [sys.executable, MAIN_SCRIPT, "--worker"],
+        cwd=PROJECT_DIR,
+        env=_worker_env(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+
+def _send(process, job):
+    process.stdin.write(json.dumps(job) + "\n")
+    process.stdin.flush()
+    response = json.loads(process.stdout.readline())
+    if not response.get("success"):
+        raise RuntimeError(f"Job failed: {response.get('error')}")
+    return response
+
+
+def _stop_worker(process):
+    _send(process, {"op": "shutdown"})
+    process.wait(timeout=30)
+
+
+def measure_cold(jobs):
+    """Spawn a fresh interpreter for every job, like the per-request API route."""
+    timings = []
+    for i in range(jobs):
+        start_time = time.perf_counter()
+        process = _start_worker()
+        _send(process, dict(DRY_RUN_JOB, id=f"cold-{i}"))
+        timings.append(time.perf_counter() - start_time)
+        _stop_worker(process)
+    return timings
+
+
+def measure_warm(jobs):
+    """Send every job to one resident worker."""
+    process = _start_worker()
+    try:
+        # Wait for the worker to finish its one-time startup
+        _send(process, {"op": "ping"})
+        timings = []
+        for i in range(jobs):
+            start_time = time.perf_counter()
+            _send(process, dict(DRY_RUN_JOB, id=f"warm-{i}"))
+            timings.append(time.perf_counter() - start_time)
+        return timings
+    finally:
+        _stop_worker(process)
+
+
+def _report(label, timings):
+    print(f"{label:<18} mean={statistics.mean(timings) * 1000:9.1f} ms  "
+          f"median={statistics.median(timings) * 1000:9.1f} ms  "
+          f"min={min(timings) * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5, help="Number of dry-run jobs per mode")
+    args = parser.parse_args()
+
+    print(f"⏱️ Measuring per-job startup cost over {args.jobs} jobs...")
+    cold = measure_cold(args.jobs)
+    warm = measure_warm(args.jobs)
+
+    _report("cold spawn", cold)
+    _report("resident worker", warm)
+    print(f"🚀 Speedup: {statistics.mean(cold) / statistics.mean(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
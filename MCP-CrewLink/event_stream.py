@@ -0,0 +1,49 @@
+import json
+import time
+import threading
+from typing import Any, Dict, Optional, TextIO
+
+
+class EventEmitter:
+    """
+    Writes research run events as newline-delimited JSON, one object per line,
+    flushed immediately so consumers can render partial results.
+
+    Every event has a "type" (progress, tool_call, file_ready, image_ready,
+    done or error) and a "timestamp"; `context` fields such as a job id are
+    added to every event.
+    """
+
+    def __init__(self, stream: TextIO, context: Optional[Dict[str, Any]] = None):
+        self.stream = stream
+        self.context = context or {}
+        self._lock = threading.Lock()
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        event = {"type": event_type, "timestamp": time.time()}
+        event.update(self.context)
+        event.update(fields)
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+# Active emitter for the current run; None when events are disabled
+_event_emitter: Optional[EventEmitter] = None
+
+
+def set_event_emitter(emitter: Optional[EventEmitter]) -> None:
+    global _event_emitter
+    _event_emitter = emitter
+
+
+def events_enabled() -> bool:
+    return _event_emitter is not None
+
+
+def emit_event(event_type: str, **fields: Any) -> None:
+    """Emit an event on the active emitter; a no-op when events are disabled."""
+    emitter = _event_emitter
+    if emitter is not None:
+        emitter.emit(event_type, **fields)
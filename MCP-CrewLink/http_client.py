@@ -0,0 +1,153 @@
+import os
+import asyncio
+import logging
+import threading
+import httpx
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
+
+# Shared clients, created lazily on first use. The async client belongs to
+# the background runner loop (see run_async); other loops borrow it.
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+_http2_warned = False
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_client_settings() -> Dict[str, object]:
+    """
+    Read connection pool settings from the environment.
+
+    HTTP_POOL_SIZE: maximum open connections (default 20)
+    HTTP_KEEPALIVE_CONNECTIONS: idle connections kept alive (default 10)
+    HTTP_KEEPALIVE_EXPIRY: seconds an idle connection stays open (default 30)
+    HTTP_TIMEOUT: request timeout in seconds (default 10)
+    HTTP2_ENABLED: negotiate HTTP/2 when the h2 package is installed (default true)
+    """
+    global _http2_warned
+    http2 = _env_bool("HTTP2_ENABLED", True)
+    if http2 and not _http2_available():
+        if not _http2_warned:
+            _http2_warned = True
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed. Using HTTP/1.1.")
+        http2 = False
+
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("HTTP_POOL_SIZE", "20")),
+            max_keepalive_connections=int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        ),
+        "timeout": httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "10"))),
+        "http2": http2,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled, keep-alive HTTP client."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        with _client_lock:
+            if _sync_client is None or _sync_client.is_closed:
+                _sync_client = httpx.Client(**get_client_settings())
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the pooled async HTTP client of the background runner loop.
+    Async connections are bound to their loop, and loops started by callers
+    (e.g. asyncio.run) end without closing anything, so only the runner loop
+    keeps a pool. Must be called on that loop; use async_request() elsewhere.
+    """
+    global _async_client
+    if asyncio.get_running_loop() is not _runner_loop:
+        raise RuntimeError("The pooled async HTTP client is only usable on the runner loop; use async_request()")
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(**get_client_settings())
+    return _async_client
+
+
+async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    return await get_async_http_client().request(method, url, **kwargs)
+
+
+async def async_request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request on the pooled async client from any event loop. The
+    response body is read before returning, so it can be used on the caller's loop.
+    """
+    return await arun_async(_request(method, url, **kwargs))
+
+
+def close_http_clients() -> None:
+    """Close the shared sync client and the async client of the background runner loop."""
+    global _sync_client
+    with _client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+    if _runner_loop is not None and not _runner_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(aclose_http_client(), _runner_loop).result()
+
+
+async def aclose_http_client() -> None:
+    """Close the async client of the runner loop; called on that loop."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
+
+
+# Background event loop used to run async tool code from synchronous callers
+_runner_loop: Optional[asyncio.AbstractEventLoop] = None
+_runner_lock = threading.Lock()
+
+
+def _get_runner_loop() -> asyncio.AbstractEventLoop:
+    global _runner_loop
+    if _runner_loop is None or _runner_loop.is_closed():
+        with _runner_lock:
+            if _runner_loop is None or _runner_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="async-tool-runner", daemon=True).start()
+                _runner_loop = loop
+    return _runner_loop
+
+
+def run_async(coro):
+    """
+    Run a coroutine from synchronous code and return its result.
+    Coroutines share one long-lived loop, so its pooled async client stays warm.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_runner_loop()).result()
+
+
+async def arun_async(coro):
+    """
+    Await a coroutine on the shared background loop from any event loop.
+    Objects bound to that loop (e.g. MCP sessions) can then be used from
+    async code running elsewhere.
+    """
+    loop = _get_runner_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
@@ -0,0 +1,174 @@
+import os
+import re
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "images")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize an image prompt so case and whitespace differences share an entry."""
+    return re.sub(r"\s+", " ", prompt.strip().lower())
+
+
+class ImageCache:
+    """
+    Content-addressed cache for generated images.
+
+    Requests are keyed on (model, normalized prompt, size, quality). PNG bytes
+    are stored once per content hash under `cache_dir` and hard-linked (or
+    copied across filesystems) to the requested output path. When the blobs
+    exceed `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS image_cache (
+                   key TEXT PRIMARY KEY,
+                   content_hash TEXT NOT NULL,
+                   size_bytes INTEGER NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, size: str, quality: str) -> str:
+        raw = "\x1f".join([model, normalize_prompt(prompt), size, quality])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.png")
+
+    @staticmethod
+    def _materialize(blob_path: str, dest_path: str) -> None:
+        """Place the cached blob at dest_path without rewriting the bytes if possible."""
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(blob_path, dest_path)
+        except OSError:
+            shutil.copyfile(blob_path, dest_path)
+
+    def fetch(self, model: str, prompt: str, size: str, quality: str, dest_path: str) -> bool:
+        """Write a cached image to dest_path. Returns True on a hit."""
+        key = self.make_key(model, prompt, size, quality)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, size_bytes FROM image_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                blob_path = self._blob_path(row[0])
+                if os.path.exists(blob_path):
+                    self._materialize(blob_path, dest_path)
+                    self._db.execute("UPDATE image_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.hits += 1
+                    self.bytes_served += row[1]
+                    return True
+                # Blob removed behind our back; forget the entry
+                self._db.execute("DELETE FROM image_cache WHERE key = ?", (key,))
+                self._db.commit()
+            self.misses += 1
+            return False
+
+    def store(self, model: str, prompt: str, size: str, quality: str,
+              image_bytes: bytes, dest_path: Optional[str] = None) -> str:
+        """Store generated image bytes and optionally place them at dest_path. Returns the content hash."""
+        key = self.make_key(model, prompt, size, quality)
+        content_hash = hashlib.sha256(image_bytes).hexdigest()
+        blob_path = self._blob_path(content_hash)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(image_bytes)
+                os.replace(tmp_path, blob_path)
+            self._db.execute(
+                "INSERT OR REPLACE INTO image_cache (key, content_hash, size_bytes, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, content_hash, len(image_bytes), time.time())
+            )
+            self._evict(keep_hash=content_hash)
+            self._db.commit()
+            if dest_path:
+                self._materialize(blob_path, dest_path)
+        return content_hash
+
+    def _evict(self, keep_hash: str) -> None:
+        """Drop least recently used entries until the unique blobs fit in max_bytes."""
+        rows = self._db.execute(
+            "SELECT key, content_hash, size_bytes FROM image_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        blob_sizes = {content_hash: size for _, content_hash, size in rows}
+        total_bytes = sum(blob_sizes.values())
+        references: Dict[str, int] = {}
+        for _, content_hash, _ in rows:
+            references[content_hash] = references.get(content_hash, 0) + 1
+
+        for key, content_hash, _ in rows:
+            if total_bytes <= self.max_bytes:
+                break
+            if content_hash == keep_hash:
+                continue
+            self._db.execute("DELETE FROM image_cache WHERE key = ?", (key,))
+            references[content_hash] -= 1
+            if references[content_hash] == 0:
+                total_bytes -= blob_sizes[content_hash]
+                try:
+                    os.remove(self._blob_path(content_hash))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "image_cache_hits": self.hits,
+            "image_cache_misses": self.misses,
+            "image_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+            "image_cache_bytes_served": self.bytes_served,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_image_cache: Optional[ImageCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """
+    Return the shared image cache configured from the environment,
+    or None when IMAGE_CACHE_ENABLED is false.
+
+    IMAGE_CACHE_DIR: blob and index directory (default cache/images)
+    IMAGE_CACHE_MAX_BYTES: total size of cached images (default 512 MB)
+    """
+    global _image_cache
+    if os.getenv("IMAGE_CACHE_ENABLED", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageCache(
+                    cache_dir=os.getenv("IMAGE_CACHE_DIR"),
+                    max_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+                )
+    return _image_cache
@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class ImageJob:
+    """One background image generation: its handle, the files it will write and its future."""
+
+    def __init__(self, handle: str, paths: List[str], future: Future):
+        self.handle = handle
+        self.paths = paths
+        self.future = future
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def status(self) -> str:
+        if not self.future.done():
+            return "running"
+        if self.future.cancelled() or self.future.exception() is not None:
+            return "failed"
+        return "completed" if all(os.path.exists(path) for path in self.paths) else "failed"
+
+    def describe(self) -> Dict[str, Any]:
+        error = None
+        if self.future.done() and not self.future.cancelled():
+            error = self.future.exception()
+        return {
+            "handle": self.handle,
+            "files": [os.path.basename(path) for path in self.paths],
+            "status": self.status(),
+            "duration": (self.finished_at or time.time()) - self.submitted_at,
+            **({"error": str(error)} if error is not None else {}),
+        }
+
+
+class ImageJobs:
+    """
+    Image generations of one run, executed on background threads so the
+    agent's tool call returns a handle at once and the agent keeps
+    researching while the image renders. The run's output collector calls
+    wait() before it lists the generated images.
+
+    Jobs run in a copy of the submitter's context, so they write to the
+    run's workspace. Once the run is closed, jobs still running (past the
+    collector's timeout) discard their images: they write and announce
+    them only inside job_output(), which close() waits for.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-job")
+        self._jobs: Dict[str, ImageJob] = {}
+        self._lock = threading.Lock()
+        self._output = threading.Condition()
+        self._writers = 0
+        self.closed = False
+        self.discarded = 0
+        self.wait_time = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, paths: List[str]) -> str:
+        """Run fn(*args) in the background; `paths` are the files it writes. Returns the job handle."""
+        context = contextvars.copy_context()
+        with self._lock:
+            handle = f"img-{len(self._jobs) + 1}"
+            future = self._executor.submit(context.run, self._run_job, fn, args)
+            job = ImageJob(handle, paths, future)
+            self._jobs[handle] = job
+
+        def finished(_):
+            job.finished_at = time.time()
+
+        future.add_done_callback(finished)
+        return handle
+
+    def _run_job(self, fn: Callable[..., Any], args: tuple) -> Any:
+        _job_owner.set(self)
+        return fn(*args)
+
+    def _begin_output(self) -> bool:
+        with self._output:
+            if self.closed:
+                self.discarded += 1
+                return False
+            self._writers += 1
+            return True
+
+    def _end_output(self) -> None:
+        with self._output:
+            self._writers -= 1
+            self._output.notify_all()
+
+    def jobs(self) -> List[ImageJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def pending(self) -> int:
+        return sum(1 for job in self.jobs() if not job.future.done())
+
+    def wait(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Wait for the outstanding jobs, at most `timeout` seconds. Returns every job's description."""
+        outstanding = [job.future for job in self.jobs() if not job.future.done()]
+        if outstanding:
+            start_time = time.time()
+            print(f"🖼️ Waiting for {len(outstanding)} background image job(s)...")
+            wait(outstanding, timeout=timeout)
+            self.wait_time += time.time() - start_time
+        return [job.describe() for job in self.jobs()]
+
+    def close(self) -> None:
+        """
+        Close the run: cancel jobs that have not started and wait for images
+        being written. Jobs still running discard their output from now on.
+        """
+        with self._output:
+            self.closed = True
+            self._output.wait_for(lambda: self._writers == 0)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        statuses = [job.status() for job in self.jobs()]
+        return {
+            "image_jobs": len(statuses),
+            "image_jobs_completed": statuses.count("completed"),
+            "image_jobs_failed": statuses.count("failed"),
+            "image_jobs_pending": statuses.count("running"),
+            "image_jobs_discarded": self.discarded,
+            "image_jobs_wait_time": self.wait_time,
+        }
+
+
+# Image jobs of the active run; None runs image tools inline
+_image_jobs: Optional[ImageJobs] = None
+
+# ImageJobs owning the job running in this context
+_job_owner: contextvars.ContextVar = contextvars.ContextVar("image_job_owner", default=None)
+
+
+@contextlib.contextmanager
+def job_output() -> Iterator[bool]:
+    """
+    Wrap the writing and announcing of a generated image. Yields False when
+    the image belongs to a background job whose run is already closed; the
+    image must then be discarded. Outside a background job it yields True.
+    """
+    owner = _job_owner.get()
+    if owner is None:
+        yield True
+        return
+    if not owner._begin_output():
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        owner._end_output()
+
+
+def set_image_jobs(image_jobs: Optional[ImageJobs]) -> None:
+    global _image_jobs
+    _image_jobs = image_jobs
+
+
+def get_image_jobs() -> Optional[ImageJobs]:
+    return _image_jobs
+
+
+def background_images_enabled() -> bool:
+    return os.getenv("IMAGE_BACKGROUND", "true").strip().lower() in ("1", "true", "yes", "on")
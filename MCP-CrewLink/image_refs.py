@@ -0,0 +1,53 @@
+import os
+import io
+import mmap
+import base64
+import hashlib
+from typing import Any, Dict, Optional
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file through a read-only memory map, without copying it into Python memory."""
+    if os.path.getsize(path) == 0:
+        return hashlib.sha256(b"").hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return hashlib.sha256(mapped).hexdigest()
+
+
+def make_thumbnail(path: str, max_size: int) -> Optional[str]:
+    """
+    Return a base64 PNG thumbnail no larger than max_size pixels per side,
+    or None if Pillow is not installed or the image cannot be read.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((max_size, max_size))
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", optimize=True)
+        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+    except Exception as e:
+        print(f"⚠️ Could not create thumbnail for {os.path.basename(path)}: {e}")
+        return None
+
+
+def describe_image_ref(path: str, thumbnail_size: int = 0) -> Dict[str, Any]:
+    """
+    Describe an image by reference: path, size and content hash, plus an
+    optional small thumbnail. The full image bytes never enter the output.
+    """
+    ref = {
+        "filename": os.path.basename(path),
+        "path": path,
+        "size_bytes": os.path.getsize(path),
+        "sha256": file_sha256(path),
+    }
+    if thumbnail_size > 0:
+        thumbnail = make_thumbnail(path, thumbnail_size)
+        if thumbnail:
+            ref["thumbnail_base64"] = thumbnail
+    return ref
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from tracing import record_span
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+LLM_CACHE_MODES = ("off", "cache", "record", "replay")
+
+# LLM attributes that change the response; credentials, callbacks and
+# streaming do not, so they are left out of the key
+KEY_PARAMS = (
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens",
+    "presence_penalty", "frequency_penalty", "logit_bias", "seed", "response_format",
+    "reasoning_effort", "base_url", "api_base", "api_version",
+)
+
+
+class LLMCacheMiss(Exception):
+    """A replayed LLM call has no recorded response."""
+
+
+def normalize_messages(messages: Any) -> List[Dict[str, Any]]:
+    """LLM.call accepts a prompt string or a list of chat messages."""
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return list(messages)
+
+
+class LLMCache:
+    """
+    Deterministic cache of LLM responses keyed on model, messages and
+    parameters, stored in SQLite.
+
+    Modes:
+      cache   serve hits, call the LLM and store the response on a miss
+      record  always call the LLM and store (overwrite) the response
+      replay  serve hits only; a miss raises LLMCacheMiss, so a recorded
+              run can be repeated fully offline. Entries never expire.
+
+    Entries expire after `ttl` seconds; once the responses exceed
+    `max_bytes`, the least recently used ones are evicted.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 mode: str = "cache",
+                 ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        if mode not in LLM_CACHE_MODES or mode == "off":
+            raise ValueError(f"Invalid LLM cache mode: {mode}")
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "llm_cache.sqlite3")
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets concurrent research processes share the cache file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                   key TEXT PRIMARY KEY,
+                   model TEXT NOT NULL,
+                   response TEXT NOT NULL,
+                   size_bytes INTEGER NOT NULL,
+                   latency REAL NOT NULL,
+                   created_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+        raw = json.dumps(
+            {"model": model, "messages": normalize_messages(messages), "params": params},
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at, latency FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                if self.mode == "replay" or now - row[1] < self.ttl:
+                    self._db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self.hits += 1
+                    self.time_saved += row[2]
+                    return json.loads(row[0])
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+            self.misses += 1
+            return None
+
+    def set(self, key: str, model: str, response: str, latency: float) -> None:
+        payload = json.dumps(response)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """INSERT OR REPLACE INTO llm_cache
+                   (key, model, response, size_bytes, latency, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (key, model, payload, len(payload.encode("utf-8")), latency, now, now)
+            )
+            self.stores += 1
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float) -> None:
+        # Recorded runs are fixtures; replay never expires them
+        if self.mode != "replay":
+            self._db.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size_bytes in self._db.execute(
+            "SELECT key, size_bytes FROM llm_cache ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size_bytes
+
+    def call(self, llm: Any, call, messages: Any, *args, **kwargs) -> Any:
+        """Serve one LLM.call through the cache."""
+        # Native tool calls run the tools inside call(); their side effects must happen
+        if kwargs.get("tools") or kwargs.get("available_functions"):
+            return call(messages, *args, **kwargs)
+
+        model = str(getattr(llm, "model", ""))
+        params = {name: getattr(llm, name, None) for name in KEY_PARAMS}
+        key = self.make_key(model, messages, {name: value for name, value in params.items() if value is not None})
+
+        if self.mode != "record":
+            start_time = time.time()
+            response = self.get(key)
+            if response is not None:
+                record_span("llm_call", "llm", start_time, time.time(), current_track=True, model=model, cached=True)
+                return response
+            if self.mode == "replay":
+                raise LLMCacheMiss(f"No recorded response for this {model} call (key {key[:12]}) in {self.path}")
+
+        start_time = time.time()
+        response = call(messages, *args, **kwargs)
+        if isinstance(response, str) and response.strip():
+            self.set(key, model, response, time.time() - start_time)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "llm_cache_hits": self.hits,
+            "llm_cache_misses": self.misses,
+            "llm_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+            "llm_cache_stores": self.stores,
+            "llm_cache_time_saved": self.time_saved,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def wrap_llm(llm: Any, cache: "LLMCache") -> Any:
+    """Route llm.call through the cache. Returns the same LLM object."""
+    call = llm.call
+
+    def cached_call(messages, *args, **kwargs):
+        return cache.call(llm, call, messages, *args, **kwargs)
+
+    llm.call = cached_call
+    return llm
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Return the shared LLM response cache configured from the environment,
+    or None when LLM_CACHE_MODE is off (the default).
+
+    LLM_CACHE_MODE: off, cache, record or replay
+    LLM_CACHE_PATH: SQLite file (default cache/llm_cache.sqlite3)
+    LLM_CACHE_TTL: seconds before an entry expires (default 7 days)
+    LLM_CACHE_MAX_BYTES: total size of cached responses (default 256 MB)
+    """
+    global _llm_cache
+    mode = os.getenv("LLM_CACHE_MODE", "off").strip().lower()
+    if mode == "off":
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache(
+                    path=os.getenv("LLM_CACHE_PATH"),
+                    mode=mode,
+                    ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+                    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+                )
+    return _llm_cache
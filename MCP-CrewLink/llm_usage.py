@@ -0,0 +1,296 @@
+import os
+import time
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from tool_stats import LatencyHistogram
+from tracing import record_span
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """LiteLLM passes datetimes or epoch seconds for call timestamps."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _usage_value(usage: Any, key: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+    return int(value or 0)
+
+
+class TaskUsage:
+    """Token counts, cost and latency of the LLM calls made for one task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.failed_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.cost_known = True
+        self.llm_time = 0.0
+        self.latency = LatencyHistogram()
+        self.ttft = LatencyHistogram()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.completed = False
+
+    def metrics(self, prefix: str) -> Dict[str, Any]:
+        metrics = {
+            f"{prefix}_llm_calls": self.calls,
+            f"{prefix}_llm_failed_calls": self.failed_calls,
+            f"{prefix}_prompt_tokens": self.prompt_tokens,
+            f"{prefix}_completion_tokens": self.completion_tokens,
+            f"{prefix}_total_tokens": self.prompt_tokens + self.completion_tokens,
+            # Generation speed while the LLM was working, not over the whole task
+            f"{prefix}_tokens_per_sec": self.completion_tokens / self.llm_time if self.llm_time else 0.0,
+            f"{prefix}_llm_latency_mean": self.latency.mean,
+            f"{prefix}_llm_latency_p90": self.latency.quantile(0.9),
+        }
+        if self.ttft.count:
+            metrics[f"{prefix}_ttft_mean"] = self.ttft.mean
+            metrics[f"{prefix}_ttft_p90"] = self.ttft.quantile(0.9)
+        if self.cost_known:
+            metrics[f"{prefix}_cost_usd"] = self.cost
+        if self.started_at is not None and self.finished_at is not None:
+            metrics[f"{prefix}_completion_time"] = self.finished_at - self.started_at
+        return metrics
+
+
+class LLMUsageRecorder:
+    """
+    Attributes the LLM calls of a research run to its tasks. Tasks run one
+    after another, so each call is charged to the task that was running when
+    the call started; start_task() marks the boundaries. Callbacks may arrive
+    late and from LiteLLM's logging threads, hence the timestamp lookup.
+    """
+
+    def __init__(self, prompt_cost_per_1k: Optional[float] = None,
+                 completion_cost_per_1k: Optional[float] = None):
+        # Price override for models LiteLLM has no pricing for (e.g. W&B Inference)
+        prompt_cost = prompt_cost_per_1k if prompt_cost_per_1k is not None else os.getenv('LLM_PROMPT_COST_PER_1K')
+        completion_cost = completion_cost_per_1k if completion_cost_per_1k is not None else os.getenv('LLM_COMPLETION_COST_PER_1K')
+        self.prompt_cost_per_1k = float(prompt_cost) if prompt_cost not in (None, "") else None
+        self.completion_cost_per_1k = float(completion_cost) if completion_cost not in (None, "") else None
+        self._lock = threading.Lock()
+        self._boundaries: List[Tuple[float, str]] = []
+        self._tasks: Dict[str, TaskUsage] = {}
+
+    def start_task(self, name: str, at: Optional[float] = None) -> None:
+        at = at if at is not None else time.time()
+        with self._lock:
+            if self._boundaries:
+                previous = self._tasks[self._boundaries[-1][1]]
+                if previous.finished_at is None:
+                    previous.finished_at = at
+            self._boundaries.append((at, name))
+            task = self._tasks.setdefault(name, TaskUsage(name))
+            task.started_at = at
+
+    def finish_task(self, name: str, completed: bool = True, at: Optional[float] = None) -> None:
+        with self._lock:
+            task = self._tasks.setdefault(name, TaskUsage(name))
+            task.finished_at = at if at is not None else time.time()
+            task.completed = completed
+
+    def _task_at(self, timestamp: float) -> TaskUsage:
+        # Called with the lock held
+        index = bisect.bisect_right(self._boundaries, (timestamp, chr(0x10FFFF))) - 1
+        name = self._boundaries[max(index, 0)][1] if self._boundaries else "untracked"
+        return self._tasks.setdefault(name, TaskUsage(name))
+
+    def _cost(self, prompt_tokens: int, completion_tokens: int, cost: Optional[float]) -> Optional[float]:
+        if self.prompt_cost_per_1k is not None or self.completion_cost_per_1k is not None:
+            return (prompt_tokens * (self.prompt_cost_per_1k or 0.0)
+                    + completion_tokens * (self.completion_cost_per_1k or 0.0)) / 1000
+        return cost
+
+    def record_call(self, prompt_tokens: int, completion_tokens: int, start_time: float, end_time: float,
+                    first_token_time: Optional[float] = None, cost: Optional[float] = None,
+                    success: bool = True) -> None:
+        cost = self._cost(prompt_tokens, completion_tokens, cost)
+        with self._lock:
+            task = self._task_at(start_time)
+            task.calls += 1
+            if not success:
+                task.failed_calls += 1
+                return
+            task.prompt_tokens += prompt_tokens
+            task.completion_tokens += completion_tokens
+            task.llm_time += max(end_time - start_time, 0.0)
+            task.latency.add(max(end_time - start_time, 0.0))
+            if first_token_time is not None:
+                task.ttft.add(max(first_token_time - start_time, 0.0))
+            if cost is None:
+                task.cost_known = False
+            else:
+                task.cost += cost
+
+    def tasks(self) -> Dict[str, TaskUsage]:
+        with self._lock:
+            return dict(self._tasks)
+
+    def total_tokens(self) -> int:
+        with self._lock:
+            return sum(task.prompt_tokens + task.completion_tokens for task in self._tasks.values())
+
+    def success_rate(self) -> float:
+        """Share of started tasks that completed."""
+        with self._lock:
+            started = [task for task in self._tasks.values() if task.started_at is not None]
+            if not started:
+                return 0.0
+            return sum(1 for task in started if task.completed) / len(started)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-task metrics (<task>_prompt_tokens, ...) plus llm_* totals for the run."""
+        with self._lock:
+            tasks = list(self._tasks.values())
+            metrics: Dict[str, Any] = {}
+            for task in tasks:
+                metrics.update(task.metrics(task.name))
+            prompt_tokens = sum(task.prompt_tokens for task in tasks)
+            completion_tokens = sum(task.completion_tokens for task in tasks)
+            llm_time = sum(task.llm_time for task in tasks)
+            metrics.update({
+                "llm_calls": sum(task.calls for task in tasks),
+                "llm_prompt_tokens": prompt_tokens,
+                "llm_completion_tokens": completion_tokens,
+                "llm_total_tokens": prompt_tokens + completion_tokens,
+                "llm_tokens_per_sec": completion_tokens / llm_time if llm_time else 0.0,
+            })
+            if tasks and all(task.cost_known for task in tasks):
+                metrics["llm_cost_usd"] = sum(task.cost for task in tasks)
+            return metrics
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-task usage for the structured output."""
+        with self._lock:
+            return {
+                task.name: {
+                    "llm_calls": task.calls,
+                    "prompt_tokens": task.prompt_tokens,
+                    "completion_tokens": task.completion_tokens,
+                    "cost_usd": task.cost if task.cost_known else None,
+                    "ttft_mean": task.ttft.mean if task.ttft.count else None,
+                    "tokens_per_sec": task.completion_tokens / task.llm_time if task.llm_time else 0.0,
+                }
+                for task in self._tasks.values()
+            }
+
+
+# Recorder of the run in progress; LLM callbacks are dropped when None
+_recorder: Optional[LLMUsageRecorder] = None
+
+
+def set_usage_recorder(recorder: Optional[LLMUsageRecorder]) -> None:
+    global _recorder
+    _recorder = recorder
+
+
+def get_usage_recorder() -> Optional[LLMUsageRecorder]:
+    return _recorder
+
+
+# Recently recorded LiteLLM call ids; bounded so a resident worker does not grow it forever
+_MAX_SEEN_CALLS = 4096
+_seen_calls: "OrderedDict[str, None]" = OrderedDict()
+_seen_lock = threading.Lock()
+
+
+def _first_report(kwargs: Dict[str, Any]) -> bool:
+    """
+    LiteLLM can deliver the same call to both the sync and the async hook of
+    a logger, so each litellm_call_id is recorded once.
+    """
+    call_id = kwargs.get("litellm_call_id")
+    if not call_id:
+        return True
+    with _seen_lock:
+        if call_id in _seen_calls:
+            return False
+        _seen_calls[call_id] = None
+        while len(_seen_calls) > _MAX_SEEN_CALLS:
+            _seen_calls.popitem(last=False)
+    return True
+
+
+def record_litellm_call(kwargs: Dict[str, Any], response_obj: Any, start_time: Any, end_time: Any,
+                        success: bool = True) -> None:
+    """Record one LiteLLM completion (success or failure callback arguments)."""
+    if not _first_report(kwargs):
+        return
+    start = _seconds(start_time) or time.time()
+    end = _seconds(end_time) or start
+    usage = None
+    if response_obj is not None:
+        usage = response_obj.get("usage") if isinstance(response_obj, dict) else getattr(response_obj, "usage", None)
+    prompt_tokens = _usage_value(usage, "prompt_tokens")
+    completion_tokens = _usage_value(usage, "completion_tokens")
+    first_token = _seconds(kwargs.get("completion_start_time"))
+    # Non-streaming calls report the end of the call as the first token
+    if first_token is not None and not kwargs.get("stream") and first_token >= end:
+        first_token = None
+    record_span("llm_call", "llm", start, end, model=kwargs.get("model"), success=success,
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                ttft=first_token - start if first_token is not None else None)
+    recorder = _recorder
+    if recorder is None:
+        return
+    recorder.record_call(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        start_time=start,
+        end_time=end,
+        first_token_time=first_token,
+        cost=kwargs.get("response_cost"),
+        success=success,
+    )
+
+
+_callback_installed = False
+
+
+def install_litellm_callback() -> bool:
+    """
+    Register a LiteLLM callback that feeds the active recorder. CrewAI's LLM
+    class (including the W&B Inference LLM) calls models through LiteLLM.
+    Returns False when LiteLLM is not available.
+    """
+    global _callback_installed
+    if _callback_installed:
+        return True
+    try:
+        import litellm
+        from litellm.integrations.custom_logger import CustomLogger
+    except ImportError:
+        return False
+
+    class UsageCallback(CustomLogger):
+        def log_success_event(self, kwargs, response_obj, start_time, end_time):
+            record_litellm_call(kwargs, response_obj, start_time, end_time)
+
+        async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+            record_litellm_call(kwargs, response_obj, start_time, end_time)
+
+        def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+            record_litellm_call(kwargs, response_obj, start_time, end_time, success=False)
+
+        async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+            record_litellm_call(kwargs, response_obj, start_time, end_time, success=False)
+
+    litellm.callbacks = list(litellm.callbacks or []) + [UsageCallback()]
+    _callback_installed = True
+    return True
@@ -1,306 +1,53 @@
-import warnings
 import os
-import asyncio
+import sys
+import json
 import time
+import argparse
+import contextlib
+import threading
 from dotenv import load_dotenv
-from pydantic import PydanticDeprecatedSince20
-from mcp.client.stdio import StdioServerParameters, stdio_client
-from crewai import Agent, Task, Crew, LLM
-from crewai.tools import BaseTool
-from typing import Type, Any, Dict
-from pydantic import BaseModel, Field
+from typing import Any, Dict
 from wandb_tracker import WandBTracker
+from http_client import close_http_clients
+from event_stream import EventEmitter, set_event_emitter, events_enabled, emit_event
+from rate_limits import llm_max_rpm, rate_limit_stats
+from llm_usage import LLMUsageRecorder, set_usage_recorder, install_litellm_callback
+from llm_cache import get_llm_cache, wrap_llm
+from image_jobs import ImageJobs, set_image_jobs, background_images_enabled
+from run_cache import get_run_cache, run_config_from_env
+from research_findings import collect_findings, save_findings, render_findings, reuse_images, resolve_findings
+from tracing import Tracer, set_tracer, get_tracer, span, tracing_enabled_by_env
+from workspaces import (Workspace, set_current_workspace, reset_current_workspace, get_current_workspace,
+                        get_workspace_janitor)
+from run_outputs import current_files_dir, current_images_dir, describe_generated_file, describe_generated_image
+from mcp_sessions import describe_server, get_mcp_session_manager, close_mcp_sessions
+from startup import preload_modules, wait_for_preload, profile_startup
+
+# CrewAI, LiteLLM, OpenAI, WandB and MCP are imported on first use (see startup.py)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Suppress Pydantic deprecation warnings
-warnings.filterwarnings("ignore", category=PydanticDeprecatedSince20)
-
-# Create a local files directory if it doesn't exist
-files_dir = os.path.join(os.getcwd(), "files")
-os.makedirs(files_dir, exist_ok=True)
-
-# Filesystem server configuration
-server_params = StdioServerParameters(
-    command="npx",
-    args=[
-        "-y",
-        "@modelcontextprotocol/server-filesystem",
-        files_dir,
-    ]
-)
-
-# EXA Search server configuration
-exa_search_params = StdioServerParameters(
-    command="npx",
-    args=[
-         "-y",
-        "mcp-remote",
-        "https://mcp.exa.ai/mcp?exaApiKey=8315fda2-c304-4563-800a-53888dff7683"
-    ],
-)
-
-# Image server configuration
-image_server_env = {"OPENAI_API_KEY": os.getenv("OPENAI_API_KEY")}
-if os.getenv("OPENAI_ORGANIZATION"):
-    image_server_env["OPENAI_ORGANIZATION"] = os.getenv("OPENAI_ORGANIZATION")
-
-image_server_params = StdioServerParameters(
-    command="python3",
-    args=[
-        "servers/image_server.py",
-    ],
-    env=image_server_env
-)
-
-# Custom MCP Tools for CrewAI
-class FileWriteInput(BaseModel):
-    filename: str = Field(description="Name of the file to write")
-    content: str = Field(description="Content to write to the file")
-
-class FileWriteTool(BaseTool):
-    name: str = "write_file"
-    description: str = "Write content to a file in the files directory"
-    args_schema: Type[BaseModel] = FileWriteInput
-    wandb_tracker: Any = None
-    
-    def __init__(self, wandb_tracker=None, **kwargs):
-        super().__init__(**kwargs)
-        self.wandb_tracker = wandb_tracker
-    
-    def _run(self, filename: str, content: str) -> str:
-        start_time = time.time()
-        success = False
-        try:
-            file_path = os.path.join(files_dir, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            success = True
-            result = f"Successfully wrote content to {filename}"
-        except Exception as e:
-            result = f"Error writing file: {str(e)}"
-        finally:
-            execution_time = time.time() - start_time
-            if self.wandb_tracker:
-                self.wandb_tracker.log_tool_usage("file_write", execution_time, success)
-        return result
-
-class WebSearchInput(BaseModel):
-    query: str = Field(description="Search query to execute")
-
-class WebSearchTool(BaseTool):
-    name: str = "web_search"
-    description: str = "Search the web using EXA Search API"
-    args_schema: Type[BaseModel] = WebSearchInput
-    wandb_tracker: Any = None
-    
-    def __init__(self, wandb_tracker=None, **kwargs):
-        super().__init__(**kwargs)
-        self.wandb_tracker = wandb_tracker
-    
-    def _run(self, query: str) -> str:
-        start_time = time.time()
-        success = False
-        try:
-            import requests
-            
-            # Use EXA Search API directly
-            api_key = os.getenv('BRAVE_API_KEY')
-            if not api_key:
-                return f"Brave API key not found. Please set BRAVE_API_KEY in your .env file."
-            
-            headers = {
-                'Accept': 'application/json',
-                'Accept-Encoding': 'gzip',
-                'X-Subscription-Token': api_key
-            }
-            
-            params = {
-                'q': query,
-                'count': 5
-            }
-            
-            response = requests.get(
-                'https://api.search.brave.com/res/v1/web/search',
-                headers=headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                if 'web' in data and 'results' in data['web']:
-                    for result in data['web']['results'][:3]:  # Top 3 results
-                        title = result.get('title', 'No title')
-                        description = result.get('description', 'No description')
-                        url = result.get('url', 'No URL')
-                        results.append(f"**{title}**\n{description}\nURL: {url}\n")
-                
-                if results:
-                    success = True
-                    result = f"Search results for '{query}':\n\n" + "\n".join(results)
-                else:
-                    success = True
-                    result = f"No results found for '{query}'"
-            else:
-                result = f"Search API error: {response.status_code} - {response.text}"
-                
-        except Exception as e:
-            result = f"Error performing web search: {str(e)}"
-        finally:
-            execution_time = time.time() - start_time
-            if self.wandb_tracker:
-                self.wandb_tracker.log_tool_usage("web_search", execution_time, success)
-        return result
-
-class ImageGenerateInput(BaseModel):
-    prompt: str = Field(description="Description of the image to generate")
-    filename: str = Field(description="Name for the generated image file")
-
-class ImageGenerateTool(BaseTool):
-    name: str = "generate_image"
-    description: str = "Generate an image using OpenAI DALL-E"
-    args_schema: Type[BaseModel] = ImageGenerateInput
-    wandb_tracker: Any = None
-    
-    def __init__(self, wandb_tracker=None, **kwargs):
-        super().__init__(**kwargs)
-        self.wandb_tracker = wandb_tracker
-    
-    def _run(self, prompt: str, filename: str) -> str:
-        start_time = time.time()
-        success = False
-        try:
-            from openai import OpenAI
-            import base64
-            
-            # Create images directory if it doesn't exist
-            images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
-            os.makedirs(images_dir, exist_ok=True)
-            
-            # Initialize OpenAI client directly
-            client = OpenAI(
-                api_key=os.getenv("OPENAI_API_KEY"),
-                organization=os.getenv("OPENAI_ORGANIZATION")
-            )
-            
-            # Generate image
-            result = client.images.generate(
-                model="dall-e-3",
-                prompt=f"Generate an image based on the following prompt: {prompt}",
-                size="1024x1024",
-                quality="hd",
-                response_format="b64_json"
-            )
-            
-            # Extract base64 image data and save
-            image_base64 = result.data[0].b64_json
-            image_bytes = base64.b64decode(image_base64)
-            
-            file_path = os.path.join(images_dir, f"{filename}.png")
-            with open(file_path, "wb") as f:
-                f.write(image_bytes)
-            
-            success = True
-            result = f"Successfully generated and saved image '{filename}.png' in images directory with prompt: {prompt}"
-            
-        except Exception as e:
-            result = f"Error generating image: {str(e)}"
-        finally:
-            execution_time = time.time() - start_time
-            if self.wandb_tracker:
-                self.wandb_tracker.log_tool_usage("image_generate", execution_time, success)
-        return result
-
-# Initialize WandB tracker
-wandb_tracker = None
-
-# Cleanup function to remove old files and images
-def cleanup_old_files():
-    """
-    Remove all existing files and images from previous runs to ensure
-    only the latest generated content is available.
-    """
-    files_removed = 0
-    images_removed = 0
-    
-    # Clean up files directory
-    if os.path.exists(files_dir):
-        for filename in os.listdir(files_dir):
-            if filename.endswith(('.txt', '.md', '.json')):
-                file_path = os.path.join(files_dir, filename)
-                try:
-                    os.remove(file_path)
-                    files_removed += 1
-                    print(f"🗑️ Removed old file: {filename}")
-                except Exception as e:
-                    print(f"❌ Error removing file {filename}: {e}")
-    
-    # Clean up images directory
-    images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
-    if os.path.exists(images_dir):
-        for filename in os.listdir(images_dir):
-            if filename.endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg')):
-                image_path = os.path.join(images_dir, filename)
-                try:
-                    os.remove(image_path)
-                    images_removed += 1
-                    print(f"🗑️ Removed old image: {filename}")
-                except Exception as e:
-                    print(f"❌ Error removing image {filename}: {e}")
-    
-    print(f"✅ Cleanup completed: {files_removed} files and {images_removed} images removed")
-    return files_removed, images_removed
-
-# Format content for rich text display
-def format_content_for_display(content):
-    """
-    Format content for rich text display with proper formatting.
-    """
-    # Add basic HTML-like formatting for better display
-    formatted = content.replace('\n\n', '</p><p>')
-    formatted = formatted.replace('\n', '<br>')
-    
-    # Format headers (lines that end with colon or are all caps)
-    lines = content.split('\n')
-    formatted_lines = []
-    
-    for line in lines:
-        stripped = line.strip()
-        if stripped:
-            # Check if line is a header (ends with colon, starts with #, or is all caps)
-            if (stripped.endswith(':') and len(stripped) < 100) or \
-               stripped.startswith('#') or \
-               (stripped.isupper() and len(stripped.split()) <= 10 and len(stripped) < 50):
-                formatted_lines.append(f'<h3 style="color: #2563eb; font-weight: bold; margin: 16px 0 8px 0;">{stripped}</h3>')
-            # Check for bullet points
-            elif stripped.startswith(('- ', '• ', '* ')):
-                formatted_lines.append(f'<li style="margin: 4px 0;">{stripped[2:]}</li>')
-            # Check for numbered lists
-            elif any(stripped.startswith(f'{i}.') for i in range(1, 20)):
-                formatted_lines.append(f'<li style="margin: 4px 0;">{stripped}</li>')
-            else:
-                formatted_lines.append(f'<p style="margin: 8px 0; line-height: 1.6;">{stripped}</p>')
-        else:
-            formatted_lines.append('<br>')
-    
-    # Wrap lists in proper ul tags
-    result = '\n'.join(formatted_lines)
-    result = result.replace('<li', '<ul><li').replace('</li>\n<p', '</li></ul>\n<p')
-    result = result.replace('</li>\n<br>', '</li></ul>\n<br>')
-    
-    return f'<div style="font-family: system-ui, -apple-system, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px;">{result}</div>'
-
 # Initialize tools with WandB tracking
 def initialize_tools_with_tracking(tracker=None):
-    return [
+    wait_for_preload()
+    from research_tools import FileWriteTool, WebSearchTool, WebSearchManyTool, ImageGenerateTool, ImageBatchTool
+    
+    web_search_tool = WebSearchTool(wandb_tracker=tracker)
+    image_tool = ImageGenerateTool(wandb_tracker=tracker)
+    tools = [
         FileWriteTool(wandb_tracker=tracker),
-        WebSearchTool(wandb_tracker=tracker),
-        ImageGenerateTool(wandb_tracker=tracker)
+        web_search_tool,
+        WebSearchManyTool(wandb_tracker=tracker, search_tool=web_search_tool),
+        image_tool,
+        ImageBatchTool(wandb_tracker=tracker, image_tool=image_tool)
     ]
+    # Tools of the MCP servers in MCP_SERVERS_ENABLED, over persistent sessions
+    session_manager = get_mcp_session_manager()
+    if session_manager:
+        from research_tools import create_mcp_tools
+        tools.extend(create_mcp_tools(session_manager, tracker))
+    return tools
 
 # Configure W&B Inference LLM
 def configure_wandb_inference_llm():
@@ -317,12 +64,19 @@ def configure_wandb_inference_llm():
         return None
     
     try:
-        llm = LLM(
-            model=wandb_model,
-            api_base="https://api.inference.wandb.ai/v1",
-            api_key=wandb_api_key,
-            extra_headers={"OpenAI-Project": wandb_project},
-        )
+        wait_for_preload()
+        from crewai import LLM
+        
+        llm_config = {
+            "model": wandb_model,
+            "api_base": "https://api.inference.wandb.ai/v1",
+            "api_key": wandb_api_key,
+            "extra_headers": {"OpenAI-Project": wandb_project},
+        }
+        # Streaming responses report time-to-first-token
+        if os.getenv('LLM_STREAM', 'false').lower() == 'true':
+            llm_config["stream"] = True
+        llm = LLM(**llm_config)
         print(f"✅ W&B Inference LLM configured: {wandb_model}")
         print(f"🔗 Project: {wandb_project}")
         return llm
@@ -330,91 +84,188 @@ def configure_wandb_inference_llm():
         print(f"❌ Failed to configure W&B Inference LLM: {str(e)}")
         return None
 
-# Example usage
-if __name__ == "__main__":
-    import sys
-    import json
-    
-    # Get research topic and query from environment variables or use defaults
-    research_topic = os.getenv('RESEARCH_TOPIC', 'Model Context Protocol')
-    research_query = os.getenv('RESEARCH_QUERY', 'How does MCP work and what are its key components?')
-    
-    # Clean up old files and images before starting new research
-    print("🧹 Cleaning up old files and images...")
-    cleanup_old_files()
-    
-    # Initialize WandB tracking
-    wandb_config = {
-        "research_topic": research_topic,
-        "research_query": research_query,
-        "framework": "CrewAI",
-        "mcp_version": "1.0.0",
-        "tools_count": 3,
-        "project_type": "AI_Agent_Research"
-    }
-    
-    # Create WandB tracker
-    wandb_tracker = WandBTracker(
-        project="mcp-crewlink-research",
-        config=wandb_config,
-        auto_init=True
-    )
-    
-    # Initialize tools with tracking
-    tools = initialize_tools_with_tracking(wandb_tracker)
-    
-    print("Server parameters configured successfully")
-    print(f"Filesystem server: {server_params}")
-    print(f"EXA Search server: {exa_search_params}")
-    print(f"Image server: {image_server_params}")
-    print(f"\nInitialized {len(tools)} MCP tools with WandB tracking")
-    print(f"Research Topic: {research_topic}")
-    print(f"Research Query: {research_query}")
-    
-    # Log system information
-    wandb_tracker.log_system_info()
+# Configure the agent's LLM, served through the response cache when enabled
+def configure_llm():
+    """
+    W&B Inference when configured, otherwise CrewAI's default model. With
+    LLM_CACHE_MODE set, the LLM is built explicitly (also the default one)
+    so its calls can go through the LLM response cache.
+    """
+    llm = configure_wandb_inference_llm()
+    cache = get_llm_cache()
+    if cache is None:
+        return llm
+    if llm is None:
+        wait_for_preload()
+        from crewai import LLM
+        
+        llm_config = {"model": os.getenv('OPENAI_MODEL_NAME', 'gpt-4o-mini')}
+        if os.getenv('LLM_STREAM', 'false').lower() == 'true':
+            llm_config["stream"] = True
+        llm = LLM(**llm_config)
+    print(f"💾 LLM response cache: {cache.mode} ({cache.path})")
+    return wrap_llm(llm, cache)
+
+# Mark task boundaries for LLM usage accounting and agent step tracing
+def task_usage_callback(usage_recorder, task_name, next_task_name=None, parts=1):
+    """
+    Callback of the CrewAI task(s) making up task_name. With parts > 1 (the
+    concurrent aspect tasks of the parallel crew) the task ends when the
+    last part finishes.
+    """
+    state = {"remaining": parts, "completed": False}
+    lock = threading.Lock()
+    
+    def callback(output):
+        raw = getattr(output, 'raw', output)
+        with lock:
+            state["completed"] = state["completed"] or bool(str(raw or '').strip())
+            state["remaining"] -= 1
+            if state["remaining"] > 0:
+                return
+        usage_recorder.finish_task(task_name, completed=state["completed"])
+        if next_task_name:
+            usage_recorder.start_task(next_task_name)
+        tracer = get_tracer()
+        if tracer:
+            tracer.mark()
+    return callback
+
+# Trace each agent step (a thought plus tool call, or the final answer)
+def trace_agent_step(step_output):
+    tracer = get_tracer()
+    if tracer:
+        tool = getattr(step_output, 'tool', None)
+        tracer.step(f"agent_step:{tool}" if tool else "agent_step", step_type=type(step_output).__name__)
+
+# Aspects of a topic researched concurrently by the parallel crew: (task name, agent role, focus)
+RESEARCH_ASPECTS = [
+    ("trends", "Trends Analyst", "current trends, market analysis, and recent developments"),
+    ("concepts", "Technical Researcher", "key concepts, definitions, and technical details"),
+    ("applications", "Applications Researcher", "practical applications, use cases, and real-world examples"),
+    ("challenges", "Risk Analyst", "challenges, limitations, and potential solutions"),
+    ("future", "Futures Analyst", "future implications and predictions"),
+    ("diagram", "Visual Designer", "the key concepts and relationships, explained in a detailed diagram"),
+]
+
+IMAGE_TOOL_NAMES = ("generate_image", "generate_images")
+
+# Build one agent and async task per research aspect
+def build_aspect_tasks(research_topic, research_query, tools, llm=None, usage_recorder=None):
+    """
+    CrewAI runs consecutive async_execution tasks concurrently; summary_task
+    takes them as context and waits for all of them. Every aspect agent has
+    its own search tools (see agent_search_tools); only the diagram agent
+    generates images, and none writes the report.
+    """
+    from crewai import Agent, Task
+    from research_tools import agent_search_tools
+    
+    callback = (task_usage_callback(usage_recorder, "research_task", "summary_task", parts=len(RESEARCH_ASPECTS))
+                if usage_recorder else None)
+    tasks = []
+    for name, role, focus in RESEARCH_ASPECTS:
+        aspect_tools = [
+            tool for tool in agent_search_tools(tools)
+            if tool.name != "write_file" and (name == "diagram" or tool.name not in IMAGE_TOOL_NAMES)
+        ]
+        agent_config = {
+            "role": role,
+            "goal": f"Research {focus} of {research_topic}.",
+            "backstory": f"An expert researcher on {focus}, working alongside other researchers who cover the other aspects of the topic.",
+            "tools": aspect_tools,
+            "verbose": True,
+        }
+        if llm:
+            agent_config["llm"] = llm
+        if name == "diagram":
+            description = f"""Create a detailed diagram that visually explains the key concepts and relationships of '{research_topic}' with focus on: {research_query}
+        
+        Search the web as needed to get the concepts right, then generate the diagram (use generate_images to create several diagrams at once). Report the image filenames and what each diagram shows."""
+        else:
+            description = f"""Research {focus} of '{research_topic}' with focus on: {research_query}
+        
+        Use web_search_many to run several queries at once. Other researchers cover the remaining aspects, so go deep on this one. Collect detailed, accurate, and current information with the URLs of its sources."""
+        tasks.append(Task(
+            name=name,
+            description=description,
+            expected_output=f"Detailed findings on {focus}, with sources.",
+            agent=Agent(**agent_config),
+            async_execution=True,
+            callback=callback,
+        ))
+    return tasks
+
+# Build the research agent, tasks and crew for a topic/query pair
+def build_research_crew(research_topic, research_query, tools, llm=None, usage_recorder=None,
+                        findings=None, report_instructions=None, crew_mode=None):
+    """
+    Create the research agent with its research and summary tasks.
+    With a usage recorder, task callbacks mark where each task ends so LLM
+    calls are charged to research_task or summary_task.
+    In the parallel crew mode (crew_mode or CREW_MODE), research_task is
+    replaced by concurrent per-aspect tasks (RESEARCH_ASPECTS).
+    With findings saved by an earlier run, only summary_task runs, on those
+    findings, and the agent keeps only the write_file tool.
+    Returns (crew, research_tasks, summary_task); research_tasks is empty
+    when the research is skipped.
+    """
+    wait_for_preload()
+    from crewai import Agent, Task, Crew
+    from research_tools import bind_workspace
     
-    # Configure W&B Inference LLM if available
-    wandb_llm = configure_wandb_inference_llm()
+    # The crew may run tasks on threads without the run's context
+    tools = bind_workspace(tools, get_current_workspace())
     
     # Create research agent with optional W&B Inference LLM
     agent_config = {
         "role": "Research Analyst",
         "goal": f"Research and analyze information about {research_topic} and provide comprehensive insights.",
         "backstory": "An expert research analyst who can search the web, analyze information, and create visual diagrams to explain complex topics.",
-        "tools": tools,
+        "tools": [tool for tool in tools if tool.name == "write_file"] if findings else tools,
         "verbose": True,
     }
     
     # Add LLM configuration if W&B Inference is available
-    if wandb_llm:
-        agent_config["llm"] = wandb_llm
+    if llm:
+        agent_config["llm"] = llm
         print("🤖 Agent configured with W&B Inference LLM")
     else:
         print("🤖 Agent using default LLM configuration")
     
     agent = Agent(**agent_config)
     
-    # Research task
-    research_task = Task(
-        description=f"""Conduct comprehensive research on '{research_topic}' with focus on: {research_query}
-        
-        1. Perform multiple web searches to gather comprehensive, up-to-date information
-        2. Research current trends, market analysis, and recent developments
-        3. Identify key concepts, definitions, and technical details
-        4. Find practical applications, use cases, and real-world examples
-        5. Discover challenges, limitations, and potential solutions
-        6. Create a detailed diagram that visually explains the key concepts and relationships
-        7. Gather information about future implications and predictions
-        
-        Focus on collecting detailed, accurate, and current information that will be used to create a comprehensive markdown report. Use multiple search queries to cover different aspects of the topic thoroughly.""",
-        expected_output="Comprehensive research findings with detailed information, current trends, and a visual diagram ready for report generation.",
-        agent=agent,
-    )
+    parallel = (crew_mode or os.getenv('CREW_MODE', 'sequential')) == 'parallel' and not findings
+    if findings:
+        research_tasks = []
+    elif parallel:
+        research_tasks = build_aspect_tasks(research_topic, research_query, tools, llm, usage_recorder)
+        # The analyst only writes the report from the aspect findings
+        agent_config["tools"] = [tool for tool in tools if tool.name == "write_file"]
+        agent = Agent(**agent_config)
+        print(f"🔀 Parallel crew: {len(research_tasks)} research agents, one per aspect")
+    else:
+        # Research task
+        research_task = Task(
+            description=f"""Conduct comprehensive research on '{research_topic}' with focus on: {research_query}
+            
+            1. Perform multiple web searches to gather comprehensive, up-to-date information (use web_search_many to run several queries at once)
+            2. Research current trends, market analysis, and recent developments
+            3. Identify key concepts, definitions, and technical details
+            4. Find practical applications, use cases, and real-world examples
+            5. Discover challenges, limitations, and potential solutions
+            6. Create a detailed diagram that visually explains the key concepts and relationships (use generate_images to create several diagrams at once)
+            7. Gather information about future implications and predictions
+            
+            Focus on collecting detailed, accurate, and current information that will be used to create a comprehensive markdown report. Use multiple search queries to cover different aspects of the topic thoroughly.""",
+            expected_output="Comprehensive research findings with detailed information, current trends, and a visual diagram ready for report generation.",
+            agent=agent,
+            callback=task_usage_callback(usage_recorder, "research_task", "summary_task") if usage_recorder else None,
+        )
+        research_tasks = [research_task]
     
     # Summary task
-    summary_task = Task(
-        description=f"""Create a detailed markdown report about {research_topic} based on the research findings.
+    summary_description = f"""Create a detailed markdown report about {research_topic} based on the research findings.
         
         Save the report as a markdown file in the files directory with filename: {research_topic.lower().replace(' ', '_')}_detailed_report.md
         
@@ -444,82 +295,277 @@ if __name__ == "__main__":
         - Conclusion
         - References and Sources
         
-        Make the report detailed, well-structured, and professionally formatted for easy reading.""",
+        Make the report detailed, well-structured, and professionally formatted for easy reading."""
+    if findings:
+        summary_description += f"""
+        
+        Focus of this report: {research_query}
+        
+        The research was done in an earlier run. Use only these findings; do not search again.
+        
+        {render_findings(findings, int(os.getenv('FINDINGS_TOKEN_BUDGET', '3000')))}"""
+    if report_instructions:
+        summary_description += f"""
+        
+        Additional instructions: {report_instructions}"""
+    
+    summary_task = Task(
+        description=summary_description,
+        # In the sequential crew the research output is passed on implicitly
+        **({"context": research_tasks} if parallel else {}),
         expected_output="A comprehensive detailed markdown report saved as an .md file with rich formatting.",
         agent=agent,
+        callback=task_usage_callback(usage_recorder, "summary_task") if usage_recorder else None,
     )
     
-    crew = Crew(
-        agents=[agent],
-        tasks=[research_task, summary_task],
-        verbose=True,
-    )
+    crew_config = {
+        "agents": [task.agent for task in research_tasks if task.agent is not agent] + [agent],
+        "tasks": research_tasks + [summary_task],
+        "verbose": True,
+        "step_callback": trace_agent_step,
+    }
+    # Respect LLM_REQUESTS_PER_MINUTE (this process's share of it under the scheduler)
+    max_rpm = llm_max_rpm()
+    if max_rpm:
+        crew_config["max_rpm"] = max_rpm
+    
+    crew = Crew(**crew_config)
+    return crew, research_tasks, summary_task
+
+# List the report and image paths produced by a run
+def list_generated_outputs():
+    run_files_dir = current_files_dir()
+    run_images_dir = current_images_dir()
+    file_paths = []
+    if os.path.exists(run_files_dir):
+        file_paths = [
+            os.path.join(run_files_dir, filename)
+            for filename in sorted(os.listdir(run_files_dir))
+            if filename.endswith(('.txt', '.md'))
+        ]
+    image_paths = []
+    if os.path.exists(run_images_dir):
+        image_paths = [
+            os.path.join(run_images_dir, filename)
+            for filename in sorted(os.listdir(run_images_dir))
+            if filename.endswith('.png')
+        ]
+    return file_paths, image_paths
+
+# Collect generated files and images into the structured output
+def collect_generated_outputs(output_data):
+    """
+    Add the files and images produced by a run to output_data.
+    With the event stream enabled, contents were already streamed as
+    file_ready/image_ready events, so only lightweight references are added.
+    Images are always references in IMAGE_OUTPUT=ref mode.
+    """
+    file_paths, image_paths = list_generated_outputs()
+    
+    for file_path in file_paths:
+        try:
+            if events_enabled():
+                filename = os.path.basename(file_path)
+                output_data["files_generated"].append({
+                    "filename": filename,
+                    "path": file_path,
+                    "file_type": "markdown" if filename.endswith('.md') else "text"
+                })
+            else:
+                output_data["files_generated"].append(describe_generated_file(file_path))
+        except Exception as e:
+            print(f"Error reading file {os.path.basename(file_path)}: {e}")
+    
+    for image_path in image_paths:
+        try:
+            if events_enabled() and os.getenv('IMAGE_OUTPUT', 'inline') != 'ref':
+                output_data["images_generated"].append({
+                    "filename": os.path.basename(image_path),
+                    "path": image_path,
+                    "run_id": output_data.get("run_id")
+                })
+            else:
+                output_data["images_generated"].append(describe_generated_image(image_path))
+        except Exception as e:
+            print(f"Error reading image {os.path.basename(image_path)}: {e}")
+    return output_data
+
+# Stream the reports and images of a cached run again
+def emit_cached_outputs(output_data):
+    """Event consumers build the report from file_ready/image_ready, so a cache hit emits them too."""
+    if not events_enabled():
+        return
+    for file_data in output_data.get("files_generated", []):
+        emit_event("file_ready", **describe_generated_file(file_data["path"]))
+    for image_data in output_data.get("images_generated", []):
+        emit_event("image_ready", **describe_generated_image(image_data["path"], run_id=output_data.get("run_id")))
+
+# Serve a repeated topic/query from the run cache
+def cached_run_output(research_topic, research_query, tracker=None, crew_mode=None):
+    """Return the cached output of a fresh identical run, or None."""
+    run_cache = get_run_cache()
+    if run_cache is None:
+        return None
+    start_time = time.time()
+    output_data = run_cache.get(research_topic, research_query, run_config_from_env(crew_mode))
+    if output_data is not None:
+        print(f"⚡ Served from the run cache in {(time.time() - start_time) * 1000:.1f} ms "
+              f"(run {output_data.get('run_id')}, {output_data['run_cache']['age']:.0f} seconds old)")
+        emit_event("progress", stage="run_cache_hit", message="Served from the run cache",
+                   run_id=output_data.get("run_id"))
+        emit_cached_outputs(output_data)
+        if tracker:
+            tracker.log_metrics(run_cache.stats())
+    return output_data
+
+# Run one research job with already-initialized tools, tracker and LLM
+def run_research(research_topic, research_query, tools, tracker, llm=None, run_id=None, trace=None,
+                 findings=None, report_instructions=None, crew_mode=None):
+    """
+    Run the research crew for a single topic/query in its own workspace
+    and return the structured output dictionary consumed by the API.
+    With tracing (trace=True or TRACE_RUNS=true) the run's spans are
+    written to trace.json in the workspace as Chrome trace JSON.
+    With findings (see research_findings.py) only the report is regenerated.
+    Full runs are stored in the run cache; callers look it up first.
+    """
+    workspace = Workspace(run_id).create()
+    token = set_current_workspace(workspace)
+    tracer = Tracer(workspace.run_id) if (trace if trace is not None else tracing_enabled_by_env()) else None
+    set_tracer(tracer)
+    try:
+        with span("research_run", "run", run_id=workspace.run_id, research_topic=research_topic):
+            output_data = _run_research_in_workspace(workspace, research_topic, research_query, tools, tracker, llm,
+                                                     findings, report_instructions, crew_mode)
+        if tracer:
+            output_data["trace_file"] = tracer.export_chrome(os.path.join(workspace.path, "trace.json"))
+            print(f"🧵 Trace with {tracer.span_count()} spans written to {output_data['trace_file']}")
+        run_cache = get_run_cache()
+        if run_cache and output_data.get("success") and not findings and not report_instructions:
+            run_cache.set(research_topic, research_query, output_data, run_config_from_env(crew_mode))
+        return output_data
+    finally:
+        set_tracer(None)
+        reset_current_workspace(token)
+        workspace.release()
+
+def _run_research_in_workspace(workspace, research_topic, research_query, tools, tracker, llm,
+                               findings=None, report_instructions=None, crew_mode=None):
+    print(f"📂 Run {workspace.run_id} workspace: {workspace.path}")
+    emit_event("progress", stage="workspace", message="Created run workspace",
+               run_id=workspace.run_id, workspace=workspace.path)
+    
+    # Search results are aggregated per run
+    aggregators = {id(tool.aggregator): tool.aggregator for tool in tools if getattr(tool, 'aggregator', None)}
+    for aggregator in aggregators.values():
+        aggregator.reset()
+    
+    print(f"Research Topic: {research_topic}")
+    print(f"Research Query: {research_query}")
+    
+    if findings:
+        # The report can use the images of the earlier run
+        reused_images = reuse_images(findings, workspace.images_dir)
+        print(f"♻️ Reusing findings of run {findings['run_id']} ({len(findings.get('sources', []))} sources, "
+              f"{len(reused_images)} images); skipping research_task")
+        emit_event("progress", stage="findings_reused", message="Regenerating the report from saved findings",
+                   findings_run_id=findings["run_id"])
+    
+    # Per-task LLM tokens, latency and cost, recorded from LiteLLM callbacks
+    usage_recorder = LLMUsageRecorder()
+    if not install_litellm_callback():
+        print("⚠️ LiteLLM callbacks unavailable. Per-task LLM usage will not be recorded.")
+    crew, research_tasks, summary_task = build_research_crew(research_topic, research_query, tools, llm,
+                                                             usage_recorder=usage_recorder, findings=findings,
+                                                             report_instructions=report_instructions,
+                                                             crew_mode=crew_mode)
+    # Agents of the parallel crew search with their own aggregators
+    for crew_agent in crew.agents:
+        for tool in crew_agent.tools:
+            if getattr(tool, 'aggregator', None):
+                aggregators.setdefault(id(tool.aggregator), tool.aggregator)
     
     # Track crew execution time
     crew_start_time = time.time()
     print("\n🚀 Starting CrewAI research workflow...")
-    
-    result = crew.kickoff()
+    emit_event("progress", stage="crew_started", message="Starting CrewAI research workflow",
+               research_topic=research_topic, research_query=research_query)
+    
+    # Image tools return a job handle at once; the images render while the agents work
+    image_jobs = ImageJobs(int(os.getenv('IMAGE_JOB_WORKERS', '4'))) if background_images_enabled() else None
+    set_image_jobs(image_jobs)
+    image_job_results = []
+    
+    set_usage_recorder(usage_recorder)
+    usage_recorder.start_task("summary_task" if findings else "research_task", at=crew_start_time)
+    tracer = get_tracer()
+    if tracer:
+        tracer.mark(crew_start_time)
+    try:
+        result = crew.kickoff()
+    finally:
+        set_usage_recorder(None)
+        set_image_jobs(None)
+        if image_jobs:
+            # Outstanding images must be on disk before outputs and findings are collected
+            with span("image_jobs_wait", "run", pending=image_jobs.pending()):
+                image_job_results = image_jobs.wait(float(os.getenv('IMAGE_JOB_TIMEOUT', '300')))
+            # Jobs still running past the timeout must not write into the collected workspace
+            image_jobs.close()
+            unfinished = [job["handle"] for job in image_job_results if job["status"] != "completed"]
+            if unfinished:
+                print(f"⚠️ Image jobs not completed: {', '.join(unfinished)}")
+        # Saved even when the summary fails, so the report can be retried without the research
+        findings_file = save_research_findings(workspace, research_topic, research_query, research_tasks, aggregators)
+        if tracer:
+            # Task spans from the boundaries marked by the task callbacks
+            for task in usage_recorder.tasks().values():
+                if task.started_at is not None:
+                    tracer.add_span(task.name, "task", task.started_at, task.finished_at or time.time(),
+                                    llm_calls=task.calls, completed=task.completed)
     
     crew_execution_time = time.time() - crew_start_time
+    emit_event("progress", stage="crew_finished", message="CrewAI research workflow finished",
+               execution_time=crew_execution_time)
+    
+    # Tokens from the callbacks; CrewAI's own crew-wide count if none arrived
+    tokens_used = usage_recorder.total_tokens()
+    if not tokens_used:
+        tokens_used = getattr(getattr(result, 'token_usage', None), 'total_tokens', 0) or 0
     
     # Log agent performance metrics
-    wandb_tracker.log_agent_performance(
+    tracker.log_agent_performance(
         agent_name="research_analyst",
         task_completion_time=crew_execution_time,
-        success_rate=1.0 if result else 0.0
+        success_rate=usage_recorder.success_rate(),
+        tokens_used=tokens_used
     )
     
     # Output structured results for the API
     output_data = {
         "success": True,
+        "run_id": workspace.run_id,
+        "workspace": workspace.path,
         "research_topic": research_topic,
         "research_query": research_query,
         "crew_result": str(result),
+        "execution_time": crew_execution_time,
+        "crew_mode": "parallel" if len(research_tasks) > 1 else "sequential",
         "files_generated": [],
-        "images_generated": []
+        "images_generated": [],
+        "llm_usage": usage_recorder.summary()
     }
-    
-    # Check for generated files
-    if os.path.exists(files_dir):
-        for filename in os.listdir(files_dir):
-            if filename.endswith(('.txt', '.md')):
-                file_path = os.path.join(files_dir, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    output_data["files_generated"].append({
-                        "filename": filename,
-                        "content": content,
-                        "path": file_path,
-                        "file_type": "markdown" if filename.endswith('.md') else "text",
-                        "formatted_content": format_content_for_display(content)
-                    })
-                except Exception as e:
-                    print(f"Error reading file {filename}: {e}")
-    
-    # Check for generated images
-    images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
-    if os.path.exists(images_dir):
-        for filename in os.listdir(images_dir):
-            if filename.endswith('.png'):
-                image_path = os.path.join(images_dir, filename)
-                try:
-                    import base64
-                    with open(image_path, 'rb') as f:
-                        image_data = f.read()
-                    image_base64 = base64.b64encode(image_data).decode('utf-8')
-                    output_data["images_generated"].append({
-                        "filename": filename,
-                        "base64": image_base64,
-                        "path": image_path
-                    })
-                except Exception as e:
-                    print(f"Error reading image {filename}: {e}")
+    if findings_file:
+        output_data["findings_file"] = findings_file
+    if findings:
+        output_data["findings_run_id"] = findings["run_id"]
+    if image_job_results:
+        output_data["image_jobs"] = image_job_results
+    collect_generated_outputs(output_data)
     
     # Log research progress metrics
-    search_queries_count = len([task for task in [research_task, summary_task] if 'search' in task.description.lower()])
-    wandb_tracker.log_research_progress(
+    search_queries_count = len([task for task in research_tasks + [summary_task] if 'search' in task.description.lower()])
+    tracker.log_research_progress(
         research_topic=research_topic,
         search_queries=search_queries_count,
         files_generated=len(output_data['files_generated']),
@@ -533,14 +579,47 @@ if __name__ == "__main__":
         "images_generated_count": len(output_data['images_generated']),
         "workflow_success": True
     }
-    wandb_tracker.log_metrics(final_metrics)
-    
-    # Print structured output for API consumption
-    print("\n=== STRUCTURED_OUTPUT_START ===")
-    print(json.dumps(output_data, indent=2))
-    print("=== STRUCTURED_OUTPUT_END ===")
-    
-    # Display generated reports in rich text format
+    for aggregator in aggregators.values():
+        final_metrics.update(aggregator.stats())
+    final_metrics.update(rate_limit_stats())
+    final_metrics.update(usage_recorder.metrics())
+    session_manager = get_mcp_session_manager()
+    if session_manager:
+        final_metrics.update(session_manager.stats())
+    if image_jobs:
+        final_metrics.update(image_jobs.stats())
+    llm_cache = get_llm_cache()
+    if llm_cache:
+        final_metrics.update(llm_cache.stats())
+        output_data["llm_cache"] = llm_cache.stats()
+    tracker.log_metrics(final_metrics)
+    return output_data
+
+# Persist what research_task found for later report-only runs
+def save_research_findings(workspace, research_topic, research_query, research_tasks, aggregators):
+    """Write findings.json to the workspace once the research tasks have output. Returns its path or None."""
+    outputs = [(task, getattr(getattr(task, 'output', None), 'raw', None)) for task in research_tasks]
+    outputs = [(task, raw) for task, raw in outputs if raw]
+    if not outputs:
+        return None
+    if len(research_tasks) == 1:
+        notes = outputs[0][1]
+    else:
+        # One section per aspect of the parallel crew
+        notes = "\n\n".join(f"## {getattr(task, 'name', None) or 'Findings'}\n{raw}" for task, raw in outputs)
+    try:
+        sources = [source for aggregator in aggregators.values() for source in aggregator.top()]
+        findings = collect_findings(workspace, research_topic, research_query, notes, sources,
+                                    list_generated_outputs()[1])
+        path = save_findings(workspace, findings)
+        print(f"🗂️ Research findings saved to {path} ({len(sources)} sources)")
+        return path
+    except Exception as e:
+        print(f"⚠️ Failed to save research findings: {str(e)}")
+        return None
+
+# Display generated reports in rich text format
+def print_research_summary(output_data):
     print("\n" + "="*80)
     print("📋 GENERATED REPORTS - DETAILED VIEW")
     print("="*80)
@@ -565,8 +644,334 @@ if __name__ == "__main__":
     
     print("\n✅ Research completed successfully!")
     print(f"📊 Generated {len(output_data['files_generated'])} files and {len(output_data['images_generated'])} images")
-    print(f"⏱️ Total execution time: {crew_execution_time:.2f} seconds")
+    print(f"⏱️ Total execution time: {output_data['execution_time']:.2f} seconds")
+
+# Resident worker that keeps tools, LLM client and tracker warm between jobs
+class ResearchWorker:
+    """
+    Long-lived research worker. Tools, the W&B Inference LLM and the WandB
+    tracker are created once and reused for every job, so a job only pays
+    for building its crew and running it.
+    
+    Jobs are JSON objects, one per line:
+        {"id": "job-1", "topic": "...", "query": "...", "run_id": null, "dry_run": false, "events": false, "trace": false,
+         "crew_mode": "parallel"}
+        {"op": "ping"}
+        {"op": "shutdown"}
+    Every job gets exactly one JSON response line.
+    """
+    
+    def __init__(self, tracker=None, tools=None, llm=None, start_janitor=True):
+        start_time = time.time()
+        preload_modules()
+        if tracker is None:
+            tracker = WandBTracker(
+                project="mcp-crewlink-research",
+                config={
+                    "framework": "CrewAI",
+                    "mcp_version": "1.0.0",
+                    "project_type": "AI_Agent_Research",
+                    "mode": "worker"
+                },
+                auto_init=True
+            )
+            tracker.log_system_info()
+        self.tracker = tracker
+        self.tools = tools if tools is not None else initialize_tools_with_tracking(tracker)
+        tracker.update_config({"tools_count": len(self.tools)})
+        self.llm = llm if llm is not None else configure_llm()
+        self.jobs_completed = 0
+        # Each job writes to its own workspace, but the tools' search aggregators
+        # are per run, so jobs in one worker still run one at a time
+        self._job_lock = threading.Lock()
+        # Evict old workspaces in the background; the scheduler runs a single janitor for all workers
+        self.janitor = get_workspace_janitor().start() if start_janitor else None
+        self.startup_time = time.time() - start_time
+        print(f"🔥 Research worker ready in {self.startup_time:.2f} seconds")
+    
+    def handle_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single job and return its JSON-serializable response."""
+        job_id = job.get("id")
+        op = job.get("op", "research")
+        
+        if op == "ping":
+            return {"id": job_id, "success": True, "op": "ping", "jobs_completed": self.jobs_completed}
+        if op == "shutdown":
+            return {"id": job_id, "success": True, "op": "shutdown"}
+        if op == "invalidate":
+            # Drop cached runs of a topic (and query); without a topic, all of them
+            run_cache = get_run_cache()
+            invalidated = run_cache.invalidate(job.get("topic"), job.get("query")) if run_cache else 0
+            return {"id": job_id, "success": True, "op": "invalidate", "invalidated": invalidated}
+        
+        research_topic = job.get("topic") or os.getenv('RESEARCH_TOPIC', 'Model Context Protocol')
+        research_query = job.get("query") or os.getenv('RESEARCH_QUERY', 'How does MCP work and what are its key components?')
+        
+        # Repeated jobs are answered without waiting for the running one
+        if not any(job.get(name) for name in ("dry_run", "fresh", "from_findings", "report_instructions")):
+            start_time = time.time()
+            output_data = cached_run_output(research_topic, research_query, self.tracker, job.get("crew_mode"))
+            if output_data is not None:
+                output_data["id"] = job_id
+                output_data["job_time"] = time.time() - start_time
+                return output_data
+        
+        with self._job_lock:
+            setup_start_time = time.time()
+            try:
+                if job.get("dry_run"):
+                    # Build everything a real job needs up to the first LLM call
+                    build_research_crew(research_topic, research_query, self.tools, self.llm,
+                                        crew_mode=job.get("crew_mode"))
+                    output_data = {
+                        "success": True,
+                        "research_topic": research_topic,
+                        "research_query": research_query,
+                        "dry_run": True
+                    }
+                else:
+                    # "from_findings": a run id, or true for the latest findings on the topic
+                    findings = resolve_findings(job["from_findings"], research_topic) if job.get("from_findings") else None
+                    output_data = run_research(research_topic, research_query, self.tools, self.tracker, self.llm,
+                                               run_id=job.get("run_id"), trace=job.get("trace"), findings=findings,
+                                               report_instructions=job.get("report_instructions"),
+                                               crew_mode=job.get("crew_mode"))
+                    self.jobs_completed += 1
+            except Exception as e:
+                output_data = {"success": False, "error": str(e)}
+            output_data["id"] = job_id
+            output_data["job_time"] = time.time() - setup_start_time
+        return output_data
+    
+    def serve_stdio(self, stdin=None, stdout=None):
+        """Read jobs from stdin and write one response line per job to stdout."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"success": False, "error": f"Invalid job: {str(e)}"}
+            else:
+                # Jobs may ask for NDJSON events ahead of their final response line
+                if job.get("events"):
+                    set_event_emitter(EventEmitter(stdout, context={"id": job.get("id")}))
+                # Crew output goes to stderr so stdout only carries responses
+                try:
+                    with contextlib.redirect_stdout(sys.stderr):
+                        response = self.handle_job(job)
+                finally:
+                    set_event_emitter(None)
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+            if response.get("op") == "shutdown":
+                break
+    
+    def serve_socket(self, socket_path):
+        """Accept jobs over a local Unix socket, one job per connection line."""
+        import socketserver
+        
+        worker = self
+        
+        class JobHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        job = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        response = {"success": False, "error": f"Invalid job: {str(e)}"}
+                    else:
+                        response = worker.handle_job(job)
+                    self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+                    self.wfile.flush()
+                    if response.get("op") == "shutdown":
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        return
+        
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        
+        with socketserver.ThreadingUnixStreamServer(socket_path, JobHandler) as server:
+            server.daemon_threads = True
+            print(f"🔌 Research worker listening on {socket_path}")
+            try:
+                server.serve_forever()
+            finally:
+                if os.path.exists(socket_path):
+                    os.remove(socket_path)
+    
+    def close(self):
+        if self.janitor:
+            self.janitor.stop()
+        close_mcp_sessions()
+        close_http_clients()
+        self.tracker.finish_run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MCP-CrewLink research assistant")
+    parser.add_argument("--worker", action="store_true",
+                        help="Run as a resident worker that accepts research jobs as JSON lines on stdin")
+    parser.add_argument("--socket", default=os.getenv("RESEARCH_WORKER_SOCKET"),
+                        help="Serve worker jobs on this Unix socket path instead of stdin")
+    parser.add_argument("--events", action="store_true",
+                        help="Stream NDJSON events (progress, tool_call, file_ready, image_ready, done) on stdout; logs go to stderr")
+    parser.add_argument("--image-output", choices=["inline", "ref"], default=None,
+                        help="Report images as inline base64 or as path/size/hash references (default: IMAGE_OUTPUT or inline)")
+    parser.add_argument("--crew-mode", choices=["sequential", "parallel"], default=None,
+                        help="Research with one agent, or with one agent per aspect running concurrently (default: CREW_MODE or sequential)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print the import-time breakdown of startup (eager vs. deferred imports) and exit")
+    parser.add_argument("--trace", action="store_true",
+                        help="Write each run's spans to trace.json in its workspace (Chrome trace format; default: TRACE_RUNS)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Run even if a cached run of this topic/query is fresh; the new output replaces it")
+    parser.add_argument("--invalidate-cache", action="store_true",
+                        help="Drop the cached runs of RESEARCH_TOPIC/RESEARCH_QUERY and exit")
+    parser.add_argument("--from-findings", nargs="?", const="latest", default=None, metavar="RUN_ID",
+                        help="Skip the research and write the report from the findings of RUN_ID (default: the latest run on RESEARCH_TOPIC)")
+    parser.add_argument("--report-instructions", default=None,
+                        help="Extra instructions for the report, e.g. formatting changes or a follow-up question")
+    return parser.parse_args(argv)
+
+
+# Run one research job configured from RESEARCH_TOPIC/RESEARCH_QUERY
+def run_from_environment(fresh=False, from_findings=None, report_instructions=None):
+    """
+    Set up tracking, tools and the LLM, run the research crew and return
+    (output_data, wandb_tracker). The caller finishes the WandB run.
+    A cached run of the same topic/query is returned before any setup,
+    with no tracker, unless fresh is set. from_findings (a run id or
+    "latest") regenerates only the report from that run's findings.
+    """
+    # Get research topic and query from environment variables or use defaults
+    research_topic = os.getenv('RESEARCH_TOPIC', 'Model Context Protocol')
+    research_query = os.getenv('RESEARCH_QUERY', 'How does MCP work and what are its key components?')
+    
+    findings = resolve_findings(from_findings, research_topic) if from_findings else None
+    if not (fresh or findings or report_instructions):
+        output_data = cached_run_output(research_topic, research_query)
+        if output_data is not None:
+            return output_data, None
+    
+    # Import CrewAI and LiteLLM in the background while the WandB run starts
+    preload_modules()
+    
+    # Initialize WandB tracking
+    wandb_config = {
+        "research_topic": research_topic,
+        "research_query": research_query,
+        "framework": "CrewAI",
+        "mcp_version": "1.0.0",
+        "project_type": "AI_Agent_Research"
+    }
     
-    # Finish WandB run
-    wandb_tracker.finish_run()
-    print("🎯 WandB tracking completed!")
\ No newline at end of file
+    # Create WandB tracker
+    wandb_tracker = WandBTracker(
+        project="mcp-crewlink-research",
+        config=wandb_config,
+        auto_init=True
+    )
+    
+    # Initialize tools with tracking
+    tools = initialize_tools_with_tracking(wandb_tracker)
+    wandb_tracker.update_config({"tools_count": len(tools)})
+    
+    print("Server parameters configured successfully")
+    print(f"Filesystem server: {describe_server('filesystem')}")
+    print(f"EXA Search server: {describe_server('exa_search')}")
+    print(f"Image server: {describe_server('image')}")
+    print(f"\nInitialized {len(tools)} MCP tools with WandB tracking")
+    emit_event("progress", stage="tools_ready", message=f"Initialized {len(tools)} tools")
+    
+    # Log system information
+    wandb_tracker.log_system_info()
+    
+    # Configure W&B Inference LLM if available
+    wandb_llm = configure_llm()
+    
+    # Evict workspaces of old runs; active runs of other processes are kept
+    get_workspace_janitor().sweep()
+    
+    output_data = run_research(research_topic, research_query, tools, wandb_tracker, wandb_llm,
+                               findings=findings, report_instructions=report_instructions)
+    close_mcp_sessions()
+    close_http_clients()
+    return output_data, wandb_tracker
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile_startup:
+        profile_startup()
+        return
+    if args.image_output:
+        os.environ['IMAGE_OUTPUT'] = args.image_output
+    if args.crew_mode:
+        os.environ['CREW_MODE'] = args.crew_mode
+    if args.trace:
+        os.environ['TRACE_RUNS'] = 'true'
+    if args.invalidate_cache:
+        run_cache = get_run_cache()
+        invalidated = run_cache.invalidate(
+            os.getenv('RESEARCH_TOPIC', 'Model Context Protocol'),
+            os.getenv('RESEARCH_QUERY', 'How does MCP work and what are its key components?')
+        ) if run_cache else 0
+        print(f"🗑️ Invalidated {invalidated} cached runs")
+        return
+    
+    if args.worker or args.socket:
+        # Keep stdout clean for job responses in stdin mode
+        with contextlib.redirect_stdout(sys.stderr):
+            worker = ResearchWorker()
+        try:
+            if args.socket:
+                worker.serve_socket(args.socket)
+            else:
+                worker.serve_stdio()
+        finally:
+            with contextlib.redirect_stdout(sys.stderr):
+                worker.close()
+        return
+    
+    if args.events:
+        # stdout carries only events; everything else is logged to stderr
+        set_event_emitter(EventEmitter(sys.stdout))
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                output_data, wandb_tracker = run_from_environment(
+                    fresh=args.fresh, from_findings=args.from_findings, report_instructions=args.report_instructions
+                )
+            except Exception as e:
+                emit_event("error", error=str(e))
+                sys.exit(1)
+            emit_event("done", **output_data)
+            if wandb_tracker:
+                wandb_tracker.finish_run()
+        return
+    
+    output_data, wandb_tracker = run_from_environment(
+        fresh=args.fresh, from_findings=args.from_findings, report_instructions=args.report_instructions
+    )
+    
+    # Print structured output for API consumption
+    print("\n=== STRUCTURED_OUTPUT_START ===")
+    print(json.dumps(output_data, indent=2))
+    print("=== STRUCTURED_OUTPUT_END ===")
+    
+    print_research_summary(output_data)
+    
+    # Finish WandB run; cached runs start none
+    if wandb_tracker:
+        wandb_tracker.finish_run()
+        print("🎯 WandB tracking completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import os
+import re
+import html
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# Inline styles matching the report viewer
+WRAPPER_STYLE = "font-family: system-ui, -apple-system, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px;"
+HEADER_STYLE = "color: #2563eb; font-weight: bold; margin: 16px 0 8px 0;"
+HEADER_SIZES = {1: "2em", 2: "1.5em", 3: "1.25em", 4: "1.1em", 5: "1em", 6: "0.9em"}
+PARAGRAPH_STYLE = "margin: 8px 0; line-height: 1.6;"
+LIST_STYLE = "margin: 8px 0; padding-left: 24px;"
+LIST_ITEM_STYLE = "margin: 4px 0;"
+CODE_BLOCK_STYLE = "background: #f3f4f6; padding: 12px; border-radius: 6px; overflow-x: auto;"
+INLINE_CODE_STYLE = "background: #f3f4f6; padding: 1px 4px; border-radius: 4px;"
+BLOCKQUOTE_STYLE = "border-left: 4px solid #93c5fd; margin: 12px 0; padding: 4px 12px; color: #4b5563;"
+TABLE_STYLE = "border-collapse: collapse; margin: 12px 0;"
+CELL_STYLE = "border: 1px solid #e5e7eb; padding: 6px 10px;"
+
+HEADER_RE = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+LIST_ITEM_RE = re.compile(r"^(\s*)(?:([-*+•])|(\d{1,9})[.)])\s+(.*)$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)\s*([\w+-]*)")
+HR_RE = re.compile(r"^\s*(?:(?:\*\s*){3,}|(?:-\s*){3,}|(?:_\s*){3,})$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+
+CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+# URLs may contain one level of balanced parentheses, e.g. https://en.wikipedia.org/wiki/Foo_(bar)
+LINK_RE = re.compile(r"\[([^\]]+)\]\(((?:[^()\s]|\([^()\s]*\))+)\)")
+BOLD_RE = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__")
+ITALIC_RE = re.compile(r"(?<![*\w])\*(?=\S)(.+?)(?<=\S)\*(?!\*)|(?<![_\w])_(?=\S)(.+?)(?<=\S)_(?![_\w])")
+INLINE_SPECIAL_RE = re.compile(r"[`\[*_&<>\"']")
+SAFE_URL_RE = re.compile(r"^(?:https?:|mailto:|#|/|\./|\.\./)|^[^:]*$", re.IGNORECASE)
+
+
+def _render_emphasis(text: str) -> str:
+    """Escape plain text and apply bold and italics."""
+    text = html.escape(text)
+    if '*' not in text and '_' not in text:
+        return text
+    text = BOLD_RE.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+    return ITALIC_RE.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+
+
+def _render_text(text: str) -> str:
+    """Render links and emphasis; emphasis never touches generated link markup."""
+    if '](' not in text:
+        return _render_emphasis(text)
+    parts = []
+    position = 0
+    for match in LINK_RE.finditer(text):
+        label, url = match.group(1), match.group(2)
+        if not SAFE_URL_RE.match(url):
+            continue
+        parts.append(_render_emphasis(text[position:match.start()]))
+        parts.append(
+            f'<a href="{html.escape(url)}" target="_blank" rel="noopener noreferrer">{_render_emphasis(label)}</a>'
+        )
+        position = match.end()
+    parts.append(_render_emphasis(text[position:]))
+    return "".join(parts)
+
+
+def render_inline(text: str) -> str:
+    """Render inline markdown; code spans are kept verbatim."""
+    # Most report lines are plain prose with nothing to escape or format
+    if not INLINE_SPECIAL_RE.search(text):
+        return text
+    if '`' not in text:
+        return _render_text(text)
+    parts = []
+    position = 0
+    for match in CODE_SPAN_RE.finditer(text):
+        parts.append(_render_text(text[position:match.start()]))
+        parts.append(f'<code style="{INLINE_CODE_STYLE}">{html.escape(match.group(2).strip())}</code>')
+        position = match.end()
+    parts.append(_render_text(text[position:]))
+    return "".join(parts)
+
+
+def _is_heuristic_header(stripped: str) -> bool:
+    # Plain-text reports mark headers with a trailing colon or ALL CAPS
+    return (stripped.endswith(':') and len(stripped) < 100) or \
+        (stripped.isupper() and len(stripped.split()) <= 10 and len(stripped) < 50)
+
+
+def _split_row(line: str) -> List[str]:
+    stripped = line.strip()
+    if stripped.startswith('|'):
+        stripped = stripped[1:]
+    if stripped.endswith('|') and not stripped.endswith('\\|'):
+        stripped = stripped[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", stripped)]
+
+
+def _alignments(separator: str) -> List[Optional[str]]:
+    aligns = []
+    for cell in _split_row(separator):
+        if cell.startswith(':') and cell.endswith(':'):
+            aligns.append("center")
+        elif cell.endswith(':'):
+            aligns.append("right")
+        elif cell.startswith(':'):
+            aligns.append("left")
+        else:
+            aligns.append(None)
+    return aligns
+
+
+class _Renderer:
+    """Line-by-line state machine; each input line is visited once."""
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.paragraph: List[str] = []
+        self.quote: List[str] = []
+        # Open lists as (tag, indent)
+        self.lists: List[Tuple[str, int]] = []
+
+    # Block closing helpers
+    def close_paragraph(self):
+        if self.paragraph:
+            self.out.append(f'<p style="{PARAGRAPH_STYLE}">' + "<br>".join(self.paragraph) + "</p>")
+            self.paragraph = []
+
+    def close_quote(self):
+        if self.quote:
+            self.out.append(f'<blockquote style="{BLOCKQUOTE_STYLE}">' + "<br>".join(self.quote) + "</blockquote>")
+            self.quote = []
+
+    def close_lists(self, indent: int = -1):
+        while self.lists and self.lists[-1][1] > indent:
+            tag, _ = self.lists.pop()
+            self.out.append(f"</li></{tag}>")
+
+    def close_blocks(self):
+        self.close_paragraph()
+        self.close_quote()
+        self.close_lists()
+
+    # Block renderers
+    def list_item(self, indent: int, ordered: bool, number: Optional[str], text: str):
+        self.close_paragraph()
+        self.close_quote()
+        tag = "ol" if ordered else "ul"
+        # Leave deeper lists; a different list type at the same level starts a new list
+        self.close_lists(indent)
+        if self.lists and self.lists[-1][1] == indent and self.lists[-1][0] != tag:
+            self.close_lists(indent - 1)
+
+        if self.lists and self.lists[-1][1] == indent:
+            self.out.append(f'</li><li style="{LIST_ITEM_STYLE}">')
+        else:
+            start = f' start="{int(number)}"' if ordered and number and int(number) != 1 else ""
+            self.out.append(f'<{tag} style="{LIST_STYLE}"{start}><li style="{LIST_ITEM_STYLE}">')
+            self.lists.append((tag, indent))
+        self.out.append(render_inline(text))
+
+    def header(self, level: int, text: str):
+        self.close_blocks()
+        style = f"{HEADER_STYLE} font-size: {HEADER_SIZES[level]};"
+        self.out.append(f'<h{level} style="{style}">{render_inline(text)}</h{level}>')
+
+    def table(self, header: str, separator: str, rows: List[str]):
+        self.close_blocks()
+        aligns = _alignments(separator)
+
+        def cells(line, tag):
+            rendered = []
+            for index, cell in enumerate(_split_row(line)):
+                align = aligns[index] if index < len(aligns) else None
+                style = CELL_STYLE + (f" text-align: {align};" if align else "")
+                rendered.append(f'<{tag} style="{style}">{render_inline(cell)}</{tag}>')
+            return "<tr>" + "".join(rendered) + "</tr>"
+
+        body = "".join(cells(row, "td") for row in rows)
+        self.out.append(
+            f'<table style="{TABLE_STYLE}"><thead>{cells(header, "th")}</thead><tbody>{body}</tbody></table>'
+        )
+
+    def render(self, content: str) -> str:
+        lines = content.expandtabs(4).split("\n")
+        count = len(lines)
+        i = 0
+        while i < count:
+            line = lines[i].rstrip("\r")
+            stripped = line.strip()
+
+            if not stripped:
+                # Blank lines end paragraphs and quotes; lists may continue after them
+                self.close_paragraph()
+                self.close_quote()
+                i += 1
+                continue
+
+            first = stripped[0]
+            fence = FENCE_RE.match(line) if first in '`~' else None
+            if fence:
+                self.close_blocks()
+                marker, language = fence.group(1), fence.group(2)
+                code_lines = []
+                i += 1
+                while i < count and not lines[i].strip().startswith(marker):
+                    code_lines.append(lines[i].rstrip("\r"))
+                    i += 1
+                i += 1  # Skip the closing fence
+                language_class = f' class="language-{html.escape(language)}"' if language else ""
+                self.out.append(
+                    f'<pre style="{CODE_BLOCK_STYLE}"><code{language_class}>'
+                    + html.escape("\n".join(code_lines)) + "</code></pre>"
+                )
+                continue
+
+            header = HEADER_RE.match(stripped) if first == '#' else None
+            if header:
+                self.header(len(header.group(1)), header.group(2))
+                i += 1
+                continue
+
+            if first in '*-_' and HR_RE.match(stripped):
+                self.close_blocks()
+                self.out.append('<hr style="margin: 16px 0; border: none; border-top: 1px solid #e5e7eb;">')
+                i += 1
+                continue
+
+            item = LIST_ITEM_RE.match(line) if first in '-*+•' or first.isdigit() else None
+            if item:
+                indent, bullet, number, text = item.groups()
+                self.list_item(len(indent), bullet is None, number, text)
+                i += 1
+                continue
+
+            if '|' in stripped and i + 1 < count and TABLE_SEPARATOR_RE.match(lines[i + 1]):
+                rows = []
+                j = i + 2
+                while j < count and '|' in lines[j] and lines[j].strip():
+                    rows.append(lines[j])
+                    j += 1
+                self.table(line, lines[i + 1], rows)
+                i = j
+                continue
+
+            if first == '>':
+                self.close_paragraph()
+                self.close_lists()
+                self.quote.append(render_inline(stripped.lstrip('>').strip()))
+                i += 1
+                continue
+
+            indent = len(line) - len(line.lstrip(' '))
+            if self.lists and indent > self.lists[-1][1] and not self.paragraph:
+                # Indented continuation of the current list item
+                self.out.append("<br>" + render_inline(stripped))
+                i += 1
+                continue
+
+            if not self.paragraph and _is_heuristic_header(stripped):
+                self.close_blocks()
+                self.out.append(f'<h3 style="{HEADER_STYLE}">{render_inline(stripped)}</h3>')
+                i += 1
+                continue
+
+            self.close_quote()
+            self.close_lists()
+            self.paragraph.append(render_inline(stripped))
+            i += 1
+
+        self.close_blocks()
+        return "".join(self.out)
+
+
+def render_markdown(content: str) -> str:
+    """Render markdown to HTML in a single linear pass over the lines."""
+    return f'<div style="{WRAPPER_STYLE}">{_Renderer().render(content)}</div>'
+
+
+# Rendered reports keyed by content hash
+_render_cache: "OrderedDict[str, str]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def render_cache_size() -> int:
+    """Rendered reports kept in memory (MARKDOWN_CACHE_SIZE, default 64)."""
+    return int(os.getenv("MARKDOWN_CACHE_SIZE", "64"))
+
+
+def render_markdown_cached(content: str) -> str:
+    """render_markdown with an LRU cache keyed by the content's BLAKE2 hash."""
+    key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    with _render_cache_lock:
+        cached = _render_cache.get(key)
+        if cached is not None:
+            _render_cache.move_to_end(key)
+            return cached
+
+    rendered = render_markdown(content)
+    with _render_cache_lock:
+        _render_cache[key] = rendered
+        while len(_render_cache) > render_cache_size():
+            _render_cache.popitem(last=False)
+    return rendered
@@ -0,0 +1,340 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+from http_client import run_async, arun_async
+from run_outputs import files_dir, current_images_dir
+from workspaces import get_workspaces_root
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def image_server_env() -> Dict[str, str]:
+    """
+    Environment of the image server. The server writes into the workspace of
+    the calling run (see RUN_ARGUMENTS), which must lie under WORKSPACES_DIR.
+    """
+    env = {"WORKSPACES_DIR": get_workspaces_root()}
+    for name, value in os.environ.items():
+        if name in ("OPENAI_API_KEY", "OPENAI_ORGANIZATION") or name.startswith(("IMAGE_SERVER_", "IMAGE_CACHE_")):
+            env[name] = value
+    return env
+
+
+def mcp_servers() -> Dict[str, Dict[str, Any]]:
+    """
+    MCP server configurations. Built on use, so settings loaded from .env
+    after this module is imported apply. StdioServerParameters are only
+    built (and the mcp package imported) when a server is actually launched.
+    """
+    return {
+        # Filesystem server, allowed to read and write the shared files/ directory and run workspaces
+        "filesystem": {
+            "command": "npx",
+            "args": ["-y", "@modelcontextprotocol/server-filesystem", files_dir, get_workspaces_root()],
+        },
+        # EXA Search server
+        "exa_search": {
+            "command": "npx",
+            "args": ["-y", "mcp-remote", "https://mcp.exa.ai/mcp?exaApiKey=8315fda2-c304-4563-800a-53888dff7683"],
+        },
+        # Image server
+        "image": {
+            "command": sys.executable,
+            "args": [os.path.join(PROJECT_DIR, "servers", "image_server.py")],
+            "env": image_server_env(),
+        },
+    }
+
+
+# Tool arguments filled in per call from the active run rather than by the
+# agent: server -> argument -> function returning its value
+RUN_ARGUMENTS = {
+    "image": {"output_dir": current_images_dir},
+}
+
+
+def run_arguments(server: str) -> Dict[str, Any]:
+    return {name: value() for name, value in RUN_ARGUMENTS.get(server, {}).items()}
+
+
+def get_server_params(name: str, config: Optional[Dict[str, Any]] = None):
+    """Build the StdioServerParameters for one of mcp_servers()."""
+    from mcp.client.stdio import StdioServerParameters
+    if name == "filesystem":
+        # The filesystem server refuses to start on missing directories
+        os.makedirs(get_workspaces_root(), exist_ok=True)
+    return StdioServerParameters(**(config or mcp_servers()[name]))
+
+
+def describe_server(name: str) -> str:
+    config = mcp_servers()[name]
+    return " ".join([config["command"]] + config["args"])
+
+
+class MCPServerError(Exception):
+    """An MCP server could not be started, or kept crashing."""
+
+
+def result_text(result: Any) -> str:
+    """Text of a CallToolResult; non-text content is summarized."""
+    parts = []
+    for item in getattr(result, "content", None) or []:
+        if getattr(item, "type", None) == "text":
+            parts.append(item.text)
+        else:
+            parts.append(f"[{getattr(item, 'type', 'content')}]")
+    return "\n".join(parts)
+
+
+class MCPServerSession:
+    """
+    One long-lived stdio MCP server and its ClientSession. The server is
+    launched on first use and kept running; concurrent calls share the
+    session (JSON-RPC multiplexes them by request id), at most
+    max_concurrency at a time. When a call fails and the server no longer
+    answers a ping, the server is restarted and the call retried once.
+
+    All coroutines run on the shared background loop of http_client.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any],
+                 max_concurrency: int = 8,
+                 start_timeout: float = 60.0,
+                 call_timeout: float = 120.0,
+                 max_restarts: int = 5):
+        self.name = name
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self.start_timeout = start_timeout
+        self.call_timeout = call_timeout
+        self.max_restarts = max_restarts
+        self._session = None
+        self._owner: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        # Created on the background loop, which owns the session
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tools: Optional[List[Any]] = None
+        self.starts = 0
+        self.restarts = 0
+        self.calls = 0
+        self.failed_calls = 0
+        self.start_time = 0.0
+
+    def _primitives(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _launch(self):
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        stop = asyncio.Event()
+        params = get_server_params(self.name, self.config)
+
+        # The stdio transport and session are entered and exited by this one
+        # task, as anyio requires; it lives until the session is closed
+        async def serve():
+            try:
+                async with stdio_client(params) as (read_stream, write_stream):
+                    async with ClientSession(read_stream, write_stream) as session:
+                        await session.initialize()
+                        ready.set_result(session)
+                        await stop.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+            finally:
+                if not ready.done():
+                    ready.set_exception(MCPServerError(f"MCP server {self.name} exited during startup"))
+
+        start_time = time.time()
+        owner = asyncio.create_task(serve(), name=f"mcp-{self.name}")
+        try:
+            session = await asyncio.wait_for(asyncio.shield(ready), self.start_timeout)
+        except Exception as e:
+            stop.set()
+            owner.cancel()
+            raise MCPServerError(f"Failed to start MCP server {self.name}: {str(e)}") from e
+        self._session, self._owner, self._stop = session, owner, stop
+        self.starts += 1
+        self.start_time += time.time() - start_time
+        print(f"🔌 MCP server {self.name} started in {time.time() - start_time:.2f} seconds")
+        return session
+
+    async def _get_session(self):
+        self._primitives()
+        if self._session is not None:
+            return self._session
+        async with self._start_lock:
+            if self._session is None:
+                await self._launch()
+            return self._session
+
+    async def _alive(self, session) -> bool:
+        try:
+            await asyncio.wait_for(session.send_ping(), 5.0)
+            return True
+        except Exception:
+            return False
+
+    async def _shutdown(self) -> None:
+        # Called with the start lock held (or at close)
+        owner, stop = self._owner, self._stop
+        self._session = self._owner = self._stop = None
+        self._tools = None
+        if stop is not None:
+            stop.set()
+        if owner is not None:
+            try:
+                await asyncio.wait_for(owner, 5.0)
+            except Exception:
+                owner.cancel()
+
+    async def _restart(self, failed_session) -> None:
+        async with self._start_lock:
+            # Another caller may already have restarted it
+            if self._session is not failed_session:
+                return
+            if self.restarts >= self.max_restarts:
+                raise MCPServerError(f"MCP server {self.name} crashed {self.restarts} times; giving up")
+            self.restarts += 1
+            print(f"⚠️ MCP server {self.name} stopped responding; restarting ({self.restarts}/{self.max_restarts})")
+            await self._shutdown()
+            await self._launch()
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]):
+        """Call a tool and return its CallToolResult."""
+        self._primitives()
+        async with self._semaphore:
+            for attempt in range(2):
+                session = await self._get_session()
+                try:
+                    result = await asyncio.wait_for(session.call_tool(tool_name, arguments), self.call_timeout)
+                    self.calls += 1
+                    return result
+                except Exception:
+                    self.failed_calls += 1
+                    # Tool errors and timeouts of a healthy server are the caller's to handle
+                    if attempt or await self._alive(session):
+                        raise
+                    await self._restart(session)
+
+    async def list_tools(self) -> List[Any]:
+        if self._tools is None:
+            session = await self._get_session()
+            self._tools = list((await session.list_tools()).tools)
+        return self._tools
+
+    async def close(self) -> None:
+        if self._start_lock is None:
+            return
+        async with self._start_lock:
+            await self._shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        prefix = f"mcp_{self.name}"
+        return {
+            f"{prefix}_starts": self.starts,
+            f"{prefix}_restarts": self.restarts,
+            f"{prefix}_calls": self.calls,
+            f"{prefix}_failed_calls": self.failed_calls,
+            f"{prefix}_start_time": self.start_time,
+        }
+
+
+class MCPSessionManager:
+    """
+    Persistent sessions for the MCP servers of mcp_servers() that are enabled.
+    Each server is spawned once per process (npx startup takes seconds) and
+    its session reused by every tool call until close().
+    """
+
+    def __init__(self,
+                 enabled: Optional[List[str]] = None,
+                 servers: Optional[Dict[str, Dict[str, Any]]] = None,
+                 max_concurrency: int = 8,
+                 call_timeout: float = 120.0):
+        servers = servers or mcp_servers()
+        enabled = list(servers) if enabled is None else enabled
+        unknown = [name for name in enabled if name not in servers]
+        if unknown:
+            raise ValueError(f"Unknown MCP servers: {', '.join(unknown)}")
+        self.sessions = {
+            name: MCPServerSession(name, servers[name], max_concurrency=max_concurrency, call_timeout=call_timeout)
+            for name in enabled
+        }
+
+    def session(self, name: str) -> MCPServerSession:
+        return self.sessions[name]
+
+    async def alist_tools(self, server: str) -> List[Any]:
+        return await arun_async(self.sessions[server].list_tools())
+
+    def list_tools(self, server: str) -> List[Any]:
+        return run_async(self.sessions[server].list_tools())
+
+    async def acall_tool(self, server: str, tool_name: str, arguments: Dict[str, Any]):
+        return await arun_async(self.sessions[server].call_tool(tool_name, arguments))
+
+    def call_tool(self, server: str, tool_name: str, arguments: Dict[str, Any]):
+        return run_async(self.sessions[server].call_tool(tool_name, arguments))
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        for session in self.sessions.values():
+            stats.update(session.stats())
+        return stats
+
+    def close(self) -> None:
+        for session in self.sessions.values():
+            try:
+                run_async(session.close())
+            except Exception as e:
+                print(f"⚠️ Failed to stop MCP server {session.name}: {str(e)}")
+
+
+# Shared manager, created on first use
+_session_manager: Optional[MCPSessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def enabled_mcp_servers() -> List[str]:
+    """Servers named in MCP_SERVERS_ENABLED (comma-separated, or "all"); none by default."""
+    value = os.getenv('MCP_SERVERS_ENABLED', '').strip()
+    if value.lower() == 'all':
+        return list(mcp_servers())
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_mcp_session_manager() -> Optional[MCPSessionManager]:
+    """Return the shared session manager, or None when no MCP servers are enabled."""
+    global _session_manager
+    enabled = enabled_mcp_servers()
+    if not enabled:
+        return None
+    if _session_manager is None:
+        with _manager_lock:
+            if _session_manager is None:
+                _session_manager = MCPSessionManager(
+                    enabled,
+                    max_concurrency=int(os.getenv('MCP_MAX_CONCURRENT_CALLS', '8')),
+                    call_timeout=float(os.getenv('MCP_CALL_TIMEOUT', '120')),
+                )
+    return _session_manager
+
+
+def close_mcp_sessions() -> None:
+    """Stop the servers of the shared session manager."""
+    global _session_manager
+    with _manager_lock:
+        manager, _session_manager = _session_manager, None
+    if manager is not None:
+        manager.close()
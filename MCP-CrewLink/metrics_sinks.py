@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Metric sinks for WandBTracker: live wandb runs, or local append-only
+JSONL/SQLite files for environments without access to the wandb service.
+Local metrics can be replayed into wandb later:
+
+    python metrics_sinks.py replay metrics/metrics.jsonl --project mcp-crewlink-research
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics")
+
+
+class MetricsSink(ABC):
+    """Destination for one tracker run's metrics."""
+
+    name = "sink"
+
+    @abstractmethod
+    def log(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
+        """Record one metrics entry."""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class WandbSink(MetricsSink):
+    """Logs to a live wandb run."""
+
+    name = "wandb"
+
+    def __init__(self, run):
+        self.run = run
+
+    def log(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
+        self.run.log(metrics, step=step)
+
+    def close(self) -> None:
+        self.run.finish()
+
+
+def _run_record(run_id: str, project: str, entity: Optional[str], config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "run",
+        "run_id": run_id,
+        "project": project,
+        "entity": entity,
+        "config": config,
+        "timestamp": time.time(),
+    }
+
+
+class JsonlSink(MetricsSink):
+    """
+    Appends one JSON line per metrics entry. When the file exceeds max_bytes
+    it is rotated to path.1 (older files shift to .2, .3, ...; at most
+    `backups` are kept). Every file starts with the run record, so each one
+    can be replayed on its own.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str, project: str, entity: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None,
+                 max_bytes: int = 50 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._header = _run_record(self.run_id, project, entity, config or {})
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        # Buffered appends; flush() pushes them to the OS
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._append(self._header)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        self._file.write(line)
+        self._size += len(line)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def log(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
+        with self._lock:
+            self._append({
+                "type": "metrics",
+                "run_id": self.run_id,
+                "timestamp": time.time(),
+                "step": step,
+                "metrics": metrics,
+            })
+            if self._size >= self.max_bytes:
+                self._rotate()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class SqliteSink(MetricsSink):
+    """Stores metrics in a SQLite file (WAL mode), keeping at most max_rows entries."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, project: str, entity: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None,
+                 max_rows: int = 1_000_000):
+        self.path = path
+        self.max_rows = max_rows
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._pending = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, project TEXT, entity TEXT, "
+            "config TEXT, timestamp REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, "
+            "timestamp REAL, step INTEGER, metrics TEXT)"
+        )
+        header = _run_record(self.run_id, project, entity, config or {})
+        self._conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, project, entity, json.dumps(header["config"], default=str), header["timestamp"])
+        )
+        self._conn.commit()
+
+    def log(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO metrics (run_id, timestamp, step, metrics) VALUES (?, ?, ?, ?)",
+                (self.run_id, time.time(), step, json.dumps(metrics, default=str))
+            )
+            self._pending += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            self._pending = 0
+            # Rotation: drop the oldest entries beyond max_rows
+            self._conn.execute(
+                "DELETE FROM metrics WHERE id <= (SELECT MAX(id) FROM metrics) - ?", (self.max_rows,)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def create_local_sink(kind: str, project: str, entity: Optional[str] = None,
+                      config: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> MetricsSink:
+    """Create a jsonl or sqlite sink configured from the METRICS_SINK_* variables."""
+    if kind == "sqlite":
+        return SqliteSink(
+            path or os.getenv("METRICS_SINK_PATH", os.path.join(METRICS_DIR, "metrics.sqlite3")),
+            project, entity, config,
+            max_rows=int(os.getenv("METRICS_SINK_MAX_ROWS", "1000000")),
+        )
+    return JsonlSink(
+        path or os.getenv("METRICS_SINK_PATH", os.path.join(METRICS_DIR, "metrics.jsonl")),
+        project, entity, config,
+        max_bytes=int(os.getenv("METRICS_SINK_MAX_BYTES", str(50 * 1024 * 1024))),
+        backups=int(os.getenv("METRICS_SINK_BACKUPS", "5")),
+    )
+
+
+def read_local_metrics(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield run and metrics records from a local sink, oldest first."""
+    if path.endswith((".sqlite3", ".sqlite", ".db")):
+        conn = sqlite3.connect(path)
+        try:
+            for run_id, project, entity, config, timestamp in conn.execute(
+                    "SELECT run_id, project, entity, config, timestamp FROM runs ORDER BY timestamp"):
+                yield {"type": "run", "run_id": run_id, "project": project, "entity": entity,
+                       "config": json.loads(config or "{}"), "timestamp": timestamp}
+                for timestamp, step, metrics in conn.execute(
+                        "SELECT timestamp, step, metrics FROM metrics WHERE run_id = ? ORDER BY id", (run_id,)):
+                    yield {"type": "metrics", "run_id": run_id, "timestamp": timestamp,
+                           "step": step, "metrics": json.loads(metrics)}
+        finally:
+            conn.close()
+        return
+
+    # Rotated files first, from the oldest backup to the live file
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    for file_path in list(reversed(backups)) + ([path] if os.path.exists(path) else []):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partial last line
+                    continue
+
+
+def replay_into_wandb(path: str, project: Optional[str] = None, entity: Optional[str] = None) -> Dict[str, int]:
+    """Log locally recorded runs to wandb, one wandb run per recorded run."""
+    import wandb
+
+    runs: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[str, List[Dict[str, Any]]] = {}
+    for record in read_local_metrics(path):
+        if record.get("type") == "run":
+            runs.setdefault(record["run_id"], record)
+        elif record.get("type") == "metrics":
+            entries.setdefault(record["run_id"], []).append(record)
+
+    replayed = {"runs": 0, "entries": 0}
+    for run_id, records in entries.items():
+        header = runs.get(run_id, {})
+        run = wandb.init(
+            project=project or header.get("project") or "mcp-crewlink-research",
+            entity=entity or header.get("entity"),
+            config=dict(header.get("config") or {}, replayed_from=run_id),
+            name=f"replay-{run_id}",
+            reinit=True
+        )
+        for record in records:
+            run.log(record["metrics"], step=record.get("step"))
+        run.finish()
+        replayed["runs"] += 1
+        replayed["entries"] += len(records)
+        print(f"✅ Replayed run {run_id}: {len(records)} entries")
+    return replayed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay locally recorded metrics into wandb")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay = subparsers.add_parser("replay", help="Log a JSONL or SQLite metrics file to wandb")
+    replay.add_argument("path", help="metrics.jsonl (rotated .N files are included) or metrics.sqlite3")
+    replay.add_argument("--project", default=None, help="Override the recorded wandb project")
+    replay.add_argument("--entity", default=None, help="Override the recorded wandb entity")
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        result = replay_into_wandb(args.path, project=args.project, entity=args.entity)
+        print(f"📊 Replayed {result['runs']} runs, {result['entries']} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import os
+import time
+import asyncio
+import multiprocessing
+from typing import Any, Dict, Optional
+
+# Provider name -> environment variable with its requests-per-minute limit (0 = unlimited)
+PROVIDER_LIMITS = {
+    "brave": "BRAVE_REQUESTS_PER_MINUTE",
+    "openai_images": "OPENAI_IMAGES_PER_MINUTE",
+}
+LLM_LIMIT_ENV = "LLM_REQUESTS_PER_MINUTE"
+
+
+class RateLimiter:
+    """
+    Token bucket limiting one provider to `requests_per_minute`.
+
+    State lives in shared memory guarded by a multiprocessing lock, so one
+    limiter created by the scheduler is enforced across all of its worker
+    processes. Callers reserve a token and sleep outside the lock; when the
+    bucket is empty the reservation pushes it negative, so waiting callers
+    are spaced out evenly instead of polling.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, burst: int = 1, context=None):
+        context = context or multiprocessing.get_context()
+        self.name = name
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1, burst)
+        # tokens, last refill time, total wait seconds, number of waits
+        self._state = context.Array('d', [float(self.burst), time.time(), 0.0, 0.0], lock=False)
+        self._lock = context.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            state = self._state
+            now = time.time()
+            state[0] = min(self.burst, state[0] + (now - state[1]) * self.rate)
+            state[1] = now
+            state[0] -= 1
+            if state[0] >= 0:
+                return 0.0
+            wait = -state[0] / self.rate
+            state[2] += wait
+            state[3] += 1
+            return wait
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"rate_limit_{self.name}_waits": int(self._state[3]),
+                f"rate_limit_{self.name}_wait_time": self._state[2],
+            }
+
+
+def create_rate_limiters(limits: Optional[Dict[str, float]] = None, context=None) -> Dict[str, RateLimiter]:
+    """Create one limiter per provider; limits override the *_PER_MINUTE environment variables."""
+    limits = limits or {}
+    return {
+        provider: RateLimiter(
+            provider,
+            limits[provider] if limits.get(provider) is not None else float(os.getenv(env_var, "0")),
+            context=context,
+        )
+        for provider, env_var in PROVIDER_LIMITS.items()
+    }
+
+
+# Limiters of this process; the scheduler installs shared ones in its workers
+_rate_limiters: Optional[Dict[str, RateLimiter]] = None
+# Number of processes sharing the LLM limit
+_llm_share = 1
+
+
+def install_rate_limiters(limiters: Dict[str, RateLimiter], llm_share: int = 1) -> None:
+    global _rate_limiters, _llm_share
+    _rate_limiters = limiters
+    _llm_share = max(1, llm_share)
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    global _rate_limiters
+    if _rate_limiters is None:
+        _rate_limiters = create_rate_limiters()
+    return _rate_limiters[provider]
+
+
+def llm_max_rpm() -> Optional[int]:
+    """
+    LLM requests per minute for this process's crews, or None when unlimited.
+    LLM calls happen inside CrewAI, so the limit is applied through the
+    crew's max_rpm and split evenly across the scheduler's processes.
+    """
+    limit = float(os.getenv(LLM_LIMIT_ENV, "0"))
+    if limit <= 0:
+        return None
+    return max(1, int(limit // _llm_share))
+
+
+def rate_limit_stats() -> Dict[str, Any]:
+    stats = {}
+    for provider in PROVIDER_LIMITS:
+        stats.update(get_rate_limiter(provider).stats())
+    return stats
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from search_aggregator import estimate_tokens
+from search_cache import normalize_query
+from workspaces import RUN_ID_RE, Workspace, get_workspaces_root
+
+# Findings of a run are saved next to its reports, in workspaces/<run_id>/
+FINDINGS_FILE = "findings.json"
+
+
+def collect_findings(workspace: Workspace,
+                     research_topic: str,
+                     research_query: str,
+                     notes: str,
+                     sources: List[Dict[str, Any]],
+                     image_paths: List[str]) -> Dict[str, Any]:
+    """The reusable output of research_task: its notes, the search results and the images."""
+    return {
+        "run_id": workspace.run_id,
+        "research_topic": research_topic,
+        "research_query": research_query,
+        "created_at": time.time(),
+        "notes": notes,
+        "sources": [
+            {"url": source["url"], "title": source["title"], "description": source["description"]}
+            for source in sources
+        ],
+        "images": [os.path.basename(path) for path in image_paths],
+    }
+
+
+def save_findings(workspace: Workspace, findings: Dict[str, Any]) -> str:
+    path = os.path.join(workspace.path, FINDINGS_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=workspace.path, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(findings, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_findings(run_id: str, root: Optional[str] = None) -> Dict[str, Any]:
+    """Findings saved by run `run_id`; raises FileNotFoundError when there are none."""
+    if not RUN_ID_RE.match(run_id):
+        raise ValueError(f"Invalid run id: {run_id!r}")
+    path = os.path.join(root or get_workspaces_root(), run_id, FINDINGS_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No research findings saved for run {run_id}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_latest_findings(research_topic: str,
+                         research_query: Optional[str] = None,
+                         root: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Most recent findings on a topic (and query, if given), or None."""
+    root = root or get_workspaces_root()
+    if not os.path.isdir(root):
+        return None
+    paths = [os.path.join(root, run_id, FINDINGS_FILE) for run_id in os.listdir(root)]
+    paths = sorted((path for path in paths if os.path.exists(path)), key=os.path.getmtime, reverse=True)
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                findings = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if normalize_query(findings.get("research_topic", "")) != normalize_query(research_topic):
+            continue
+        if research_query and normalize_query(findings.get("research_query", "")) != normalize_query(research_query):
+            continue
+        return findings
+    return None
+
+
+def resolve_findings(spec: Any, research_topic: str) -> Dict[str, Any]:
+    """Findings named by a job: a run id, or True/"latest" for the newest on the topic."""
+    if spec is True or spec == "latest":
+        findings = find_latest_findings(research_topic)
+        if findings is None:
+            raise FileNotFoundError(f"No research findings saved for topic {research_topic!r}")
+        return findings
+    return load_findings(str(spec))
+
+
+def _truncate_to_tokens(text: str, token_budget: int) -> str:
+    """Cut text to about token_budget tokens, at a line or word boundary where possible."""
+    if estimate_tokens(text) <= token_budget:
+        return text
+    marker = "\n[... notes truncated]"
+    cut = text[:max(0, (token_budget - estimate_tokens(marker)) * 4)]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + marker
+
+
+def render_findings(findings: Dict[str, Any], token_budget: int = 3000, notes_share: float = 0.6) -> str:
+    """
+    The findings as prompt text for summary_task: notes first, then sources
+    until the token budget is used up, then the images available. The notes
+    are truncated to `notes_share` of the budget so sources always get room.
+    """
+    notes = findings.get("notes") or "(none)"
+    sections = [f"Research notes:\n{_truncate_to_tokens(notes, int(token_budget * notes_share))}"]
+    used_tokens = estimate_tokens(sections[0])
+    sources = []
+    for source in findings.get("sources", []):
+        line = f"- [{source['title']}]({source['url']}): {source['description']}"
+        cost = estimate_tokens(line)
+        if used_tokens + cost > token_budget:
+            break
+        sources.append(line)
+        used_tokens += cost
+    if sources:
+        sections.append("Sources:\n" + "\n".join(sources))
+    if findings.get("images"):
+        sections.append("Images already generated (in the images directory): " + ", ".join(findings["images"]))
+    return "\n\n".join(sections)
+
+
+def reuse_images(findings: Dict[str, Any], images_dir: str, root: Optional[str] = None) -> List[str]:
+    """Link the images of the findings' run into images_dir. Returns the new paths."""
+    source_dir = os.path.join(root or get_workspaces_root(), findings["run_id"], "images")
+    paths = []
+    for filename in findings.get("images", []):
+        source_path = os.path.join(source_dir, filename)
+        if not os.path.exists(source_path):
+            continue
+        dest_path = os.path.join(images_dir, filename)
+        try:
+            os.link(source_path, dest_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(source_path, dest_path)
+        paths.append(dest_path)
+    return paths
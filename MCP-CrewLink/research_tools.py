@@ -0,0 +1,786 @@
+# CrewAI tools of the research agent. Importing this module loads CrewAI,
+# so main.py only imports it when the tools are first needed.
+import os
+import time
+import asyncio
+import functools
+import warnings
+from typing import Type, Any, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel, Field, PydanticDeprecatedSince20, create_model
+from crewai.tools import BaseTool
+from http_client import BRAVE_SEARCH_URL, get_http_client, async_request, run_async
+from search_cache import get_search_cache
+from search_aggregator import SearchAggregator
+from event_stream import events_enabled, emit_event
+from image_cache import get_image_cache
+from image_jobs import get_image_jobs, job_output
+from rate_limits import get_rate_limiter
+from mcp_sessions import RUN_ARGUMENTS, result_text, run_arguments
+from tracing import span
+from workspaces import use_workspace
+from run_outputs import current_files_dir, current_images_dir, record_tool_usage, describe_generated_file, describe_generated_image
+
+# Suppress Pydantic deprecation warnings
+warnings.filterwarnings("ignore", category=PydanticDeprecatedSince20)
+
+def in_tool_workspace(method):
+    """
+    Run a tool method with the tool's bound workspace current (see
+    bind_workspace). CrewAI may call tools on threads that do not inherit
+    the run's context, e.g. async tasks on older versions.
+    """
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with use_workspace(self.workspace):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_workspace(self.workspace):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def traced_tool(tool_name: Union[str, Callable[[Any], str]]):
+    """
+    Run a tool method inside a "tool:<name>" span, so the HTTP and I/O spans
+    of the call nest under it. `tool_name` is the name the method passes to
+    record_tool_usage, or a function of the tool returning it.
+    """
+    def decorate(method):
+        def open_span(tool):
+            name = tool_name(tool) if callable(tool_name) else tool_name
+            return span(f"tool:{name}", "tool")
+        
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                with open_span(self):
+                    return await method(self, *args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with open_span(self):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+# Custom MCP Tools for CrewAI
+class FileWriteInput(BaseModel):
+    filename: str = Field(description="Name of the file to write")
+    content: str = Field(description="Content to write to the file")
+
+class FileWriteTool(BaseTool):
+    name: str = "write_file"
+    description: str = "Write content to a file in the files directory"
+    args_schema: Type[BaseModel] = FileWriteInput
+    wandb_tracker: Any = None
+    workspace: Any = None
+    
+    def __init__(self, wandb_tracker=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+    
+    @in_tool_workspace
+    @traced_tool("file_write")
+    def _run(self, filename: str, content: str) -> str:
+        start_time = time.time()
+        success = False
+        try:
+            file_path = os.path.join(current_files_dir(), filename)
+            with span("file_write", "io", filename=filename, bytes=len(content)):
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            success = True
+            result = f"Successfully wrote content to {filename}"
+            # Let stream consumers render the report as soon as it exists
+            if events_enabled() and filename.endswith(('.txt', '.md')):
+                emit_event("file_ready", **describe_generated_file(file_path, content))
+        except Exception as e:
+            result = f"Error writing file: {str(e)}"
+        finally:
+            execution_time = time.time() - start_time
+            record_tool_usage(self.wandb_tracker, "file_write", execution_time, success)
+        return result
+    
+    @in_tool_workspace
+    async def _arun(self, filename: str, content: str) -> str:
+        # Local disk writes are short; keep them off the event loop
+        return await asyncio.to_thread(self._run, filename, content)
+
+class SearchError(Exception):
+    """A web search failed; the message is returned to the agent as-is."""
+
+class WebSearchInput(BaseModel):
+    query: str = Field(description="Search query to execute")
+    fresh: bool = Field(default=False, description="Bypass cached results for freshness-sensitive queries")
+
+class WebSearchTool(BaseTool):
+    name: str = "web_search"
+    description: str = "Search the web using EXA Search API"
+    args_schema: Type[BaseModel] = WebSearchInput
+    wandb_tracker: Any = None
+    search_url: str = BRAVE_SEARCH_URL
+    result_count: int = 5
+    http_client: Any = None
+    search_cache: Any = None
+    aggregator: Any = None
+    digest_token_budget: int = 800
+    
+    def __init__(self, wandb_tracker=None, http_client=None, search_cache=None, aggregator=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+        self.search_url = os.getenv('BRAVE_SEARCH_URL', self.search_url)
+        # None means the shared pooled client, so searches reuse TCP/TLS connections
+        self.http_client = http_client
+        # None means the shared cache configured from SEARCH_CACHE_* variables
+        self.search_cache = search_cache
+        # Collects results across the run so repeated URLs are only shown once
+        self.aggregator = aggregator or SearchAggregator()
+        self.digest_token_budget = int(os.getenv('SEARCH_DIGEST_TOKEN_BUDGET', str(self.digest_token_budget)))
+    
+    def _get_cache(self):
+        return self.search_cache or get_search_cache()
+    
+    def _build_search_request(self, query: str):
+        """Return (headers, params) for a Brave search request."""
+        api_key = os.getenv('BRAVE_API_KEY')
+        if not api_key:
+            raise SearchError("Brave API key not found. Please set BRAVE_API_KEY in your .env file.")
+        
+        headers = {
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'X-Subscription-Token': api_key
+        }
+        
+        params = {
+            'q': query,
+            'count': self.result_count
+        }
+        return headers, params
+    
+    def _parse_search_response(self, query: str, response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            raise SearchError(f"Search API error: {response.status_code} - {response.text}")
+        data = response.json()
+        cache = self._get_cache()
+        if cache:
+            cache.set(query, self.result_count, data)
+        return data
+    
+    def _cached_search(self, query: str, fresh: bool):
+        cache = self._get_cache()
+        if cache and not fresh:
+            return cache.get(query, self.result_count)
+        return None
+    
+    def search(self, query: str, fresh: bool = False):
+        """Return (Brave response payload, cache_hit) for a query."""
+        data = self._cached_search(query, fresh)
+        if data is not None:
+            return data, True
+        headers, params = self._build_search_request(query)
+        with span("rate_limit:brave", "http"):
+            get_rate_limiter("brave").acquire()
+        with span("brave_search", "http", query=query) as http_span:
+            response = (self.http_client or get_http_client()).get(
+                self.search_url,
+                headers=headers,
+                params=params
+            )
+            http_span.set(status_code=response.status_code)
+        return self._parse_search_response(query, response), False
+    
+    async def asearch(self, query: str, fresh: bool = False):
+        """Async variant of search(), on the injected client or the shared pooled async client."""
+        data = self._cached_search(query, fresh)
+        if data is not None:
+            return data, True
+        headers, params = self._build_search_request(query)
+        with span("rate_limit:brave", "http"):
+            await get_rate_limiter("brave").aacquire()
+        with span("brave_search", "http", query=query) as http_span:
+            response = await self._async_get(headers, params)
+            http_span.set(status_code=response.status_code)
+        return self._parse_search_response(query, response), False
+    
+    async def _async_get(self, headers, params):
+        if self.http_client is None:
+            return await async_request("GET", self.search_url, headers=headers, params=params)
+        # An injected client, async or sync as search() uses it, replaces the shared pool
+        if asyncio.iscoroutinefunction(self.http_client.get):
+            return await self.http_client.get(self.search_url, headers=headers, params=params)
+        return await asyncio.to_thread(self.http_client.get, self.search_url, headers=headers, params=params)
+    
+    def _format_search_results(self, query: str, data: Dict[str, Any]) -> str:
+        """Add a Brave API response to the run's results and digest the new ones for the agent."""
+        urls = self.aggregator.add(query, data.get('web', {}).get('results', []))
+        if not urls:
+            return f"No results found for '{query}'"
+        return self.aggregator.digest(
+            urls,
+            token_budget=self.digest_token_budget,
+            max_results=3,  # Top 3 results
+            header=f"Search results for '{query}':\n\n"
+        )
+    
+    def _log_search(self, execution_time: float, success: bool, cache_hit: bool) -> None:
+        cache = self._get_cache()
+        cache_metrics = None
+        if cache:
+            cache_metrics = dict(cache.stats(), search_cache_hit=1 if cache_hit else 0)
+        record_tool_usage(self.wandb_tracker, "web_search", execution_time, success, extra_metrics=cache_metrics)
+    
+    @traced_tool("web_search")
+    def _run(self, query: str, fresh: bool = False) -> str:
+        start_time = time.time()
+        success = False
+        cache_hit = False
+        try:
+            data, cache_hit = self.search(query, fresh)
+            success = True
+            result = self._format_search_results(query, data)
+        except SearchError as e:
+            result = str(e)
+        except Exception as e:
+            result = f"Error performing web search: {str(e)}"
+        finally:
+            self._log_search(time.time() - start_time, success, cache_hit)
+        return result
+    
+    @traced_tool("web_search")
+    async def _arun(self, query: str, fresh: bool = False) -> str:
+        start_time = time.time()
+        success = False
+        cache_hit = False
+        try:
+            data, cache_hit = await self.asearch(query, fresh)
+            success = True
+            result = self._format_search_results(query, data)
+        except SearchError as e:
+            result = str(e)
+        except Exception as e:
+            result = f"Error performing web search: {str(e)}"
+        finally:
+            self._log_search(time.time() - start_time, success, cache_hit)
+        return result
+
+class WebSearchManyInput(BaseModel):
+    queries: List[str] = Field(description="List of search queries to run concurrently")
+    fresh: bool = Field(default=False, description="Bypass cached results for freshness-sensitive queries")
+
+class WebSearchManyTool(BaseTool):
+    name: str = "web_search_many"
+    description: str = "Run several web searches concurrently and return merged, deduplicated results. Prefer this over repeated web_search calls."
+    args_schema: Type[BaseModel] = WebSearchManyInput
+    wandb_tracker: Any = None
+    search_tool: Any = None
+    max_concurrency: int = 4
+    
+    def __init__(self, wandb_tracker=None, search_tool=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+        self.search_tool = search_tool or WebSearchTool(wandb_tracker=wandb_tracker)
+        self.max_concurrency = int(os.getenv('SEARCH_CONCURRENCY', str(self.max_concurrency)))
+    
+    async def _search_all(self, queries: List[str], fresh: bool):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def search_one(query):
+            async with semaphore:
+                try:
+                    data, _ = await self.search_tool.asearch(query, fresh)
+                    return query, data, None
+                except SearchError as e:
+                    return query, None, str(e)
+                except Exception as e:
+                    return query, None, f"Error performing web search: {str(e)}"
+        
+        return await asyncio.gather(*(search_one(query) for query in queries))
+    
+    def _merge_results(self, outcomes) -> str:
+        """Merge per-query results into one ranked, deduplicated, token-budgeted digest."""
+        aggregator = self.search_tool.aggregator
+        urls = []
+        errors = []
+        for query, data, error in outcomes:
+            if error:
+                errors.append(f"- {query}: {error}")
+                continue
+            for url in aggregator.add(query, data.get('web', {}).get('results', [])):
+                if url not in urls:
+                    urls.append(url)
+        
+        sections = []
+        if urls:
+            sections.append(aggregator.digest(
+                urls,
+                token_budget=self.search_tool.digest_token_budget,
+                header=f"Search results for {len(outcomes)} queries ({len(urls)} unique):\n\n"
+            ))
+        else:
+            sections.append(f"No results found for {len(outcomes)} queries")
+        if errors:
+            sections.append("Failed searches:\n" + "\n".join(errors))
+        return "\n".join(sections)
+    
+    @traced_tool("web_search_many")
+    async def _arun(self, queries: List[str], fresh: bool = False) -> str:
+        start_time = time.time()
+        success = False
+        try:
+            # Drop repeated queries before fanning out
+            unique_queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+            outcomes = await self._search_all(unique_queries, fresh)
+            success = any(error is None for _, _, error in outcomes)
+            result = self._merge_results(outcomes)
+        except Exception as e:
+            result = f"Error performing web searches: {str(e)}"
+        finally:
+            execution_time = time.time() - start_time
+            record_tool_usage(
+                self.wandb_tracker, "web_search_many", execution_time, success,
+                extra_metrics={"web_search_many_queries": len(queries)}
+            )
+        return result
+    
+    def _run(self, queries: List[str], fresh: bool = False) -> str:
+        return run_async(self._arun(queries, fresh))
+
+def agent_search_tools(tools: List[BaseTool]) -> List[BaseTool]:
+    """
+    The tools with web_search and web_search_many replaced by copies that
+    share a new SearchAggregator, for an agent researching concurrently with
+    others: the aggregator only shows each result once, so agents sharing
+    one would hide results from each other.
+    """
+    search_tool = None
+    for tool in tools:
+        if isinstance(tool, WebSearchTool):
+            search_tool = WebSearchTool(wandb_tracker=tool.wandb_tracker, http_client=tool.http_client,
+                                        search_cache=tool.search_cache)
+            break
+    copies = []
+    for tool in tools:
+        if isinstance(tool, WebSearchTool):
+            copies.append(search_tool)
+        elif isinstance(tool, WebSearchManyTool):
+            copies.append(WebSearchManyTool(wandb_tracker=tool.wandb_tracker, search_tool=search_tool))
+        else:
+            copies.append(tool)
+    return copies
+
+def bind_workspace(tools: List[BaseTool], workspace: Any) -> List[BaseTool]:
+    """
+    Copies of the tools that write into `workspace` whichever thread calls
+    them; tools without outputs are returned as they are.
+    """
+    if workspace is None:
+        return list(tools)
+    bound = []
+    for tool in tools:
+        if "workspace" not in type(tool).model_fields:
+            bound.append(tool)
+            continue
+        update: Dict[str, Any] = {"workspace": workspace}
+        if isinstance(tool, ImageBatchTool):
+            update["image_tool"] = tool.image_tool.model_copy(update={"workspace": workspace})
+        bound.append(tool.model_copy(update=update))
+    return bound
+
+class ImageGenerateInput(BaseModel):
+    prompt: str = Field(description="Description of the image to generate")
+    filename: str = Field(description="Name for the generated image file")
+
+class ImageGenerateTool(BaseTool):
+    name: str = "generate_image"
+    description: str = "Generate an image using OpenAI DALL-E"
+    args_schema: Type[BaseModel] = ImageGenerateInput
+    wandb_tracker: Any = None
+    workspace: Any = None
+    image_model: str = "dall-e-3"
+    image_size: str = "1024x1024"
+    image_quality: str = "hd"
+    image_cache: Any = None
+    
+    def __init__(self, wandb_tracker=None, image_cache=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+        # None means the shared cache configured from IMAGE_CACHE_* variables
+        self.image_cache = image_cache
+    
+    def _image_path(self, filename: str) -> str:
+        return os.path.join(current_images_dir(), f"{filename}.png")
+    
+    def _generate_kwargs(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.image_model,
+            "prompt": f"Generate an image based on the following prompt: {prompt}",
+            "size": self.image_size,
+            "quality": self.image_quality,
+            "response_format": "b64_json"
+        }
+    
+    def _save_image(self, cache, prompt: str, image_base64: str, file_path: str) -> None:
+        import base64
+        
+        image_bytes = base64.b64decode(image_base64)
+        with span("image_save", "io", path=file_path, bytes=len(image_bytes)):
+            if cache:
+                cache.store(self.image_model, prompt, self.image_size, self.image_quality, image_bytes, file_path)
+            else:
+                with open(file_path, "wb") as f:
+                    f.write(image_bytes)
+    
+    def _log_image(self, cache, execution_time: float, success: bool, cache_hit: bool) -> None:
+        cache_metrics = None
+        if cache:
+            cache_metrics = dict(cache.stats(), image_cache_hit=1 if cache_hit else 0)
+        record_tool_usage(self.wandb_tracker, "image_generate", execution_time, success, extra_metrics=cache_metrics)
+    
+    def _emit_image_ready(self, file_path: str) -> None:
+        if events_enabled():
+            emit_event("image_ready", **describe_generated_image(file_path))
+    
+    def _discarded(self, filename: str) -> str:
+        return f"Discarded image '{filename}.png': its run was collected before the image was ready"
+    
+    def _submit(self, image_jobs, prompt: str, filename: str) -> str:
+        handle = image_jobs.submit(self._generate, prompt, filename, paths=[self._image_path(filename)])
+        return (f"Image job {handle} started: '{filename}.png' is being generated in the background with prompt: {prompt}. "
+                f"Continue with the research; the image will be in the images directory when the run's output is collected.")
+    
+    @in_tool_workspace
+    def _run(self, prompt: str, filename: str) -> str:
+        image_jobs = get_image_jobs()
+        if image_jobs:
+            return self._submit(image_jobs, prompt, filename)
+        return self._generate(prompt, filename)
+    
+    @traced_tool("image_generate")
+    def _generate(self, prompt: str, filename: str) -> str:
+        start_time = time.time()
+        success = False
+        cache = self.image_cache or get_image_cache()
+        cache_hit = False
+        try:
+            file_path = self._image_path(filename)
+            
+            # Reuse a previously generated image for the same request
+            with job_output() as keep:
+                if not keep:
+                    return self._discarded(filename)
+                if cache and cache.fetch(self.image_model, prompt, self.image_size, self.image_quality, file_path):
+                    cache_hit = True
+                    success = True
+                    self._emit_image_ready(file_path)
+                    return f"Successfully generated and saved image '{filename}.png' in images directory with prompt: {prompt} (served from cache)"
+            
+            from openai import OpenAI
+            
+            # Initialize OpenAI client directly
+            client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                organization=os.getenv("OPENAI_ORGANIZATION")
+            )
+            
+            # Generate image
+            with span("rate_limit:openai_images", "http"):
+                get_rate_limiter("openai_images").acquire()
+            with span("openai_images_generate", "http", model=self.image_model, size=self.image_size):
+                result = client.images.generate(**self._generate_kwargs(prompt))
+            
+            # Extract base64 image data and save, unless the run finished meanwhile
+            with job_output() as keep:
+                if not keep:
+                    return self._discarded(filename)
+                self._save_image(cache, prompt, result.data[0].b64_json, file_path)
+                self._emit_image_ready(file_path)
+            
+            success = True
+            result = f"Successfully generated and saved image '{filename}.png' in images directory with prompt: {prompt}"
+            
+        except Exception as e:
+            result = f"Error generating image: {str(e)}"
+        finally:
+            self._log_image(cache, time.time() - start_time, success, cache_hit)
+        return result
+    
+    @in_tool_workspace
+    async def _arun(self, prompt: str, filename: str) -> str:
+        image_jobs = get_image_jobs()
+        if image_jobs:
+            return self._submit(image_jobs, prompt, filename)
+        # One generation path for both; the blocking client call runs off the event loop
+        return await asyncio.to_thread(self._generate, prompt, filename)
+
+class ImageBatchItem(BaseModel):
+    prompt: str = Field(description="Description of the image to generate")
+    filename: str = Field(description="Name for the generated image file")
+    variants: int = Field(default=1, ge=1, le=10, description="Number of variants to generate (saved as <filename>_1.png, <filename>_2.png, ...)")
+
+class ImageBatchInput(BaseModel):
+    images: List[ImageBatchItem] = Field(description="Images to generate, each with a prompt and filename")
+
+# Models whose Images API accepts n > 1 in a single request
+MULTI_IMAGE_MODELS = ("dall-e-2", "gpt-image-1")
+
+class ImageBatchTool(BaseTool):
+    name: str = "generate_images"
+    description: str = "Generate several images (and variants of each) in one step. Prefer this over repeated generate_image calls."
+    args_schema: Type[BaseModel] = ImageBatchInput
+    wandb_tracker: Any = None
+    workspace: Any = None
+    image_tool: Any = None
+    max_concurrency: int = 4
+    
+    def __init__(self, wandb_tracker=None, image_tool=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+        # Model, size, quality and cache are those of the single-image tool
+        self.image_tool = image_tool or ImageGenerateTool(wandb_tracker=wandb_tracker)
+        self.max_concurrency = int(os.getenv('IMAGE_CONCURRENCY', str(self.max_concurrency)))
+    
+    def _variant_paths(self, item: ImageBatchItem) -> List[Tuple[str, str]]:
+        """(cache prompt, file path) per variant; the first variant shares the cache entry of generate_image."""
+        if item.variants == 1:
+            return [(item.prompt, self.image_tool._image_path(item.filename))]
+        return [
+            (item.prompt if i == 0 else f"{item.prompt} (variant {i + 1})",
+             self.image_tool._image_path(f"{item.filename}_{i + 1}"))
+            for i in range(item.variants)
+        ]
+    
+    async def _request(self, client, semaphore, prompt: str, count: int) -> List[str]:
+        """Base64 images for one prompt, in one request when the model supports n > 1."""
+        tool = self.image_tool
+        per_request = count if tool.image_model in MULTI_IMAGE_MODELS else 1
+        
+        async def generate(n):
+            async with semaphore:
+                with span("rate_limit:openai_images", "http"):
+                    await get_rate_limiter("openai_images").aacquire()
+                with span("openai_images_generate", "http", model=tool.image_model, size=tool.image_size, n=n):
+                    result = await client.images.generate(**dict(tool._generate_kwargs(prompt), n=n))
+            return [image.b64_json for image in result.data]
+        
+        batches = await asyncio.gather(*(
+            generate(min(per_request, count - start)) for start in range(0, count, per_request)
+        ))
+        return [image for batch in batches for image in batch]
+    
+    async def _generate_item(self, client, semaphore, cache, item: ImageBatchItem) -> Tuple[List[str], int, Optional[str]]:
+        """Generate one batch entry; returns saved paths, cache hits and an error."""
+        tool = self.image_tool
+        variants = self._variant_paths(item)
+        discarded = "its run was collected before the image was ready"
+        missing = []
+        for cache_prompt, file_path in variants:
+            with job_output() as keep:
+                if not keep:
+                    return [], 0, discarded
+                if cache and await asyncio.to_thread(
+                    cache.fetch, tool.image_model, cache_prompt, tool.image_size, tool.image_quality, file_path
+                ):
+                    tool._emit_image_ready(file_path)
+                else:
+                    missing.append((cache_prompt, file_path))
+        cache_hits = len(variants) - len(missing)
+        try:
+            if missing:
+                images = await self._request(client, semaphore, item.prompt, len(missing))
+                with job_output() as keep:
+                    if not keep:
+                        raise RuntimeError(discarded)
+                    await asyncio.gather(*(
+                        asyncio.to_thread(tool._save_image, cache, cache_prompt, image_base64, file_path)
+                        for (cache_prompt, file_path), image_base64 in zip(missing, images)
+                    ))
+                    for _, file_path in missing:
+                        tool._emit_image_ready(file_path)
+        except Exception as e:
+            missing_paths = {file_path for _, file_path in missing}
+            return [file_path for _, file_path in variants if file_path not in missing_paths], cache_hits, str(e)
+        return [file_path for _, file_path in variants], cache_hits, None
+    
+    @traced_tool("image_generate_batch")
+    async def _agenerate(self, images: List[Any]) -> str:
+        start_time = time.time()
+        success = False
+        items = [image if isinstance(image, ImageBatchItem) else ImageBatchItem(**image) for image in images]
+        cache = self.image_tool.image_cache or get_image_cache()
+        cache_hits = 0
+        saved = 0
+        try:
+            from openai import AsyncOpenAI
+            
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                organization=os.getenv("OPENAI_ORGANIZATION")
+            ) as client:
+                outcomes = await asyncio.gather(*(
+                    self._generate_item(client, semaphore, cache, item) for item in items
+                ))
+            
+            lines = []
+            errors = []
+            for item, (paths, hits, error) in zip(items, outcomes):
+                cache_hits += hits
+                saved += len(paths)
+                if paths:
+                    lines.append(f"- {', '.join(os.path.basename(path) for path in paths)}: {item.prompt}")
+                if error:
+                    errors.append(f"- {item.filename}: {error}")
+            success = saved > 0
+            result = f"Saved {saved} images in images directory ({cache_hits} served from cache):\n" + "\n".join(lines)
+            if errors:
+                result += "\nFailed images:\n" + "\n".join(errors)
+        except Exception as e:
+            result = f"Error generating images: {str(e)}"
+        finally:
+            cache_metrics = dict(cache.stats()) if cache else {}
+            cache_metrics.update(image_batch_images=saved, image_batch_cache_hits=cache_hits)
+            record_tool_usage(self.wandb_tracker, "image_generate_batch", time.time() - start_time, success,
+                              extra_metrics=cache_metrics)
+        return result
+    
+    def _submit(self, image_jobs, images: List[Any]) -> str:
+        items = [image if isinstance(image, ImageBatchItem) else ImageBatchItem(**image) for image in images]
+        paths = [file_path for item in items for _, file_path in self._variant_paths(item)]
+        handle = image_jobs.submit(self._generate, items, paths=paths)
+        return (f"Image job {handle} started: {len(paths)} images are being generated in the background "
+                f"({', '.join(os.path.basename(path) for path in paths)}). "
+                f"Continue with the research; the images will be in the images directory when the run's output is collected.")
+    
+    def _generate(self, images: List[Any]) -> str:
+        return run_async(self._agenerate(images))
+    
+    @in_tool_workspace
+    async def _arun(self, images: List[Any]) -> str:
+        image_jobs = get_image_jobs()
+        if image_jobs:
+            return self._submit(image_jobs, images)
+        return await self._agenerate(images)
+    
+    @in_tool_workspace
+    def _run(self, images: List[Any]) -> str:
+        image_jobs = get_image_jobs()
+        if image_jobs:
+            return self._submit(image_jobs, images)
+        return self._generate(images)
+
+# JSON Schema types of MCP tool arguments
+JSON_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+def mcp_args_schema(tool_name: str, input_schema: Dict[str, Any]) -> Type[BaseModel]:
+    """Build a pydantic model for CrewAI from an MCP tool's JSON input schema."""
+    required = set(input_schema.get("required", []))
+    fields = {}
+    for name, spec in (input_schema.get("properties") or {}).items():
+        python_type = JSON_SCHEMA_TYPES.get(spec.get("type"), Any)
+        description = spec.get("description", name)
+        if name in required:
+            fields[name] = (python_type, Field(description=description))
+        else:
+            fields[name] = (Optional[python_type], Field(default=spec.get("default"), description=description))
+    return create_model(f"{tool_name.title().replace('_', '')}Input", **fields)
+
+class MCPTool(BaseTool):
+    name: str
+    description: str
+    args_schema: Type[BaseModel]
+    wandb_tracker: Any = None
+    workspace: Any = None
+    session_manager: Any = None
+    server_name: str = ""
+    tool_name: str = ""
+    
+    def __init__(self, wandb_tracker=None, **kwargs):
+        super().__init__(**kwargs)
+        self.wandb_tracker = wandb_tracker
+    
+    def _arguments(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # Optional arguments the agent left out are not sent
+        arguments = {key: value for key, value in kwargs.items() if value is not None}
+        arguments.update(run_arguments(self.server_name))
+        return arguments
+    
+    def _format(self, result) -> Tuple[str, bool]:
+        text = result_text(result)
+        if getattr(result, "isError", False):
+            return f"Error from {self.server_name} tool {self.tool_name}: {text}", False
+        return text, True
+    
+    @in_tool_workspace
+    @traced_tool(lambda tool: f"mcp_{tool.name}")
+    def _run(self, **kwargs) -> str:
+        start_time = time.time()
+        success = False
+        try:
+            result, success = self._format(
+                self.session_manager.call_tool(self.server_name, self.tool_name, self._arguments(kwargs))
+            )
+        except Exception as e:
+            result = f"Error calling {self.server_name} tool {self.tool_name}: {str(e)}"
+        finally:
+            record_tool_usage(self.wandb_tracker, f"mcp_{self.name}", time.time() - start_time, success)
+        return result
+    
+    @in_tool_workspace
+    @traced_tool(lambda tool: f"mcp_{tool.name}")
+    async def _arun(self, **kwargs) -> str:
+        start_time = time.time()
+        success = False
+        try:
+            result, success = self._format(
+                await self.session_manager.acall_tool(self.server_name, self.tool_name, self._arguments(kwargs))
+            )
+        except Exception as e:
+            result = f"Error calling {self.server_name} tool {self.tool_name}: {str(e)}"
+        finally:
+            record_tool_usage(self.wandb_tracker, f"mcp_{self.name}", time.time() - start_time, success)
+        return result
+
+def create_mcp_tools(session_manager, tracker=None) -> List[MCPTool]:
+    """
+    Expose the tools of every enabled MCP server to CrewAI. Starting a server
+    happens here, once; a server that fails to start is skipped.
+    """
+    tools = []
+    for server_name in session_manager.sessions:
+        try:
+            server_tools = session_manager.list_tools(server_name)
+        except Exception as e:
+            print(f"⚠️ MCP server {server_name} unavailable, skipping its tools: {str(e)}")
+            continue
+        for tool in server_tools:
+            name = f"{server_name}_{tool.name}"
+            # Arguments filled in from the run are hidden from the agent
+            input_schema = dict(tool.inputSchema or {})
+            hidden = RUN_ARGUMENTS.get(server_name, {})
+            input_schema["properties"] = {
+                key: spec for key, spec in (input_schema.get("properties") or {}).items() if key not in hidden
+            }
+            input_schema["required"] = [key for key in input_schema.get("required", []) if key not in hidden]
+            tools.append(MCPTool(
+                wandb_tracker=tracker,
+                name=name,
+                description=tool.description or f"{tool.name} from the {server_name} MCP server",
+                args_schema=mcp_args_schema(name, input_schema),
+                session_manager=session_manager,
+                server_name=server_name,
+                tool_name=tool.name,
+            ))
+        print(f"🔌 {len(server_tools)} tools from MCP server {server_name}")
+    return tools
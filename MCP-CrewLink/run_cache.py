@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from event_stream import events_enabled
+from search_cache import normalize_query
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Fields of a job response that describe the request, not the run
+TRANSIENT_FIELDS = ("id", "job_time", "run_cache")
+
+
+def run_config_from_env(crew_mode: Optional[str] = None) -> Dict[str, Any]:
+    """Settings besides topic and query that change a run's output."""
+    if os.getenv('WANDB_INFERENCE_API_KEY'):
+        model = os.getenv('WANDB_INFERENCE_MODEL', 'openai/meta-llama/Llama-4-Scout-17B-16E-Instruct')
+    else:
+        model = os.getenv('OPENAI_MODEL_NAME', 'gpt-4o-mini')
+    return {
+        "model": model,
+        "image_output": os.getenv('IMAGE_OUTPUT', 'inline'),
+        # Runs streaming events report files and images by reference only
+        "events": events_enabled(),
+        "crew_mode": crew_mode or os.getenv('CREW_MODE', 'sequential'),
+    }
+
+
+class RunCache:
+    """
+    Cache of whole research runs: the final structured output (reports,
+    image descriptions, crew result) keyed on normalized topic, normalized
+    query and run configuration, stored in SQLite.
+
+    Entries are fresh for `ttl` seconds. An entry whose report or image
+    files were removed (e.g. by the workspace janitor) is dropped on lookup.
+    At most `max_entries` runs are kept, the least recently served first out.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 ttl: float = 3600,
+                 max_entries: int = 200):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "run_cache.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets concurrent research processes share the cache file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS run_cache (
+                   key TEXT PRIMARY KEY,
+                   topic TEXT NOT NULL,
+                   query TEXT NOT NULL,
+                   payload TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_run_cache_topic ON run_cache(topic, query)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(topic: str, query: str, config: Optional[Dict[str, str]] = None) -> str:
+        raw = json.dumps(
+            [normalize_query(topic), normalize_query(query), config or run_config_from_env()], sort_keys=True
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _outputs_exist(output: Dict[str, Any]) -> bool:
+        for item in output.get("files_generated", []) + output.get("images_generated", []):
+            if item.get("path") and not os.path.exists(item["path"]):
+                return False
+        return True
+
+    def get(self, topic: str, query: str, config: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached output of a fresh run, or None on a miss."""
+        key = self.make_key(topic, query, config)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, created_at FROM run_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                output = json.loads(row[0])
+                if now - row[1] < self.ttl and self._outputs_exist(output):
+                    self._db.execute("UPDATE run_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self.hits += 1
+                    output["run_cache"] = {"hit": True, "cached_at": row[1], "age": now - row[1]}
+                    return output
+                self._db.execute("DELETE FROM run_cache WHERE key = ?", (key,))
+                self._db.commit()
+            self.misses += 1
+            return None
+
+    def set(self, topic: str, query: str, output: Dict[str, Any], config: Optional[Dict[str, str]] = None) -> None:
+        """Store the structured output of a successful run."""
+        key = self.make_key(topic, query, config)
+        payload = json.dumps({name: value for name, value in output.items() if name not in TRANSIENT_FIELDS})
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """INSERT OR REPLACE INTO run_cache (key, topic, query, payload, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, normalize_query(topic), normalize_query(query), payload, now, now)
+            )
+            self._db.execute("DELETE FROM run_cache WHERE created_at <= ?", (now - self.ttl,))
+            self._db.execute(
+                """DELETE FROM run_cache WHERE key IN (
+                       SELECT key FROM run_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def invalidate(self, topic: Optional[str] = None, query: Optional[str] = None) -> int:
+        """
+        Drop cached runs of a topic (and query), under any configuration.
+        Without a topic, every cached run is dropped. Returns the number dropped.
+        """
+        with self._lock:
+            if topic is None:
+                cursor = self._db.execute("DELETE FROM run_cache")
+            elif query is None:
+                cursor = self._db.execute("DELETE FROM run_cache WHERE topic = ?", (normalize_query(topic),))
+            else:
+                cursor = self._db.execute(
+                    "DELETE FROM run_cache WHERE topic = ? AND query = ?",
+                    (normalize_query(topic), normalize_query(query))
+                )
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "run_cache_hits": self.hits,
+            "run_cache_misses": self.misses,
+            "run_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_run_cache: Optional[RunCache] = None
+_run_cache_lock = threading.Lock()
+
+
+def get_run_cache() -> Optional[RunCache]:
+    """
+    Return the shared run cache configured from the environment,
+    or None when RUN_CACHE_ENABLED is false.
+
+    RUN_CACHE_PATH: SQLite file (default cache/run_cache.sqlite3)
+    RUN_CACHE_TTL: seconds a cached run is served (default 3600)
+    RUN_CACHE_MAX_ENTRIES: cached runs kept (default 200)
+    """
+    global _run_cache
+    if os.getenv("RUN_CACHE_ENABLED", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if _run_cache is None:
+        with _run_cache_lock:
+            if _run_cache is None:
+                _run_cache = RunCache(
+                    path=os.getenv("RUN_CACHE_PATH"),
+                    ttl=float(os.getenv("RUN_CACHE_TTL", "3600")),
+                    max_entries=int(os.getenv("RUN_CACHE_MAX_ENTRIES", "200")),
+                )
+    return _run_cache
@@ -0,0 +1,84 @@
+import os
+import time
+from event_stream import emit_event
+from image_refs import describe_image_ref
+from markdown_renderer import render_markdown_cached
+from tracing import current_span, record_span
+from workspaces import get_current_workspace
+
+# Create a local files directory if it doesn't exist
+files_dir = os.path.join(os.getcwd(), "files")
+os.makedirs(files_dir, exist_ok=True)
+images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+# Output directories of the current run's workspace; the shared
+# files/ and images/ directories are only used outside of a run
+def current_files_dir():
+    workspace = get_current_workspace()
+    return workspace.files_dir if workspace else files_dir
+
+def current_images_dir():
+    workspace = get_current_workspace()
+    if workspace:
+        return workspace.images_dir
+    os.makedirs(images_dir, exist_ok=True)
+    return images_dir
+
+# Record a tool call in WandB, on the event stream and in the run's trace
+def record_tool_usage(tracker, tool_name, execution_time, success, extra_metrics=None):
+    tool_span = current_span()
+    if tool_span is not None and tool_span.name == f"tool:{tool_name}":
+        # The call ran inside its own span (see research_tools.traced_tool)
+        tool_span.set(success=success)
+    else:
+        end_time = time.time()
+        record_span(f"tool:{tool_name}", "tool", end_time - execution_time, end_time, current_track=True, success=success)
+    if tracker:
+        tracker.log_tool_usage(tool_name, execution_time, success, extra_metrics=extra_metrics)
+    emit_event("tool_call", tool=tool_name, duration=execution_time, success=success)
+
+# Format content for rich text display
+def format_content_for_display(content):
+    """
+    Format content for rich text display. Markdown is rendered to HTML in a
+    single pass and cached by content hash, so repeated reports are free.
+    """
+    return render_markdown_cached(content)
+
+# Describe a generated report for the structured output
+def describe_generated_file(file_path, content=None):
+    filename = os.path.basename(file_path)
+    if content is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    return {
+        "filename": filename,
+        "content": content,
+        "path": file_path,
+        "file_type": "markdown" if filename.endswith('.md') else "text",
+        "formatted_content": format_content_for_display(content)
+    }
+
+# Describe a generated image for the structured output
+def describe_generated_image(image_path, run_id=None):
+    """
+    Inline mode returns the image base64-encoded; ref mode (IMAGE_OUTPUT=ref)
+    returns path, size and content hash so the image bytes are never copied.
+    run_id defaults to the current workspace's.
+    """
+    if os.getenv('IMAGE_OUTPUT', 'inline') == 'ref':
+        image_data = describe_image_ref(image_path, thumbnail_size=int(os.getenv('IMAGE_THUMBNAIL_SIZE', '0')))
+    else:
+        import base64
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+        image_data = {
+            "filename": os.path.basename(image_path),
+            "base64": base64.b64encode(image_bytes).decode('utf-8'),
+            "path": image_path
+        }
+    # Images are served per run from workspaces/<run_id>/images
+    workspace = get_current_workspace()
+    if run_id or workspace:
+        image_data["run_id"] = run_id or workspace.run_id
+    return image_data
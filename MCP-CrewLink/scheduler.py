@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Research scheduler: runs many research jobs across a pool of worker processes.
+
+Jobs are JSON lines in the resident worker format, read from a file or stdin:
+    {"id": "job-1", "topic": "...", "query": "...", "run_id": null}
+
+Each worker process keeps its tools, LLM client and WandB tracker warm and
+runs one job at a time in its own workspace. Brave and OpenAI Images calls
+share process-wide rate limiters; the LLM limit is split across processes.
+One JSON result line is written per job as it finishes, followed by a final
+{"op": "stats", ...} line with queue depth, wait time and throughput.
+
+Usage:
+    python scheduler.py jobs.jsonl --processes 4 --brave-rpm 60 --images-rpm 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Dict, Optional
+
+from rate_limits import LLM_LIMIT_ENV, create_rate_limiters, install_rate_limiters
+from workspaces import get_workspace_janitor
+
+# Research worker of this pool process, created once by the initializer
+_worker = None
+
+
+def _init_worker(rate_limiters, llm_share):
+    global _worker
+    install_rate_limiters(rate_limiters, llm_share)
+    # Keep worker logs off the scheduler's stdout, which carries results
+    with contextlib.redirect_stdout(sys.stderr):
+        from main import ResearchWorker
+        _worker = ResearchWorker(start_janitor=False)
+    # Pool processes skip atexit handlers; finalizers still run on shutdown
+    Finalize(_worker, _close_worker, exitpriority=10)
+
+
+def _close_worker():
+    with contextlib.redirect_stdout(sys.stderr):
+        _worker.close()
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    with contextlib.redirect_stdout(sys.stderr):
+        result = _worker.handle_job(job)
+    result["worker_pid"] = os.getpid()
+    return result
+
+
+class ResearchScheduler:
+    """
+    Queues research jobs and dispatches them to a process pool, never more
+    than `processes` at a time, so jobs wait in the scheduler's queue rather
+    than inside the pool and their queue wait time can be measured.
+    """
+
+    def __init__(self,
+                 processes: Optional[int] = None,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 tracker=None):
+        self.processes = processes or int(os.getenv("SCHEDULER_PROCESSES", "2"))
+        self.on_result = on_result
+        self.tracker = tracker
+        # Spawned workers don't inherit the scheduler's threads or open clients
+        context = multiprocessing.get_context("spawn")
+        self.rate_limiters = create_rate_limiters(rate_limits, context=context)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.rate_limiters, self.processes),
+        )
+        # Reentrant: a pool future that is already done runs its callback inside _dispatch
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = deque()
+        self._in_flight = 0
+        # Jobs whose result has not been delivered yet
+        self._unfinished = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_times = []
+        self._run_times = []
+        self._first_submit_time = None
+
+    def submit(self, job: Dict[str, Any]) -> Future:
+        """Queue a job; the returned future resolves to its result dictionary."""
+        future = Future()
+        with self._lock:
+            self._submitted += 1
+            self._unfinished += 1
+            job = dict(job)
+            job.setdefault("id", f"job-{self._submitted}")
+            now = time.time()
+            if self._first_submit_time is None:
+                self._first_submit_time = now
+            self._pending.append((job, now, future))
+            self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        # Called with the lock held
+        while self._pending and self._in_flight < self.processes:
+            job, submit_time, future = self._pending.popleft()
+            self._in_flight += 1
+            dispatch_time = time.time()
+            self._wait_times.append(dispatch_time - submit_time)
+            try:
+                pool_future = self._executor.submit(_run_job, job)
+            except Exception as e:
+                pool_future = Future()
+                pool_future.set_exception(e)
+            pool_future.add_done_callback(
+                lambda done, job=job, future=future, submit_time=submit_time, dispatch_time=dispatch_time:
+                self._on_done(done, job, future, submit_time, dispatch_time)
+            )
+
+    def _on_done(self, pool_future: Future, job, future: Future, submit_time: float, dispatch_time: float) -> None:
+        finish_time = time.time()
+        try:
+            result = pool_future.result()
+        except Exception as e:
+            # The worker process died (or the job could not be pickled)
+            result = {"id": job["id"], "success": False, "error": f"Worker failed: {str(e)}"}
+        result["queue_wait_time"] = dispatch_time - submit_time
+        result["run_time"] = finish_time - dispatch_time
+
+        with self._lock:
+            self._in_flight -= 1
+            self._run_times.append(result["run_time"])
+            if result.get("success"):
+                self._completed += 1
+            else:
+                self._failed += 1
+            self._dispatch()
+
+        try:
+            if self.tracker:
+                self.tracker.log_metrics(self.stats())
+            if self.on_result:
+                self.on_result(result)
+        finally:
+            future.set_result(result)
+            with self._lock:
+                self._unfinished -= 1
+                self._idle.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            elapsed = time.time() - self._first_submit_time if self._first_submit_time else 0.0
+            stats = {
+                "scheduler_processes": self.processes,
+                "scheduler_queue_depth": len(self._pending),
+                "scheduler_in_flight": self._in_flight,
+                "scheduler_jobs_submitted": self._submitted,
+                "scheduler_jobs_completed": self._completed,
+                "scheduler_jobs_failed": self._failed,
+                "scheduler_wait_time_avg": sum(self._wait_times) / len(self._wait_times) if self._wait_times else 0.0,
+                "scheduler_wait_time_max": max(self._wait_times, default=0.0),
+                "scheduler_run_time_avg": sum(self._run_times) / len(self._run_times) if self._run_times else 0.0,
+                "scheduler_throughput_per_min": finished / elapsed * 60 if elapsed > 0 else 0.0,
+            }
+        for limiter in self.rate_limiters.values():
+            stats.update(limiter.stats())
+        return stats
+
+    def wait(self) -> None:
+        """Block until every submitted job has finished."""
+        with self._idle:
+            while self._unfinished:
+                self._idle.wait()
+
+    def shutdown(self) -> None:
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run many MCP-CrewLink research jobs across worker processes")
+    parser.add_argument("jobs", nargs="?", help="JSON-lines file of jobs (default: stdin)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes (default: SCHEDULER_PROCESSES or 2)")
+    parser.add_argument("--brave-rpm", type=float, default=None,
+                        help="Brave search requests per minute across all workers (default: BRAVE_REQUESTS_PER_MINUTE, 0 = unlimited)")
+    parser.add_argument("--images-rpm", type=float, default=None,
+                        help="OpenAI image generations per minute across all workers (default: OPENAI_IMAGES_PER_MINUTE, 0 = unlimited)")
+    parser.add_argument("--llm-rpm", type=float, default=None,
+                        help="LLM requests per minute, split across workers (default: LLM_REQUESTS_PER_MINUTE, 0 = unlimited)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.llm_rpm is not None:
+        # Inherited by the spawned workers
+        os.environ[LLM_LIMIT_ENV] = str(args.llm_rpm)
+
+    output_lock = threading.Lock()
+
+    def write_line(data):
+        with output_lock:
+            sys.stdout.write(json.dumps(data, default=str) + "\n")
+            sys.stdout.flush()
+
+    tracker = None
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            from wandb_tracker import WandBTracker
+            tracker = WandBTracker(
+                project="mcp-crewlink-research",
+                config={"framework": "CrewAI", "mode": "scheduler", "processes": args.processes},
+                auto_init=True
+            )
+        except ImportError as e:
+            print(f"⚠️ WandB tracking unavailable: {e}")
+        janitor = get_workspace_janitor().start()
+
+    scheduler = ResearchScheduler(
+        processes=args.processes,
+        rate_limits={"brave": args.brave_rpm, "openai_images": args.images_rpm},
+        on_result=write_line,
+        tracker=tracker,
+    )
+    print(f"🗂️ Research scheduler running {scheduler.processes} worker processes", file=sys.stderr)
+
+    jobs_file = open(args.jobs, encoding="utf-8") if args.jobs else sys.stdin
+    try:
+        for line in jobs_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                scheduler.submit(json.loads(line))
+            except json.JSONDecodeError as e:
+                write_line({"success": False, "error": f"Invalid job: {str(e)}"})
+        scheduler.shutdown()
+    finally:
+        if jobs_file is not sys.stdin:
+            jobs_file.close()
+        janitor.stop()
+
+    stats = scheduler.stats()
+    write_line(dict({"op": "stats", "success": True}, **stats))
+    print(f"✅ {stats['scheduler_jobs_completed']} jobs completed, {stats['scheduler_jobs_failed']} failed, "
+          f"{stats['scheduler_throughput_per_min']:.1f} jobs/min", file=sys.stderr)
+    if tracker:
+        with contextlib.redirect_stdout(sys.stderr):
+            tracker.finish_run()
+
+
+if __name__ == "__main__":
+    main()
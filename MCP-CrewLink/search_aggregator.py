@@ -0,0 +1,152 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click, not the content
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "ref_src", "source", "mc_cid", "mc_eid"}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form so the same page found by different
+    queries is recognised: lowercase scheme/host, no "www.", no fragment,
+    no tracking parameters, sorted query string and no trailing slash.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    if not parts.netloc:
+        return url.strip()
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/")
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, query, ""))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class SearchAggregator:
+    """
+    Collects web search results across all queries of a research run.
+
+    Results are deduplicated by canonical URL and scored by reciprocal rank,
+    summed over every query that returned them, so pages found repeatedly and
+    near the top rank first. Digests only include pages the agent has not been
+    shown yet and stop at a token budget.
+    """
+
+    def __init__(self, max_description_chars: int = 300):
+        self.max_description_chars = max_description_chars
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._delivered = set()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget everything collected so far, e.g. at the start of a new run."""
+        with self._lock:
+            self._entries.clear()
+            self._delivered.clear()
+
+    def add(self, query: str, results: Iterable[Dict[str, Any]]) -> List[str]:
+        """Record one query's results in rank order. Returns their canonical URLs."""
+        urls = []
+        with self._lock:
+            for rank, result in enumerate(results):
+                url = result.get('url')
+                if not url:
+                    continue
+                key = canonicalize_url(url)
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = {
+                        "url": url,
+                        "title": result.get('title', 'No title'),
+                        "description": result.get('description', 'No description'),
+                        "score": 0.0,
+                        "best_rank": rank,
+                        "queries": [],
+                    }
+                elif len(result.get('description') or '') > len(entry["description"]):
+                    # Keep the most informative snippet
+                    entry["description"] = result['description']
+                entry["score"] += 1.0 / (rank + 1)
+                entry["best_rank"] = min(entry["best_rank"], rank)
+                if query not in entry["queries"]:
+                    entry["queries"].append(query)
+                if key not in urls:
+                    urls.append(key)
+        return urls
+
+    def _render(self, entry: Dict[str, Any]) -> str:
+        description = entry["description"]
+        if len(description) > self.max_description_chars:
+            description = description[:self.max_description_chars].rstrip() + "…"
+        found_by = f"\nFound by: {', '.join(entry['queries'])}" if len(entry["queries"]) > 1 else ""
+        return f"**{entry['title']}**\n{description}\nURL: {entry['url']}{found_by}\n"
+
+    def digest(self,
+               urls: Optional[List[str]] = None,
+               token_budget: int = 800,
+               max_results: Optional[int] = None,
+               header: str = "") -> str:
+        """
+        Render the highest-scoring results not yet shown to the agent.
+
+        urls limits the digest to these canonical URLs (default: all results);
+        rendering stops at max_results entries or token_budget tokens.
+        """
+        with self._lock:
+            keys = urls if urls is not None else list(self._entries)
+            ranked = sorted(
+                (key for key in keys if key in self._entries),
+                key=lambda key: (-self._entries[key]["score"], self._entries[key]["best_rank"])
+            )
+            fresh_keys = [key for key in ranked if key not in self._delivered]
+            repeated = len(ranked) - len(fresh_keys)
+
+            lines = []
+            used_tokens = estimate_tokens(header)
+            for key in fresh_keys:
+                if max_results is not None and len(lines) >= max_results:
+                    break
+                rendered = self._render(self._entries[key])
+                cost = estimate_tokens(rendered)
+                if lines and used_tokens + cost > token_budget:
+                    break
+                lines.append(rendered)
+                used_tokens += cost
+                self._delivered.add(key)
+
+        omitted = len(fresh_keys) - len(lines)
+        notes = []
+        if repeated:
+            notes.append(f"{repeated} result(s) already returned by earlier searches were omitted.")
+        if omitted:
+            notes.append(f"{omitted} lower-ranked result(s) were omitted to save space.")
+        body = "\n".join(lines)
+        if notes:
+            body = (body + "\n" if body else "") + " ".join(notes)
+        return header + body
+
+    def top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return collected results ordered by score, best first."""
+        with self._lock:
+            ranked = sorted(self._entries.values(), key=lambda entry: (-entry["score"], entry["best_rank"]))
+            return [dict(entry, queries=list(entry["queries"])) for entry in ranked[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "search_unique_results": len(self._entries),
+                "search_results_delivered": len(self._delivered),
+            }
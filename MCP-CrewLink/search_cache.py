@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so near-identical queries share a cache entry:
+    case, surrounding quotes/punctuation and repeated whitespace are ignored.
+    """
+    normalized = re.sub(r"\s+", " ", query.strip().lower())
+    return normalized.strip(" \"'`.,;:!?")
+
+
+class SearchCache:
+    """
+    Two-tier cache for web search responses keyed on normalized query + count.
+
+    The in-memory tier is a small LRU in front of an on-disk SQLite tier.
+    Both tiers expire entries after `ttl` seconds; the disk tier keeps at most
+    `max_disk_entries` rows, evicting the least recently used ones.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 ttl: float = 24 * 3600,
+                 max_memory_entries: int = 256,
+                 max_disk_entries: int = 10000):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "search_cache.sqlite3")
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets concurrent research processes share the cache file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                   key TEXT PRIMARY KEY,
+                   payload TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache(accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(query: str, count: int) -> str:
+        return f"{count}:{normalize_query(query)}"
+
+    def get(self, query: str, count: int) -> Optional[Any]:
+        """Return the cached response payload, or None on a miss."""
+        key = self.make_key(query, count)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._memory[key]
+
+            row = self._db.execute(
+                "SELECT payload, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                payload, created_at = json.loads(row[0]), row[1]
+                if now - created_at < self.ttl:
+                    self._db.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, created_at, payload)
+                    self.hits += 1
+                    return payload
+                self._db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, query: str, count: int, payload: Any) -> None:
+        """Store a response payload in both tiers."""
+        key = self.make_key(query, count)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, payload)
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), now, now)
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _remember(self, key: str, created_at: float, payload: Any) -> None:
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM search_cache WHERE created_at <= ?", (now - self.ttl,))
+        self._db.execute(
+            """DELETE FROM search_cache WHERE key IN (
+                   SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+               )""",
+            (self.max_disk_entries,)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM search_cache")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "search_cache_hits": self.hits,
+            "search_cache_misses": self.misses,
+            "search_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """
+    Return the shared search cache configured from the environment,
+    or None when SEARCH_CACHE_ENABLED is false.
+
+    SEARCH_CACHE_PATH: SQLite file (default cache/search_cache.sqlite3)
+    SEARCH_CACHE_TTL: seconds before an entry expires (default 86400)
+    SEARCH_CACHE_MEMORY_SIZE: in-memory LRU entries (default 256)
+    SEARCH_CACHE_MAX_ENTRIES: on-disk entries (default 10000)
+    """
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache(
+                    path=os.getenv("SEARCH_CACHE_PATH"),
+                    ttl=float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600))),
+                    max_memory_entries=int(os.getenv("SEARCH_CACHE_MEMORY_SIZE", "256")),
+                    max_disk_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "10000")),
+                )
+    return _search_cache
@@ -1,57 +1,155 @@
-from typing import Any, Dict
-import httpx
+from typing import Any, Dict, Optional
+import asyncio
+import time
 from mcp.server.fastmcp import FastMCP
-from openai import OpenAI
+from openai import AsyncOpenAI
 import os
+import sys
 import base64
 
+# Make the project modules importable when run as `python3 servers/image_server.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from image_cache import get_image_cache
+from workspaces import get_workspaces_root
+
 # Initialize FastMCP server
 mcp = FastMCP("image_server")
 
 # Use absolute path for output directory
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+output_dir = os.getenv("IMAGE_SERVER_OUTPUT_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+# Image generation settings, also used as the cache key
+IMAGE_MODEL = "gpt-image-1"
+IMAGE_SIZE = "1024x1024"
+IMAGE_QUALITY = "hd"
+
+# Concurrency settings. Requests beyond IMAGE_SERVER_CONCURRENCY wait for a
+# slot, at most IMAGE_SERVER_MAX_QUEUE of them and for IMAGE_SERVER_QUEUE_TIMEOUT
+# seconds; a generation itself is abandoned after IMAGE_SERVER_REQUEST_TIMEOUT.
+IMAGE_SERVER_CONCURRENCY = int(os.getenv("IMAGE_SERVER_CONCURRENCY", "4"))
+IMAGE_SERVER_MAX_QUEUE = int(os.getenv("IMAGE_SERVER_MAX_QUEUE", "32"))
+IMAGE_SERVER_QUEUE_TIMEOUT = float(os.getenv("IMAGE_SERVER_QUEUE_TIMEOUT", "120"))
+IMAGE_SERVER_REQUEST_TIMEOUT = float(os.getenv("IMAGE_SERVER_REQUEST_TIMEOUT", "180"))
+
+# Shared client and slots, created on the server's event loop
+_client: Optional[AsyncOpenAI] = None
+_slots: Optional[asyncio.Semaphore] = None
+_waiting = 0
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """One async client per server process, so connections are reused across calls."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            organization=os.getenv("OPENAI_ORGANIZATION"),
+            timeout=IMAGE_SERVER_REQUEST_TIMEOUT
+        )
+    return _client
+
+
+async def acquire_slot() -> float:
+    """Wait for a generation slot; returns the time spent queued."""
+    global _slots, _waiting
+    if _slots is None:
+        _slots = asyncio.Semaphore(IMAGE_SERVER_CONCURRENCY)
+    if _slots.locked() and _waiting >= IMAGE_SERVER_MAX_QUEUE:
+        raise RuntimeError(f"Image server busy: {_waiting} requests already queued")
+    start_time = time.time()
+    _waiting += 1
+    try:
+        await asyncio.wait_for(_slots.acquire(), IMAGE_SERVER_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"Image server busy: no free slot after {IMAGE_SERVER_QUEUE_TIMEOUT:g} seconds")
+    finally:
+        _waiting -= 1
+    return time.time() - start_time
+
+
+def resolve_output_dir(requested_dir: Optional[str]) -> str:
+    """The directory to write to: the caller's run workspace, which must lie under WORKSPACES_DIR, or output_dir."""
+    if not requested_dir:
+        return output_dir
+    root = os.path.realpath(get_workspaces_root())
+    path = os.path.realpath(requested_dir)
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Output directory {requested_dir} is outside the workspaces directory")
+    return path
+
 
 @mcp.tool(name="image_creation_openai", description="Create an image using OpenAI's Images API")
-def image_creation_openai(query: str, image_name: str) -> Dict[str, Any]:
+async def image_creation_openai(query: str, image_name: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
     """Create an image using OpenAI's Images API"""
-    client = OpenAI(
-        api_key=os.getenv("OPENAI_API_KEY"), 
-        organization=os.getenv("OPENAI_ORGANIZATION")
-    )
-
     try:
         # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-
-        result = client.images.generate(
-            model="gpt-image-1",  # Changed from "gpt-image-1" to valid model
-            prompt=f"Generate an image based on the following prompt: {query}",
-            size="1024x1024",
-            quality="hd",  # Changed from "high" to valid value
-            response_format="b64_json"  # Explicitly request base64 format
-        )
+        image_dir = resolve_output_dir(output_dir)
+        os.makedirs(image_dir, exist_ok=True)
+        file_path = os.path.join(image_dir, f"{os.path.basename(image_name)}.png")
+
+        # Serve repeated prompts from the content-addressed cache; cache and
+        # file I/O run in a thread so the event loop keeps serving other calls
+        cache = get_image_cache()
+        if cache and await asyncio.to_thread(cache.fetch, IMAGE_MODEL, query, IMAGE_SIZE, IMAGE_QUALITY, file_path):
+            return {
+                "success": True,
+                "file_path": file_path,
+                "cache_hit": True,
+                "cache_stats": cache.stats(),
+                "message": f"Image saved successfully as {file_path} (served from cache)"
+            }
+
+        queue_time = await acquire_slot()
+        try:
+            result = await asyncio.wait_for(
+                get_openai_client().images.generate(
+                    model=IMAGE_MODEL,  # Changed from "gpt-image-1" to valid model
+                    prompt=f"Generate an image based on the following prompt: {query}",
+                    size=IMAGE_SIZE,
+                    quality=IMAGE_QUALITY,  # Changed from "high" to valid value
+                    response_format="b64_json"  # Explicitly request base64 format
+                ),
+                IMAGE_SERVER_REQUEST_TIMEOUT
+            )
+        finally:
+            _slots.release()
 
         # Extract base64 image data
         image_base64 = result.data[0].b64_json
         image_bytes = base64.b64decode(image_base64)
 
         # Save the image to a file
-        file_path = f"{output_dir}/{image_name}.png"
-        with open(file_path, "wb") as f:
-            f.write(image_bytes)
+        if cache:
+            await asyncio.to_thread(cache.store, IMAGE_MODEL, query, IMAGE_SIZE, IMAGE_QUALITY, image_bytes, file_path)
+        else:
+            await asyncio.to_thread(write_image, file_path, image_bytes)
 
         return {
             "success": True, 
             "file_path": file_path,
+            "cache_hit": False,
+            "queue_time": queue_time,
             "message": f"Image saved successfully as {file_path}"
         }
-        
+
+    except asyncio.TimeoutError:
+        return {
+            "success": False,
+            "error": f"Image generation timed out after {IMAGE_SERVER_REQUEST_TIMEOUT:g} seconds"
+        }
     except Exception as e:
         return {
             "success": False, 
             "error": str(e)
         }
 
+
+def write_image(file_path: str, image_bytes: bytes) -> None:
+    with open(file_path, "wb") as f:
+        f.write(image_bytes)
+
+
 if __name__ == "__main__":
-    print("Image Creation MCP Server running on stdio")
-    mcp.run(transport="stdio")
\ No newline at end of file
+    # stdout carries the JSON-RPC stream
+    print("Image Creation MCP Server running on stdio", file=sys.stderr)
+    mcp.run(transport="stdio")
@@ -0,0 +1,115 @@
+import os
+import re
+import sys
+import importlib
+import threading
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Heavy dependencies main.py only imports on first use
+DEFERRED_MODULES = ("crewai", "litellm", "openai", "wandb", "mcp.client.stdio", "research_tools")
+
+# Preloaded while the tracker initializes; wandb is left to the tracker itself
+PRELOAD_MODULES = ("crewai", "litellm", "openai")
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+DEFERRED_MARKER = "--- deferred imports ---"
+
+_preload_thread: Optional[threading.Thread] = None
+
+
+def preload_modules(modules: Iterable[str] = PRELOAD_MODULES) -> Optional[threading.Thread]:
+    """
+    Import heavy modules on a background thread, so their import overlaps
+    with network-bound startup work such as wandb.init (PRELOAD_IMPORTS,
+    default true). Callers about to use them call wait_for_preload() first.
+    """
+    global _preload_thread
+    if os.getenv('PRELOAD_IMPORTS', 'true').lower() != 'true' or _preload_thread is not None:
+        return _preload_thread
+    modules = list(modules)
+
+    def load():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # Surfaces again, with context, where the module is actually used
+                pass
+
+    _preload_thread = threading.Thread(target=load, name="import-preload", daemon=True)
+    _preload_thread.start()
+    return _preload_thread
+
+
+def wait_for_preload() -> None:
+    """Wait for a running preload so a module is never imported from two threads at once."""
+    thread = _preload_thread
+    if thread is not None:
+        thread.join()
+
+
+def _parse_import_times(lines: List[str]) -> Tuple[float, Dict[str, float]]:
+    """Total and per-top-level-package self time in ms from -X importtime output."""
+    total = 0.0
+    packages: Dict[str, float] = {}
+    for line in lines:
+        match = IMPORT_TIME_RE.match(line)
+        if not match:
+            continue
+        self_ms = int(match.group(1)) / 1000
+        package = match.group(3).split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_ms
+        total += self_ms
+    return total, packages
+
+
+def measure_startup(deferred: Iterable[str] = DEFERRED_MODULES) -> Dict[str, Any]:
+    """
+    Import main.py in a fresh interpreter with `-X importtime`, then the
+    modules it defers, and break both stages down by top-level package.
+    """
+    script = "\n".join([
+        "import sys",
+        "import main",
+        f"sys.stderr.write({DEFERRED_MARKER!r} + '\\n')",
+        f"for name in {list(deferred)!r}:",
+        "    try:",
+        "        __import__(name)",
+        "    except Exception as e:",
+        "        sys.stderr.write(f'missing {name}: {e}\\n')",
+    ])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    lines = result.stderr.splitlines()
+    if DEFERRED_MARKER not in lines:
+        raise RuntimeError(f"Importing main failed:\n{result.stderr[-2000:]}")
+    split = lines.index(DEFERRED_MARKER)
+    main_total, main_packages = _parse_import_times(lines[:split])
+    deferred_total, deferred_packages = _parse_import_times(lines[split + 1:])
+    return {
+        "main_import_ms": main_total,
+        "main_packages": main_packages,
+        "deferred_import_ms": deferred_total,
+        "deferred_packages": deferred_packages,
+        "missing": [line[len("missing "):] for line in lines[split + 1:] if line.startswith("missing ")],
+    }
+
+
+def profile_startup(top: int = 12) -> Dict[str, Any]:
+    """Print the import-time breakdown of main.py's cold start (--profile-startup)."""
+    profile = measure_startup()
+    print("⏱️ Startup import profile (python -X importtime, self time per package)")
+    print(f"\n🚀 import main: {profile['main_import_ms']:.1f} ms")
+    for package, ms in sorted(profile["main_packages"].items(), key=lambda item: -item[1])[:top]:
+        print(f"   {package:28} {ms:8.1f} ms")
+    print(f"\n💤 Deferred until first use: {profile['deferred_import_ms']:.1f} ms")
+    for package, ms in sorted(profile["deferred_packages"].items(), key=lambda item: -item[1])[:top]:
+        print(f"   {package:28} {ms:8.1f} ms")
+    for missing in profile["missing"]:
+        print(f"⚠️ Not installed: {missing}")
+    return profile
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# The project modules are flat files next to main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_stream import set_event_emitter  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_run_state(tmp_path, monkeypatch):
+    """Keep workspaces, caches and the event emitter of each test apart."""
+    monkeypatch.setenv("WORKSPACES_DIR", str(tmp_path / "workspaces"))
+    monkeypatch.setenv("RUN_CACHE_PATH", str(tmp_path / "run_cache.sqlite3"))
+    monkeypatch.setenv("WANDB_MODE", "disabled")
+    yield
+    set_event_emitter(None)
+
+
+@pytest.fixture
+def fake_images_api():
+    """Base URL of a local fake OpenAI Images API answering after 0.2 seconds."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+    from bench_image_server import start_fake_images_api
+
+    server, url = start_fake_images_api(0.2)
+    yield url
+    server.shutdown()
@@ -0,0 +1,92 @@
+import io
+import json
+import threading
+
+import pytest
+
+from event_stream import EventEmitter, emit_event, events_enabled, set_event_emitter
+from run_outputs import record_tool_usage
+from workspaces import Workspace, set_current_workspace, reset_current_workspace
+
+
+class FlushCountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+
+def read_events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_events_are_flushed_json_lines_with_context():
+    stream = FlushCountingStream()
+    set_event_emitter(EventEmitter(stream, context={"id": "job-1"}))
+    emit_event("progress", stage="crew_started", message="Starting")
+    emit_event("done", success=True)
+
+    events = read_events(stream)
+    assert [event["type"] for event in events] == ["progress", "done"]
+    assert all(event["id"] == "job-1" and event["timestamp"] for event in events)
+    assert events[0]["stage"] == "crew_started"
+    assert stream.flushes == 2
+
+
+def test_emit_without_an_emitter_is_a_no_op():
+    set_event_emitter(None)
+    assert not events_enabled()
+    emit_event("progress", stage="ignored")
+
+
+def test_concurrent_events_keep_whole_lines():
+    stream = io.StringIO()
+    set_event_emitter(EventEmitter(stream))
+
+    def emit_many(worker):
+        for index in range(200):
+            emit_event("tool_call", tool=f"tool-{worker}", index=index, payload="x" * 500)
+
+    threads = [threading.Thread(target=emit_many, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events = read_events(stream)
+    assert len(events) == 800
+    for worker in range(4):
+        indexes = [event["index"] for event in events if event["tool"] == f"tool-{worker}"]
+        assert indexes == list(range(200))
+
+
+def test_tool_calls_are_streamed():
+    stream = io.StringIO()
+    set_event_emitter(EventEmitter(stream))
+    record_tool_usage(None, "web_search", 0.25, True)
+
+    event, = read_events(stream)
+    assert (event["type"], event["tool"], event["duration"], event["success"]) == ("tool_call", "web_search", 0.25, True)
+
+
+def test_written_reports_are_streamed_as_they_are_written():
+    pytest.importorskip("crewai")
+    from research_tools import FileWriteTool
+
+    stream = io.StringIO()
+    set_event_emitter(EventEmitter(stream))
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    try:
+        FileWriteTool()._run("trends.md", "# Trends\n")
+        FileWriteTool()._run("data.json", "{}")
+    finally:
+        reset_current_workspace(token)
+        workspace.release()
+
+    file_events = [event for event in read_events(stream) if event["type"] == "file_ready"]
+    assert [event["filename"] for event in file_events] == ["trends.md"]
+    assert file_events[0]["content"] == "# Trends\n"
+    assert ">Trends</h1>" in file_events[0]["formatted_content"]
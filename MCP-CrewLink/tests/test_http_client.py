@@ -0,0 +1,71 @@
+import asyncio
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from http_client import async_request, close_http_clients, get_async_http_client, get_client_settings
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JsonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    close_http_clients()
+    server.shutdown()
+
+
+def test_loops_of_asyncio_run_share_the_runner_pool(server_url):
+    async def search(query):
+        response = await async_request("GET", f"{server_url}/search", params={"q": query})
+        return response.json()["path"], http_client._async_client
+
+    first_path, first_client = asyncio.run(search("mcp"))
+    second_path, second_client = asyncio.run(search("crewai"))
+
+    assert (first_path, second_path) == ("/search?q=mcp", "/search?q=crewai")
+    # One pooled client, still open after both loops ended
+    assert first_client is second_client
+    assert not second_client.is_closed
+
+    close_http_clients()
+    assert second_client.is_closed and http_client._async_client is None
+
+
+def test_pooled_async_client_is_refused_off_the_runner_loop():
+    async def borrow():
+        return get_async_http_client()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(borrow())
+
+
+def test_missing_h2_is_logged_once(monkeypatch, caplog):
+    monkeypatch.setattr(http_client, "_http2_available", lambda: False)
+    monkeypatch.setattr(http_client, "_http2_warned", False)
+    monkeypatch.setenv("HTTP2_ENABLED", "true")
+
+    with caplog.at_level(logging.WARNING, logger="http_client"):
+        settings = [get_client_settings() for _ in range(3)]
+
+    assert [setting["http2"] for setting in settings] == [False] * 3
+    assert len([record for record in caplog.records if "h2" in record.getMessage()]) == 1
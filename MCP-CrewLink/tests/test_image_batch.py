@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("crewai")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_image_server import FakeImagesHandler  # noqa: E402
+from image_cache import ImageCache  # noqa: E402
+from research_tools import ImageBatchItem, ImageBatchTool, ImageGenerateTool  # noqa: E402
+from workspaces import Workspace, reset_current_workspace, set_current_workspace  # noqa: E402
+
+PROMPT = "A diagram of MCP"
+
+
+@pytest.fixture
+def images_api(monkeypatch):
+    """Fake Images API that records the n of every request."""
+    requests = []
+
+    class RecordingHandler(FakeImagesHandler):
+        response_delay = 0
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            requests.append(json.loads(body or b"{}").get("n") or 1)
+            self.rfile = io.BytesIO(body)
+            super().do_POST()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    yield requests
+    server.shutdown()
+
+
+@pytest.fixture
+def workspace():
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    yield workspace
+    reset_current_workspace(token)
+    workspace.release()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ImageCache(cache_dir=str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+
+def test_variants_are_numbered_and_the_first_shares_the_single_image_cache_entry(workspace):
+    batch_tool = ImageBatchTool(image_tool=ImageGenerateTool())
+
+    [(prompt, path)] = batch_tool._variant_paths(ImageBatchItem(prompt=PROMPT, filename="diagram"))
+    assert (prompt, os.path.basename(path)) == (PROMPT, "diagram.png")
+
+    variants = batch_tool._variant_paths(ImageBatchItem(prompt=PROMPT, filename="diagram", variants=3))
+    assert [prompt for prompt, _ in variants] == [PROMPT, f"{PROMPT} (variant 2)", f"{PROMPT} (variant 3)"]
+    assert [os.path.basename(path) for _, path in variants] == ["diagram_1.png", "diagram_2.png", "diagram_3.png"]
+
+
+def test_batch_reuses_an_image_generated_by_generate_image(workspace, images_api, cache):
+    image_tool = ImageGenerateTool(image_cache=cache)
+    batch_tool = ImageBatchTool(image_tool=image_tool)
+    assert "Successfully" in image_tool._run(PROMPT, "diagram")
+    assert images_api == [1]
+
+    result = batch_tool._run([{"prompt": PROMPT, "filename": "options", "variants": 3}])
+
+    assert "Saved 3 images in images directory (1 served from cache)" in result
+    # dall-e-3 takes one image per request
+    assert images_api == [1, 1, 1]
+    assert sorted(os.listdir(workspace.images_dir)) == ["diagram.png", "options_1.png", "options_2.png", "options_3.png"]
+
+    result = batch_tool._run([{"prompt": PROMPT, "filename": "again", "variants": 3}])
+    assert "(3 served from cache)" in result
+    assert images_api == [1, 1, 1]
+
+
+def test_models_with_n_generate_all_missing_variants_in_one_request(workspace, images_api, cache):
+    image_tool = ImageGenerateTool(image_cache=cache)
+    image_tool.image_model = "gpt-image-1"
+    batch_tool = ImageBatchTool(image_tool=image_tool)
+
+    result = batch_tool._run([
+        {"prompt": PROMPT, "filename": "options", "variants": 4},
+        {"prompt": "A timeline", "filename": "timeline"},
+    ])
+
+    assert "Saved 5 images" in result
+    assert sorted(images_api) == [1, 4]
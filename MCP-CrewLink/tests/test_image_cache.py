@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import image_cache
+from image_cache import ImageCache
+
+REQUEST = ("dall-e-3", "A diagram of MCP", "1024x1024", "standard")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache.time, "time", Clock().time)
+    cache = ImageCache(cache_dir=str(tmp_path / "cache"), max_bytes=10)
+    yield cache
+    cache.close()
+
+
+def blobs(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".png"))
+
+
+def test_hit_places_the_image_at_the_requested_path(cache, tmp_path):
+    cache.store(*REQUEST, b"png-1")
+    dest = tmp_path / "run" / "images" / "diagram.png"
+    dest.parent.mkdir(parents=True)
+    dest.write_bytes(b"stale")
+
+    assert cache.fetch("dall-e-3", "  a diagram  of mcp ", "1024x1024", "standard", str(dest))
+    assert dest.read_bytes() == b"png-1"
+    assert not cache.fetch("dall-e-3", "A diagram of MCP", "1792x1024", "standard", str(tmp_path / "wide.png"))
+    assert not cache.fetch("gpt-image-1", "A diagram of MCP", "1024x1024", "standard", str(tmp_path / "other.png"))
+    assert cache.stats()["image_cache_hits"] == 1
+    assert cache.stats()["image_cache_bytes_served"] == 5
+
+
+def test_identical_images_share_one_blob(cache, tmp_path):
+    cache.store(*REQUEST, b"png-1", dest_path=str(tmp_path / "a.png"))
+    cache.store("dall-e-3", "Another prompt", "1024x1024", "standard", b"png-1")
+
+    assert len(blobs(cache)) == 1
+    assert (tmp_path / "a.png").read_bytes() == b"png-1"
+
+
+def test_least_recently_used_images_are_evicted(cache, tmp_path):
+    cache.store("dall-e-3", "first", "1024x1024", "standard", b"11111")
+    cache.store("dall-e-3", "second", "1024x1024", "standard", b"22222")
+    assert cache.fetch("dall-e-3", "first", "1024x1024", "standard", str(tmp_path / "first.png"))
+    cache.store("dall-e-3", "third", "1024x1024", "standard", b"33333")
+
+    assert cache.fetch("dall-e-3", "first", "1024x1024", "standard", str(tmp_path / "first.png"))
+    assert not cache.fetch("dall-e-3", "second", "1024x1024", "standard", str(tmp_path / "second.png"))
+    assert len(blobs(cache)) == 2
+
+
+def test_removed_blob_is_a_miss(cache, tmp_path):
+    content_hash = cache.store(*REQUEST, b"png-1")
+    os.remove(os.path.join(cache.cache_dir, f"{content_hash}.png"))
+
+    assert not cache.fetch(*REQUEST, str(tmp_path / "diagram.png"))
+    assert cache._db.execute("SELECT COUNT(*) FROM image_cache").fetchone()[0] == 0
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+from event_stream import EventEmitter, set_event_emitter, emit_event
+from image_jobs import ImageJobs, job_output
+from workspaces import Workspace, get_current_workspace, set_current_workspace, reset_current_workspace
+
+
+class Events:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def flush(self):
+        pass
+
+
+def render(path, delay=0.0, started=None):
+    """A fake image job: renders for `delay` seconds, then writes and announces the image."""
+    if started:
+        started.set()
+    time.sleep(delay)
+    with job_output() as keep:
+        if not keep:
+            return "discarded"
+        with open(path, "wb") as f:
+            f.write(b"png")
+        emit_event("image_ready", path=path)
+    return "saved"
+
+
+def test_jobs_write_into_the_submitting_run(tmp_path):
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    jobs = ImageJobs(2)
+    try:
+        handle = jobs.submit(lambda: render(os.path.join(get_current_workspace().images_dir, "a.png")),
+                             paths=[os.path.join(workspace.images_dir, "a.png")])
+    finally:
+        reset_current_workspace(token)
+    results = jobs.wait(5)
+    jobs.close()
+
+    assert handle == "img-1"
+    assert results[0]["status"] == "completed"
+    assert os.listdir(workspace.images_dir) == ["a.png"]
+    workspace.release()
+
+
+def test_jobs_past_the_timeout_discard_their_output(tmp_path):
+    events = Events()
+    set_event_emitter(EventEmitter(events))
+    path = str(tmp_path / "late.png")
+    jobs = ImageJobs(2)
+    jobs.submit(render, path, 0.5, paths=[path])
+
+    results = jobs.wait(0.05)
+    jobs.close()
+    assert results[0]["status"] == "running"
+
+    time.sleep(0.8)
+    assert not os.path.exists(path)
+    assert events.lines == []
+    assert jobs.stats()["image_jobs_discarded"] == 1
+
+
+def test_close_waits_for_images_being_written(tmp_path):
+    path = str(tmp_path / "slow.png")
+    writing = threading.Event()
+
+    def slow_write():
+        with job_output() as keep:
+            assert keep
+            writing.set()
+            time.sleep(0.3)
+            with open(path, "wb") as f:
+                f.write(b"png")
+
+    jobs = ImageJobs(1)
+    jobs.submit(slow_write, paths=[path])
+    writing.wait(5)
+    jobs.close()
+    assert os.path.exists(path)
+
+
+def test_close_cancels_jobs_that_have_not_started(tmp_path):
+    started = threading.Event()
+    jobs = ImageJobs(1)
+    jobs.submit(render, str(tmp_path / "first.png"), 0.3, started, paths=[str(tmp_path / "first.png")])
+    jobs.submit(render, str(tmp_path / "queued.png"), paths=[str(tmp_path / "queued.png")])
+    started.wait(5)
+
+    jobs.wait(0)
+    jobs.close()
+    statuses = {job.handle: job for job in jobs.jobs()}
+    assert statuses["img-2"].future.cancelled()
+    assert statuses["img-2"].status() == "failed"
+    time.sleep(0.5)
+    assert not os.path.exists(tmp_path / "queued.png")
+    assert not os.path.exists(tmp_path / "first.png")
+
+
+def test_output_outside_a_job_is_always_kept():
+    with job_output() as keep:
+        assert keep
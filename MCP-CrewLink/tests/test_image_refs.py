@@ -0,0 +1,64 @@
+import base64
+import hashlib
+
+import pytest
+
+from image_refs import describe_image_ref, file_sha256
+from run_outputs import describe_generated_image
+from workspaces import Workspace, reset_current_workspace, set_current_workspace
+
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "diagram.png"
+    path.write_bytes(PNG)
+    return str(path)
+
+
+def test_hash_matches_the_file_contents(tmp_path, image_path):
+    empty = tmp_path / "empty.png"
+    empty.write_bytes(b"")
+
+    assert file_sha256(image_path) == hashlib.sha256(PNG).hexdigest()
+    assert file_sha256(str(empty)) == hashlib.sha256(b"").hexdigest()
+
+
+def test_reference_carries_no_image_bytes(image_path):
+    ref = describe_image_ref(image_path)
+
+    assert ref == {
+        "filename": "diagram.png",
+        "path": image_path,
+        "size_bytes": len(PNG),
+        "sha256": hashlib.sha256(PNG).hexdigest(),
+    }
+
+
+def test_thumbnail_is_a_small_png_when_pillow_is_installed(image_path):
+    pytest.importorskip("PIL")
+    ref = describe_image_ref(image_path, thumbnail_size=64)
+
+    assert base64.b64decode(ref["thumbnail_base64"]).startswith(b"\x89PNG")
+
+
+def test_output_mode_selects_inline_or_reference(image_path, monkeypatch):
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    try:
+        inline = describe_generated_image(image_path)
+        monkeypatch.setenv("IMAGE_OUTPUT", "ref")
+        ref = describe_generated_image(image_path, run_id="earlier-run")
+    finally:
+        reset_current_workspace(token)
+        workspace.release()
+
+    assert base64.b64decode(inline["base64"]) == PNG
+    assert inline["run_id"] == workspace.run_id
+    assert "base64" not in ref
+    assert ref["sha256"] == hashlib.sha256(PNG).hexdigest()
+    assert ref["run_id"] == "earlier-run"
@@ -0,0 +1,91 @@
+import pytest
+
+import llm_cache
+from llm_cache import LLMCache, LLMCacheMiss, wrap_llm
+
+MESSAGES = [{"role": "system", "content": "You are a researcher."}, {"role": "user", "content": "What is MCP?"}]
+
+
+class FakeLLM:
+    def __init__(self, model="gpt-4o-mini", temperature=0.2):
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+
+    def call(self, messages, tools=None, available_functions=None):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "llm.sqlite3")
+
+
+def cached_llm(path, mode):
+    """A FakeLLM whose calls go through a cache in `mode`; wrap_llm patches the LLM in place."""
+    cache = LLMCache(path=path, mode=mode)
+    return wrap_llm(FakeLLM(), cache), cache
+
+
+def test_key_covers_model_messages_and_parameters():
+    key = LLMCache.make_key("gpt-4o-mini", MESSAGES, {"temperature": 0.2})
+
+    assert key == LLMCache.make_key("gpt-4o-mini", list(MESSAGES), {"temperature": 0.2})
+    assert LLMCache.make_key("gpt-4o-mini", "hi", {}) == LLMCache.make_key(
+        "gpt-4o-mini", [{"role": "user", "content": "hi"}], {})
+    assert key != LLMCache.make_key("gpt-4o", MESSAGES, {"temperature": 0.2})
+    assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES, {"temperature": 0.7})
+    assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES[1:], {"temperature": 0.2})
+
+
+def test_cache_mode_serves_repeated_calls(cache_path):
+    llm, cache = cached_llm(cache_path, "cache")
+
+    assert llm.call(MESSAGES) == "answer 1"
+    assert llm.call(MESSAGES) == "answer 1"
+    assert llm.calls == 1
+    llm.temperature = 0.9
+    assert llm.call(MESSAGES) == "answer 2"
+    stats = cache.stats()
+    assert (stats["llm_cache_hits"], stats["llm_cache_misses"], stats["llm_cache_stores"]) == (1, 2, 2)
+
+
+def test_recorded_run_replays_offline(cache_path, monkeypatch):
+    recorder, _ = cached_llm(cache_path, "record")
+    assert recorder.call(MESSAGES) == "answer 1"
+    # Record mode always calls the LLM and keeps the latest response
+    assert recorder.call(MESSAGES) == "answer 2"
+    assert recorder.calls == 2
+
+    # Replay serves recorded responses long past the TTL and never calls the LLM
+    monkeypatch.setattr(llm_cache.time, "time", lambda: 10 ** 12)
+    replayer, _ = cached_llm(cache_path, "replay")
+    assert replayer.call(MESSAGES) == "answer 2"
+    with pytest.raises(LLMCacheMiss):
+        replayer.call([{"role": "user", "content": "An unrecorded question"}])
+    assert replayer.calls == 0
+
+
+def test_expired_entries_are_called_again(cache_path, monkeypatch):
+    llm, _ = cached_llm(cache_path, "cache")
+    llm.call(MESSAGES)
+    monkeypatch.setattr(llm_cache.time, "time", lambda: 10 ** 12)
+
+    assert llm.call(MESSAGES) == "answer 2"
+
+
+def test_tool_calls_and_empty_responses_are_not_cached(cache_path):
+    llm, cache = cached_llm(cache_path, "cache")
+    llm.call(MESSAGES, tools=[{"name": "web_search"}])
+    llm.call(MESSAGES, tools=[{"name": "web_search"}])
+    assert llm.calls == 2
+
+    assert cache.call(llm, lambda messages: " ", "empty") == " "
+    assert cache.stats()["llm_cache_stores"] == 0
+
+
+def test_invalid_modes_are_rejected(cache_path):
+    for mode in ("off", "sometimes"):
+        with pytest.raises(ValueError):
+            LLMCache(path=cache_path, mode=mode)
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import pytest
+
+import llm_usage
+from llm_usage import LLMUsageRecorder, record_litellm_call, set_usage_recorder
+
+
+@pytest.fixture
+def recorder():
+    recorder = LLMUsageRecorder(prompt_cost_per_1k=1.0, completion_cost_per_1k=2.0)
+    set_usage_recorder(recorder)
+    yield recorder
+    set_usage_recorder(None)
+
+
+def litellm_call(start, end, prompt_tokens=100, completion_tokens=50, call_id=None):
+    kwargs = {"model": "test-model", "litellm_call_id": call_id or str(uuid.uuid4())}
+    response = {"usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}}
+    return kwargs, response, start, end
+
+
+def test_calls_are_charged_to_the_task_running_when_they_started(recorder):
+    recorder.start_task("research_task", at=100.0)
+    recorder.start_task("summary_task", at=200.0)
+    recorder.finish_task("summary_task", at=300.0)
+
+    # The research call's callback arrives after summary_task began
+    record_litellm_call(*litellm_call(150.0, 210.0))
+    record_litellm_call(*litellm_call(250.0, 252.0, prompt_tokens=10, completion_tokens=20))
+
+    tasks = recorder.tasks()
+    assert (tasks["research_task"].prompt_tokens, tasks["research_task"].completion_tokens) == (100, 50)
+    assert (tasks["summary_task"].prompt_tokens, tasks["summary_task"].completion_tokens) == (10, 20)
+    metrics = recorder.metrics()
+    assert metrics["research_task_completion_time"] == 100.0
+    assert metrics["research_task_cost_usd"] == pytest.approx(0.2)
+    assert metrics["summary_task_tokens_per_sec"] == pytest.approx(10.0)
+    assert metrics["llm_total_tokens"] == 180
+    assert metrics["llm_cost_usd"] == pytest.approx(0.25)
+
+
+def test_failed_calls_count_without_tokens(recorder):
+    recorder.start_task("research_task", at=100.0)
+    kwargs, _, start, end = litellm_call(110.0, 111.0)
+    record_litellm_call(kwargs, None, start, end, success=False)
+
+    task = recorder.tasks()["research_task"]
+    assert (task.calls, task.failed_calls, task.prompt_tokens) == (1, 1, 0)
+
+
+def test_one_call_reported_by_both_litellm_hooks_is_counted_once(recorder):
+    recorder.start_task("research_task", at=100.0)
+    call = litellm_call(110.0, 112.0)
+
+    # install_litellm_callback registers log_success_event and async_log_success_event
+    record_litellm_call(*call)
+
+    async def async_hook():
+        record_litellm_call(*call)
+
+    asyncio.run(async_hook())
+    record_litellm_call(*litellm_call(120.0, 121.0))
+
+    metrics = recorder.metrics()
+    assert metrics["llm_calls"] == 2
+    assert metrics["llm_prompt_tokens"] == 200
+
+
+def test_remembered_call_ids_are_bounded(recorder, monkeypatch):
+    monkeypatch.setattr(llm_usage, "_MAX_SEEN_CALLS", 3)
+    for index in range(10):
+        record_litellm_call(*litellm_call(100.0 + index, 101.0 + index))
+
+    assert len(llm_usage._seen_calls) == 3
+    assert recorder.metrics()["llm_calls"] == 10
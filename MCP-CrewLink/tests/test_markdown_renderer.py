@@ -0,0 +1,81 @@
+import re
+
+import markdown_renderer
+from markdown_renderer import render_inline, render_markdown, render_markdown_cached
+
+
+def render(content):
+    """Rendered HTML without the wrapper and the inline styles."""
+    html = re.sub(r' style="[^"]*"', "", render_markdown(content))
+    return html[len("<div>"):-len("</div>")]
+
+
+def test_headers_and_plain_text_headers():
+    assert render("# Title #\n### Details") == "<h1>Title</h1><h3>Details</h3>"
+    assert render("KEY FINDINGS\nSummary:\nplain text") == "<h3>KEY FINDINGS</h3><h3>Summary:</h3><p>plain text</p>"
+    assert render("#hashtag") == "<p>#hashtag</p>"
+
+
+def test_nested_lists():
+    assert render("- a\n  - b\n    1. c\n- d") == (
+        "<ul><li>a<ul><li>b<ol><li>c</li></ol></li></ul></li><li>d</li></ul>"
+    )
+    assert render("3. x\n4. y\n- z") == '<ol start="3"><li>x</li><li>y</li></ol><ul><li>z</li></ul>'
+    # Blank lines between items keep one list; indented lines continue the item
+    assert render("- a\n\n- b\n  more") == "<ul><li>a</li><li>b<br>more</li></ul>"
+
+
+def test_fenced_code_is_kept_verbatim():
+    content = "```python\n# not a header\nx = \"<b>\" & **y**\n```\nafter"
+    assert render(content) == (
+        '<pre><code class="language-python"># not a header\n'
+        "x = &quot;&lt;b&gt;&quot; &amp; **y**</code></pre><p>after</p>"
+    )
+    # An unclosed fence runs to the end of the report
+    assert render("~~~\n- item") == "<pre><code>- item</code></pre>"
+
+
+def test_tables_with_alignment_and_escaped_pipes():
+    content = "| a | b |\n|:--|--:|\n| 1 \\| 2 | **3** |\n\nafter"
+    assert render(content) == (
+        '<table><thead><tr><th>a</th><th>b</th></tr></thead>'
+        "<tbody><tr><td>1 | 2</td><td><strong>3</strong></td></tr></tbody></table><p>after</p>"
+    )
+
+
+def test_report_text_is_escaped():
+    assert render_inline("<script>alert(1)</script> & 'quotes'") == (
+        "&lt;script&gt;alert(1)&lt;/script&gt; &amp; &#x27;quotes&#x27;"
+    )
+    assert render_inline("`<b>` and **bold** and *it*") == (
+        f'<code style="{markdown_renderer.INLINE_CODE_STYLE}">&lt;b&gt;</code> and <strong>bold</strong> and <em>it</em>'
+    )
+    assert render_inline("snake_case_name and 2*3*4") == "snake_case_name and 2*3*4"
+    assert render("> quoted <i>") == "<blockquote>quoted &lt;i&gt;</blockquote>"
+
+
+def link(url, label):
+    return f'<a href="{url}" target="_blank" rel="noopener noreferrer">{label}</a>'
+
+
+def test_links():
+    assert render_inline("See [Foo](https://en.wikipedia.org/wiki/Foo_(bar)).") == (
+        "See " + link("https://en.wikipedia.org/wiki/Foo_(bar)", "Foo") + "."
+    )
+    assert render_inline("[**MCP**](https://modelcontextprotocol.io?a=1&b=2)") == (
+        link("https://modelcontextprotocol.io?a=1&amp;b=2", "<strong>MCP</strong>")
+    )
+    assert render_inline("[x](javascript:alert(1))") == "[x](javascript:alert(1))"
+    assert render_inline("[a](https://a.example) [b](/b)") == (
+        link("https://a.example", "a") + " " + link("/b", "b")
+    )
+
+
+def test_cache_size_is_read_when_rendering(monkeypatch):
+    monkeypatch.setattr(markdown_renderer, "_render_cache", type(markdown_renderer._render_cache)())
+    monkeypatch.setenv("MARKDOWN_CACHE_SIZE", "2")
+    for index in range(5):
+        render_markdown_cached(f"# Report {index}")
+
+    assert len(markdown_renderer._render_cache) == 2
+    assert render_markdown_cached("# Report 4") == render_markdown("# Report 4")
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from workspaces import Workspace, set_current_workspace, reset_current_workspace, get_workspaces_root
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_creates_no_directories(tmp_path):
+    root = tmp_path / "not-yet"
+    subprocess.run(
+        [sys.executable, "-c", "import mcp_sessions"],
+        cwd=PROJECT_DIR, env=dict(os.environ, WORKSPACES_DIR=str(root)), check=True,
+    )
+    assert not root.exists()
+
+
+def test_server_keeps_stdout_for_the_protocol():
+    pytest.importorskip("mcp")
+    server = subprocess.run(
+        [sys.executable, os.path.join(PROJECT_DIR, "servers", "image_server.py")],
+        stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60,
+    )
+    assert server.stdout == ""
+    assert "running on stdio" in server.stderr
+
+
+def test_server_configs_use_settings_loaded_after_import(monkeypatch, tmp_path):
+    from mcp_sessions import mcp_servers
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert "OPENAI_API_KEY" not in mcp_servers()["image"]["env"]
+
+    # As load_dotenv() in main.py does after the project modules are imported
+    monkeypatch.setenv("OPENAI_API_KEY", "from-dotenv")
+    monkeypatch.setenv("WORKSPACES_DIR", str(tmp_path / "dotenv-root"))
+    servers = mcp_servers()
+    env = servers["image"]["env"]
+    assert env["OPENAI_API_KEY"] == "from-dotenv"
+    assert env["WORKSPACES_DIR"] == str(tmp_path / "dotenv-root")
+    assert None not in env.values()
+    assert servers["filesystem"]["args"][-1] == str(tmp_path / "dotenv-root")
+
+
+def test_run_arguments_point_at_the_run_workspace():
+    from mcp_sessions import run_arguments
+
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    try:
+        assert run_arguments("image") == {"output_dir": workspace.images_dir}
+        assert run_arguments("filesystem") == {}
+    finally:
+        reset_current_workspace(token)
+        workspace.release()
+
+
+def test_image_server_writes_into_the_calling_run(tmp_path, fake_images_api):
+    pytest.importorskip("mcp")
+    from mcp_sessions import MCPSessionManager, result_text
+
+    manager = MCPSessionManager(servers={"image": {
+        "command": sys.executable,
+        "args": [os.path.join(PROJECT_DIR, "servers", "image_server.py")],
+        "env": {
+            "OPENAI_API_KEY": "test",
+            "OPENAI_BASE_URL": fake_images_api,
+            "IMAGE_CACHE_ENABLED": "false",
+            "WORKSPACES_DIR": get_workspaces_root(),
+            "IMAGE_SERVER_OUTPUT_DIR": str(tmp_path / "shared"),
+        },
+    }})
+    first, second = Workspace().create(), Workspace().create()
+    try:
+        for workspace in (first, second):
+            result = json.loads(result_text(manager.call_tool("image", "image_creation_openai", {
+                "query": "a diagram", "image_name": "diagram", "output_dir": workspace.images_dir,
+            })))
+            assert result["success"], result
+            assert result["file_path"] == os.path.join(workspace.images_dir, "diagram.png")
+        assert os.listdir(first.images_dir) == os.listdir(second.images_dir) == ["diagram.png"]
+        assert not (tmp_path / "shared").exists()
+
+        # The server only writes under WORKSPACES_DIR
+        result = json.loads(result_text(manager.call_tool("image", "image_creation_openai", {
+            "query": "a diagram", "image_name": "escape", "output_dir": str(tmp_path),
+        })))
+        assert not result["success"]
+        assert not (tmp_path / "escape.png").exists()
+    finally:
+        manager.close()
+        first.release()
+        second.release()
+
+
+def image_server_manager(images_api, output_dir, **settings):
+    from mcp_sessions import MCPSessionManager
+
+    return MCPSessionManager(servers={"image": {
+        "command": sys.executable,
+        "args": [os.path.join(PROJECT_DIR, "servers", "image_server.py")],
+        "env": dict({
+            "OPENAI_API_KEY": "test",
+            "OPENAI_BASE_URL": images_api,
+            "IMAGE_CACHE_ENABLED": "false",
+            "IMAGE_SERVER_OUTPUT_DIR": output_dir,
+        }, **settings),
+    }})
+
+
+def generate_concurrently(manager, count):
+    """Send count generations at once over the one session; returns their results and the elapsed time."""
+    from mcp_sessions import result_text
+
+    async def generate_all():
+        return await asyncio.gather(*(
+            manager.acall_tool("image", "image_creation_openai", {"query": f"image {i}", "image_name": f"image_{i}"})
+            for i in range(count)
+        ))
+
+    start_time = time.perf_counter()
+    results = asyncio.run(generate_all())
+    return [json.loads(result_text(result)) for result in results], time.perf_counter() - start_time
+
+
+def test_concurrent_calls_overlap_their_api_requests(tmp_path, fake_images_api):
+    pytest.importorskip("mcp")
+    manager = image_server_manager(fake_images_api, str(tmp_path), IMAGE_SERVER_CONCURRENCY="4")
+    try:
+        generate_concurrently(manager, 1)
+        results, elapsed = generate_concurrently(manager, 4)
+    finally:
+        manager.close()
+
+    assert all(result["success"] for result in results), results
+    assert sorted(os.listdir(tmp_path)) == [f"image_{i}.png" for i in range(4)]
+    # Each request takes 0.2 seconds; one at a time they would need 0.8
+    assert elapsed < 0.6
+
+
+def test_calls_beyond_the_queue_limit_are_refused(tmp_path, fake_images_api):
+    pytest.importorskip("mcp")
+    manager = image_server_manager(fake_images_api, str(tmp_path),
+                                   IMAGE_SERVER_CONCURRENCY="1", IMAGE_SERVER_MAX_QUEUE="1")
+    try:
+        results, _ = generate_concurrently(manager, 3)
+    finally:
+        manager.close()
+
+    assert sum(result["success"] for result in results) == 2
+    [refused] = [result for result in results if not result["success"]]
+    assert "busy" in refused["error"]
@@ -0,0 +1,59 @@
+import pytest
+
+from metrics_sinks import JsonlSink, MetricsSink, SqliteSink, read_local_metrics
+from wandb_tracker import WandBTracker
+
+
+class ListSink(MetricsSink):
+    name = "list"
+
+    def __init__(self):
+        self.entries = []
+
+    def log(self, metrics, step=None):
+        self.entries.append((metrics, step))
+
+
+def test_sink_without_log_cannot_be_created():
+    class NoLogSink(MetricsSink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoLogSink()
+    with pytest.raises(TypeError):
+        MetricsSink()
+
+
+def test_tracker_logs_to_a_custom_sink():
+    sink = ListSink()
+    tracker = WandBTracker(buffered=False, sink=sink)
+    tracker.log_metrics({"tool_calls": 1}, step=3)
+
+    assert tracker.sink is sink
+    assert sink.entries == [({"tool_calls": 1}, 3)]
+
+
+def test_jsonl_rotation_keeps_every_file_replayable(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    sink = JsonlSink(path, "project", run_id="run-1", max_bytes=400, backups=5)
+    for step in range(10):
+        sink.log({"value": step}, step=step)
+    sink.close()
+
+    records = list(read_local_metrics(path))
+    assert [record["step"] for record in records if record["type"] == "metrics"] == list(range(10))
+    assert (tmp_path / "metrics.jsonl.1").exists()
+    with open(f"{path}.1", encoding="utf-8") as f:
+        assert '"type": "run"' in f.readline()
+
+
+def test_sqlite_sink_round_trips_and_rotates(tmp_path):
+    path = str(tmp_path / "metrics.sqlite3")
+    sink = SqliteSink(path, "project", config={"model": "gpt"}, run_id="run-1", max_rows=3)
+    for step in range(5):
+        sink.log({"value": step}, step=step)
+    sink.close()
+
+    records = list(read_local_metrics(path))
+    assert records[0]["type"] == "run" and records[0]["config"] == {"model": "gpt"}
+    assert [record["metrics"]["value"] for record in records[1:]] == [2, 3, 4]
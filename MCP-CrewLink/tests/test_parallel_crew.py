@@ -0,0 +1,81 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+import main  # noqa: E402
+from research_tools import FileWriteTool, ImageGenerateTool, bind_workspace  # noqa: E402
+from workspaces import Workspace, set_current_workspace, reset_current_workspace  # noqa: E402
+
+
+@pytest.fixture
+def workspace():
+    workspace = Workspace().create()
+    token = set_current_workspace(workspace)
+    yield workspace
+    reset_current_workspace(token)
+    workspace.release()
+
+
+def on_plain_thread(fn, *args):
+    """Call fn like CrewAI versions that run async tasks on a threading.Thread without the caller's context."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fn(*args)))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_bound_tools_write_into_the_run_workspace(workspace, fake_images_api, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", fake_images_api)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("IMAGE_CACHE_ENABLED", "false")
+    write_tool, image_tool = bind_workspace([FileWriteTool(), ImageGenerateTool()], workspace)
+
+    assert "Successfully" in on_plain_thread(write_tool._run, "trends.md", "# Trends\n")
+    assert "Successfully" in on_plain_thread(image_tool._run, "a diagram", "diagram")
+    assert os.listdir(workspace.files_dir) == ["trends.md"]
+    assert os.listdir(workspace.images_dir) == ["diagram.png"]
+
+
+def test_parallel_crew_tools_are_bound_to_the_run(workspace, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    tools = main.initialize_tools_with_tracking()
+    crew, research_tasks, summary_task = main.build_research_crew(
+        "Model Context Protocol", "How does MCP work?", tools, crew_mode="parallel"
+    )
+
+    assert len(research_tasks) == len(main.RESEARCH_ASPECTS)
+    assert all(task.async_execution for task in research_tasks)
+    writing_tools = [
+        tool for agent in crew.agents for tool in agent.tools
+        if tool.name in ("write_file", "generate_image", "generate_images")
+    ]
+    assert writing_tools
+    assert all(tool.workspace is workspace for tool in writing_tools)
+    # The shared tools of a resident worker stay unbound
+    assert all(getattr(tool, "workspace", None) is None for tool in tools)
+
+
+@pytest.mark.parametrize("mode", ["parallel", "findings"])
+def test_single_research_task_is_only_built_for_the_sequential_crew(workspace, mode, monkeypatch):
+    import crewai
+
+    descriptions = []
+
+    class RecordingTask(crewai.Task):
+        def __init__(self, **kwargs):
+            descriptions.append(kwargs["description"])
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(crewai, "Task", RecordingTask)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    tools = main.initialize_tools_with_tracking()
+    findings = {"notes": "MCP connects tools.", "sources": [], "images": []} if mode == "findings" else None
+    main.build_research_crew("Model Context Protocol", "How does MCP work?", tools,
+                             findings=findings, crew_mode="parallel" if mode == "parallel" else None)
+
+    assert descriptions
+    assert not any(d.startswith("Conduct comprehensive research") for d in descriptions)
@@ -0,0 +1,61 @@
+import multiprocessing
+
+import pytest
+
+import rate_limits
+from rate_limits import RateLimiter, create_rate_limiters, install_rate_limiters, llm_max_rpm
+
+
+@pytest.fixture(autouse=True)
+def process_limiters(monkeypatch):
+    monkeypatch.setattr(rate_limits, "_rate_limiters", None)
+    monkeypatch.setattr(rate_limits, "_llm_share", 1)
+
+
+def test_waiting_callers_are_spaced_evenly():
+    limiter = RateLimiter("brave", 60, burst=2)
+    waits = [limiter.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(1.0, abs=0.05)
+    assert waits[3] == pytest.approx(2.0, abs=0.05)
+    stats = limiter.stats()
+    assert stats["rate_limit_brave_waits"] == 2
+    assert stats["rate_limit_brave_wait_time"] == pytest.approx(3.0, abs=0.1)
+
+
+def test_zero_limit_never_waits():
+    limiter = RateLimiter("openai_images", 0)
+    assert not limiter.enabled
+    assert [limiter.acquire() for _ in range(10)] == [0.0] * 10
+
+
+def test_limit_is_shared_with_worker_processes():
+    context = multiprocessing.get_context("spawn")
+    limiter = RateLimiter("brave", 60, context=context)
+    worker = context.Process(target=limiter.reserve)
+    worker.start()
+    worker.join(30)
+    assert worker.exitcode == 0
+
+    # The worker took the only token
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.1)
+
+
+def test_limits_come_from_arguments_or_the_environment(monkeypatch):
+    monkeypatch.setenv("BRAVE_REQUESTS_PER_MINUTE", "30")
+    monkeypatch.setenv("OPENAI_IMAGES_PER_MINUTE", "5")
+    limiters = create_rate_limiters({"openai_images": 10, "brave": None})
+
+    assert limiters["brave"].rate == pytest.approx(0.5)
+    assert limiters["openai_images"].rate == pytest.approx(10 / 60)
+
+
+def test_llm_limit_is_split_across_processes(monkeypatch):
+    assert llm_max_rpm() is None
+    monkeypatch.setenv("LLM_REQUESTS_PER_MINUTE", "10")
+    assert llm_max_rpm() == 10
+    install_rate_limiters(create_rate_limiters(), llm_share=4)
+    assert llm_max_rpm() == 2
+    install_rate_limiters(create_rate_limiters(), llm_share=20)
+    assert llm_max_rpm() == 1
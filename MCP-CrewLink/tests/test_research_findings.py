@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from research_findings import (collect_findings, find_latest_findings, load_findings, render_findings,
+                               resolve_findings, reuse_images, save_findings)
+from search_aggregator import estimate_tokens
+from workspaces import Workspace
+
+SOURCES = [
+    {"url": f"https://example.com/{index}", "title": f"Source {index}", "description": "d" * 200, "score": 1}
+    for index in range(20)
+]
+
+
+def saved_run(topic="Model Context Protocol", query="How does MCP work?", notes="MCP connects tools.", images=()):
+    workspace = Workspace().create()
+    image_paths = []
+    for filename in images:
+        path = os.path.join(workspace.images_dir, filename)
+        with open(path, "wb") as f:
+            f.write(b"png")
+        image_paths.append(path)
+    findings = collect_findings(workspace, topic, query, notes, SOURCES[:2], image_paths)
+    save_findings(workspace, findings)
+    workspace.release()
+    return workspace, findings
+
+
+def test_saved_findings_load_by_run_id():
+    workspace, findings = saved_run(images=["diagram.png"])
+
+    loaded = load_findings(workspace.run_id)
+    assert loaded == findings
+    assert loaded["images"] == ["diagram.png"]
+    assert set(loaded["sources"][0]) == {"url", "title", "description"}
+    with pytest.raises(ValueError):
+        load_findings("../elsewhere")
+    with pytest.raises(FileNotFoundError):
+        load_findings("no-such-run")
+
+
+def test_latest_findings_match_the_topic_and_query():
+    older, _ = saved_run(notes="older")
+    newer, _ = saved_run(notes="newer")
+    other, _ = saved_run(topic="Vector databases")
+    os.utime(os.path.join(older.path, "findings.json"), (1, 1))
+
+    assert find_latest_findings("model context protocol")["run_id"] == newer.run_id
+    assert find_latest_findings("Model Context Protocol", "something else") is None
+    assert resolve_findings("latest", "Vector Databases")["run_id"] == other.run_id
+    assert resolve_findings(older.run_id, "ignored")["notes"] == "older"
+    with pytest.raises(FileNotFoundError):
+        resolve_findings(True, "Quantum computing")
+
+
+def test_rendering_keeps_long_notes_within_the_budget():
+    findings = {"notes": "A finding about MCP.\n" * 2000, "sources": SOURCES, "images": []}
+
+    prompt = render_findings(findings, token_budget=1000)
+    assert estimate_tokens(prompt) <= 1000
+    assert "[... notes truncated]" in prompt
+    # The sources still get the rest of the budget
+    assert "- [Source 0](https://example.com/0)" in prompt
+
+
+def test_rendering_stops_at_the_first_source_over_budget():
+    findings = {"notes": "Short notes.", "sources": [dict(SOURCES[0], description="d" * 4000)], "images": []}
+
+    prompt = render_findings(findings, token_budget=500)
+    assert "Sources:" not in prompt
+    assert estimate_tokens(prompt) <= 500
+
+
+def test_rendering_lists_sources_in_order_until_the_budget_is_used():
+    findings = {"notes": "Short notes.", "sources": SOURCES, "images": ["diagram.png"]}
+
+    prompt = render_findings(findings, token_budget=300)
+    assert "Source 0" in prompt and "Source 3" in prompt and "Source 5" not in prompt
+    assert prompt.endswith("Images already generated (in the images directory): diagram.png")
+
+
+def test_images_of_the_findings_run_are_reused():
+    workspace, findings = saved_run(images=["diagram.png", "missing.png"])
+    os.remove(os.path.join(workspace.images_dir, "missing.png"))
+    report_run = Workspace().create()
+
+    paths = reuse_images(findings, report_run.images_dir)
+    assert paths == [os.path.join(report_run.images_dir, "diagram.png")]
+    assert os.listdir(report_run.images_dir) == ["diagram.png"]
+    # Reusing twice is harmless
+    assert reuse_images(findings, report_run.images_dir) == paths
+    report_run.release()
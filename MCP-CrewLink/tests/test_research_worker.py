@@ -0,0 +1,102 @@
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+import main
+from wandb_tracker import WandBTracker
+
+
+@pytest.fixture
+def worker():
+    worker = main.ResearchWorker(tracker=WandBTracker(auto_init=False), tools=[], llm=None, start_janitor=False)
+    yield worker
+    worker.close()
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 characters, too short for pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix="worker-")
+    yield os.path.join(directory, "worker.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def serve_in_background(worker, socket_path):
+    thread = threading.Thread(target=worker.serve_socket, args=(socket_path,), daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while True:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+                return thread
+            except OSError:
+                assert time.time() < deadline, "worker did not start listening"
+                time.sleep(0.01)
+
+
+def exchange(socket_path, *lines):
+    """Send job lines over one connection and read one response line per job."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(5)
+        client.connect(socket_path)
+        client.sendall("".join(line + "\n" for line in lines).encode("utf-8"))
+        reader = client.makefile("r", encoding="utf-8")
+        return [json.loads(reader.readline()) for _ in lines]
+
+
+def test_each_job_line_gets_one_response_on_the_same_connection(worker, socket_path):
+    thread = serve_in_background(worker, socket_path)
+
+    ping, invalid, invalidate = exchange(
+        socket_path, json.dumps({"id": "job-1", "op": "ping"}), "not json", json.dumps({"id": "job-2", "op": "invalidate"})
+    )
+
+    assert ping == {"id": "job-1", "success": True, "op": "ping", "jobs_completed": 0}
+    assert not invalid["success"] and invalid["error"].startswith("Invalid job")
+    assert invalidate["id"] == "job-2" and invalidate["success"]
+
+    [shutdown] = exchange(socket_path, json.dumps({"id": "job-3", "op": "shutdown"}))
+    assert shutdown["op"] == "shutdown"
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+
+def test_stale_socket_file_is_replaced(worker, socket_path):
+    open(socket_path, "w").close()
+    thread = serve_in_background(worker, socket_path)
+
+    assert exchange(socket_path, json.dumps({"op": "ping"}))[0]["success"]
+    exchange(socket_path, json.dumps({"op": "shutdown"}))
+    thread.join(5)
+
+
+def test_dry_run_job_builds_the_crew_without_running_it(worker, socket_path, monkeypatch):
+    pytest.importorskip("crewai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    thread = serve_in_background(worker, socket_path)
+
+    [response] = exchange(socket_path, json.dumps({"id": "job-1", "topic": "MCP", "query": "How?", "dry_run": True}))
+    assert response["success"] and response["dry_run"] and response["id"] == "job-1"
+    assert response["research_topic"] == "MCP"
+    exchange(socket_path, json.dumps({"op": "shutdown"}))
+    thread.join(5)
+
+
+def test_stdio_worker_writes_only_response_lines(worker):
+    stdin = io.StringIO("\n".join([json.dumps({"id": "a", "op": "ping"}), "{", json.dumps({"op": "shutdown"}),
+                                   json.dumps({"id": "ignored", "op": "ping"})]) + "\n")
+    stdout = io.StringIO()
+    worker.serve_stdio(stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [response.get("id") for response in responses] == ["a", None, None]
+    assert [response.get("op") for response in responses] == ["ping", None, "shutdown"]
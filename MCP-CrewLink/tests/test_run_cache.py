@@ -0,0 +1,100 @@
+import io
+import json
+import os
+
+import pytest
+
+import main
+from event_stream import EventEmitter, set_event_emitter
+from run_cache import RunCache, run_config_from_env
+from workspaces import Workspace, set_current_workspace, reset_current_workspace
+
+TOPIC = "Model Context Protocol"
+QUERY = "How does MCP work?"
+
+
+@pytest.fixture
+def run_cache(tmp_path, monkeypatch):
+    cache = RunCache(path=str(tmp_path / "runs.sqlite3"))
+    monkeypatch.setattr(main, "get_run_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+
+def finished_run(workspace):
+    """Output of a run that wrote one report and one image, collected like _run_research_in_workspace does."""
+    with open(os.path.join(workspace.files_dir, "report.md"), "w", encoding="utf-8") as f:
+        f.write("# Report\n\n- finding\n")
+    with open(os.path.join(workspace.images_dir, "diagram.png"), "wb") as f:
+        f.write(b"\x89PNG fake")
+    output_data = {
+        "success": True, "run_id": workspace.run_id, "research_topic": TOPIC, "research_query": QUERY,
+        "crew_result": "done", "execution_time": 1.0, "files_generated": [], "images_generated": [],
+    }
+    token = set_current_workspace(workspace)
+    try:
+        return main.collect_generated_outputs(output_data)
+    finally:
+        reset_current_workspace(token)
+
+
+def read_events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_key_covers_run_configuration(run_cache, monkeypatch):
+    run_cache.set(TOPIC, QUERY, {"success": True}, run_config_from_env())
+
+    assert run_cache.get(TOPIC.upper(), f"  {QUERY} ", run_config_from_env()) is not None
+    assert run_cache.get(TOPIC, QUERY, run_config_from_env("parallel")) is None
+    monkeypatch.setenv("IMAGE_OUTPUT", "ref")
+    assert run_cache.get(TOPIC, QUERY, run_config_from_env()) is None
+    monkeypatch.delenv("IMAGE_OUTPUT")
+    set_event_emitter(EventEmitter(io.StringIO()))
+    assert run_cache.get(TOPIC, QUERY, run_config_from_env()) is None
+
+
+def test_events_mode_run_round_trips(run_cache):
+    workspace = Workspace().create()
+    set_event_emitter(EventEmitter(io.StringIO()))
+    output_data = finished_run(workspace)
+    workspace.release()
+    # Events mode stores references only; contents went out as events
+    assert "content" not in output_data["files_generated"][0]
+    run_cache.set(TOPIC, QUERY, output_data, run_config_from_env())
+
+    # A retry in events mode streams the report and image again
+    stream = io.StringIO()
+    set_event_emitter(EventEmitter(stream))
+    cached = main.cached_run_output(TOPIC, QUERY)
+    assert cached["run_cache"]["hit"] is True
+    events = {event["type"]: event for event in read_events(stream)}
+    assert events["file_ready"]["content"] == "# Report\n\n- finding\n"
+    assert ">Report</h1>" in events["file_ready"]["formatted_content"]
+    assert events["image_ready"]["filename"] == "diagram.png"
+    assert events["image_ready"]["run_id"] == workspace.run_id
+    assert events["image_ready"]["base64"]
+
+    # A normal run never gets the events-mode payload, which has no contents
+    set_event_emitter(None)
+    assert main.cached_run_output(TOPIC, QUERY) is None
+
+
+def test_normal_run_replays_contents(run_cache, capsys):
+    workspace = Workspace().create()
+    run_cache.set(TOPIC, QUERY, finished_run(workspace), run_config_from_env())
+    workspace.release()
+
+    cached = main.cached_run_output(TOPIC, QUERY)
+    main.print_research_summary(cached)
+    assert "# Report" in capsys.readouterr().out
+
+
+def test_removed_outputs_drop_the_entry(run_cache):
+    workspace = Workspace().create()
+    output_data = finished_run(workspace)
+    run_cache.set(TOPIC, QUERY, output_data, run_config_from_env())
+    os.remove(output_data["images_generated"][0]["path"])
+
+    assert main.cached_run_output(TOPIC, QUERY) is None
+    assert run_cache.stats()["run_cache_misses"] == 1
@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+
+import pytest
+
+from scheduler import ResearchScheduler
+
+
+class FakePool:
+    """Stands in for the process pool; the test finishes each dispatched job by hand."""
+
+    def __init__(self):
+        self.dispatched = []
+
+    def submit(self, fn, job):
+        future = Future()
+        self.dispatched.append((job, future))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def scheduler():
+    results = []
+    scheduler = ResearchScheduler(processes=2, rate_limits={"brave": 0, "openai_images": 0}, on_result=results.append)
+    scheduler._executor.shutdown()
+    scheduler._executor = pool = FakePool()
+    scheduler.results = results
+    yield scheduler, pool
+
+
+def test_jobs_wait_in_the_queue_for_a_free_process(scheduler):
+    scheduler, pool = scheduler
+    futures = [scheduler.submit({"topic": f"topic {index}", "query": "q"}) for index in range(3)]
+
+    assert [job["id"] for job, _ in pool.dispatched] == ["job-1", "job-2"]
+    assert scheduler.stats()["scheduler_queue_depth"] == 1
+
+    pool.dispatched[0][1].set_result({"id": "job-1", "success": True})
+    assert [job["id"] for job, _ in pool.dispatched] == ["job-1", "job-2", "job-3"]
+    assert futures[0].result(0)["queue_wait_time"] >= 0
+
+    pool.dispatched[1][1].set_result({"id": "job-2", "success": True})
+    pool.dispatched[2][1].set_result({"id": "job-3", "success": True})
+    scheduler.wait()
+
+    stats = scheduler.stats()
+    assert stats["scheduler_jobs_completed"] == 3
+    assert stats["scheduler_in_flight"] == 0
+    assert [result["id"] for result in scheduler.results] == ["job-1", "job-2", "job-3"]
+    assert "rate_limit_brave_waits" in stats
+
+
+def test_a_dead_worker_fails_only_its_job(scheduler):
+    scheduler, pool = scheduler
+    future = scheduler.submit({"id": "crashed", "topic": "t", "query": "q"})
+    pool.dispatched[0][1].set_exception(RuntimeError("process terminated"))
+
+    result = future.result(0)
+    assert result["id"] == "crashed"
+    assert result["success"] is False
+    assert "process terminated" in result["error"]
+    assert scheduler.stats()["scheduler_jobs_failed"] == 1
@@ -0,0 +1,52 @@
+from search_aggregator import SearchAggregator, canonicalize_url
+
+
+def result(url, title="Page", description="Snippet"):
+    return {"url": url, "title": title, "description": description}
+
+
+def test_canonical_url_drops_tracking_and_cosmetic_differences():
+    assert canonicalize_url("HTTPS://WWW.Example.com/docs/?utm_source=x&b=2&a=1&fbclid=y#intro") \
+        == "https://example.com/docs?a=1&b=2"
+    assert canonicalize_url("https://example.com/docs?q=mcp") != canonicalize_url("https://example.com/docs?q=a2a")
+    assert canonicalize_url("not a url") == "not a url"
+
+
+def test_same_page_from_two_queries_is_kept_once_with_the_longer_snippet():
+    aggregator = SearchAggregator()
+    aggregator.add("what is mcp", [result("https://www.example.com/mcp/", description="short")])
+    aggregator.add("mcp servers", [result("https://example.com/mcp?utm_medium=feed", description="a longer snippet")])
+
+    [entry] = aggregator.top()
+    assert entry["url"] == "https://www.example.com/mcp/"
+    assert entry["description"] == "a longer snippet"
+    assert entry["queries"] == ["what is mcp", "mcp servers"]
+    assert aggregator.stats()["search_unique_results"] == 1
+
+
+def test_pages_found_repeatedly_and_near_the_top_rank_first():
+    aggregator = SearchAggregator()
+    aggregator.add("q1", [result("https://a.example"), result("https://b.example"), result("https://c.example")])
+    aggregator.add("q2", [result("https://d.example"), result("https://c.example")])
+
+    # c is never first but is found twice: 1/3 + 1/2 beats b's 1/2
+    assert [entry["url"] for entry in aggregator.top()] == [
+        "https://a.example", "https://d.example", "https://c.example", "https://b.example"
+    ]
+    assert [entry["url"] for entry in aggregator.top(1)] == ["https://a.example"]
+
+
+def test_digest_skips_pages_already_shown_and_respects_the_budget():
+    aggregator = SearchAggregator()
+    first = aggregator.add("q1", [result(f"https://example.com/{index}", description="d" * 200) for index in range(5)])
+
+    digest = aggregator.digest(first, token_budget=120)
+    assert "https://example.com/0" in digest
+    assert "https://example.com/4" not in digest
+    assert "lower-ranked result(s) were omitted" in digest
+
+    second = aggregator.add("q2", [result("https://example.com/0"), result("https://example.com/new")])
+    digest = aggregator.digest(second)
+    assert "https://example.com/new" in digest
+    assert "URL: https://example.com/0" not in digest
+    assert "1 result(s) already returned by earlier searches were omitted." in digest
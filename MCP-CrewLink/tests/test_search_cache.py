@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+import search_cache
+from search_cache import SearchCache, normalize_query
+
+PAYLOAD = {"web": {"results": [{"url": "https://modelcontextprotocol.io", "title": "MCP"}]}}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite3"), ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_near_identical_queries_share_an_entry(cache):
+    assert normalize_query('  "Model   Context Protocol?" ') == "model context protocol"
+    cache.set("Model Context Protocol", 10, PAYLOAD)
+
+    assert cache.get("model  context protocol.", 10) == PAYLOAD
+    assert cache.get("Model Context Protocol", 5) is None
+    assert cache.stats() == {"search_cache_hits": 1, "search_cache_misses": 1, "search_cache_hit_rate": 0.5}
+
+
+def test_entries_expire_in_both_tiers(cache, clock):
+    cache.set("mcp", 10, PAYLOAD)
+    clock.now += 59
+    assert cache.get("mcp", 10) == PAYLOAD
+
+    clock.now += 2
+    assert cache.get("mcp", 10) is None
+    assert cache._db.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0] == 0
+
+
+def test_disk_tier_is_shared_across_instances(cache, tmp_path):
+    cache.set("mcp", 10, PAYLOAD)
+    other = SearchCache(path=cache.path, ttl=60)
+    try:
+        assert other.get("mcp", 10) == PAYLOAD
+    finally:
+        other.close()
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, clock):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite3"), max_memory_entries=1, max_disk_entries=2)
+    try:
+        cache.set("first", 10, PAYLOAD)
+        clock.now += 1
+        cache.set("second", 10, PAYLOAD)
+        clock.now += 1
+        # Served from disk: the memory tier only holds "second"
+        assert cache.get("first", 10) == PAYLOAD
+        clock.now += 1
+        cache.set("third", 10, PAYLOAD)
+
+        keys = {row[0] for row in cache._db.execute("SELECT key FROM search_cache")}
+        assert keys == {"10:first", "10:third"}
+    finally:
+        cache.close()
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return PAYLOAD
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, params=None):
+        self.requests.append(params["q"])
+        return FakeResponse()
+
+
+def test_search_tool_answers_repeats_from_the_cache(cache, monkeypatch):
+    pytest.importorskip("crewai")
+    from research_tools import WebSearchTool
+
+    monkeypatch.setenv("BRAVE_API_KEY", "test")
+    http_client = FakeHttpClient()
+    tool = WebSearchTool(http_client=http_client, search_cache=cache)
+
+    assert tool.search("Model Context Protocol") == (PAYLOAD, False)
+    assert tool.search("model context protocol") == (PAYLOAD, True)
+    assert tool.search("model context protocol", fresh=True) == (PAYLOAD, False)
+    assert http_client.requests == ["Model Context Protocol", "model context protocol"]
+
+
+class FakeAsyncHttpClient(FakeHttpClient):
+    async def get(self, url, headers=None, params=None):
+        return super().get(url, headers=headers, params=params)
+
+
+@pytest.mark.parametrize("client_class", [FakeHttpClient, FakeAsyncHttpClient])
+def test_async_search_uses_the_injected_client(cache, monkeypatch, client_class):
+    pytest.importorskip("crewai")
+    from research_tools import WebSearchTool
+
+    monkeypatch.setenv("BRAVE_API_KEY", "test")
+    http_client = client_class()
+    tool = WebSearchTool(http_client=http_client, search_cache=cache)
+
+    assert asyncio.run(tool.asearch("Model Context Protocol")) == (PAYLOAD, False)
+    assert asyncio.run(tool.asearch("model context protocol")) == (PAYLOAD, True)
+    assert http_client.requests == ["Model Context Protocol"]
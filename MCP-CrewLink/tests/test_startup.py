@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+import startup
+from startup import DEFERRED_MODULES, _parse_import_times, measure_startup
+
+
+def test_importing_main_leaves_heavy_modules_for_first_use():
+    script = ("import json, sys, main; "
+              f"print(json.dumps([name for name in {list(DEFERRED_MODULES)!r} if name in sys.modules]))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=startup.PROJECT_DIR,
+                            capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.splitlines()[-1]) == []
+
+
+def test_import_times_are_summed_per_top_level_package():
+    lines = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       200 |        200 |   openai._types",
+        "import time:      1000 |       1200 | openai",
+        "import time:       500 |        500 | json",
+        "missing crewai: No module named 'crewai'",
+    ]
+
+    total, packages = _parse_import_times(lines)
+    assert total == 1.7
+    assert packages == {"openai": 1.2, "json": 0.5}
+
+
+def test_startup_profile_separates_main_from_deferred_imports():
+    profile = measure_startup(deferred=["json", "not_a_real_module"])
+
+    assert profile["main_import_ms"] > 0
+    assert "main" in profile["main_packages"]
+    assert profile["missing"] and profile["missing"][0].startswith("not_a_real_module:")
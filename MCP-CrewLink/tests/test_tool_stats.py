@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from tool_stats import LatencyHistogram, ToolStats
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantiles_stay_within_the_relative_accuracy(q):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-2, 1.5) for _ in range(5000)]
+    histogram = LatencyHistogram(relative_accuracy=0.01)
+    for value in values:
+        histogram.add(value)
+
+    assert histogram.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+    assert histogram.count == len(values)
+    # Buckets track the range of latencies, not the number of calls
+    assert len(histogram.buckets) < 1500
+
+
+def test_merged_histograms_match_one_built_from_all_values():
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index in range(1, 200):
+        (first if index % 2 else second).add(index / 100)
+        combined.add(index / 100)
+    first.merge(second)
+
+    assert first.buckets == combined.buckets
+    assert (first.count, first.min, first.max) == (combined.count, combined.min, combined.max)
+    assert first.quantile(0.9) == combined.quantile(0.9)
+
+
+def test_snapshot_reports_per_tool_counts_and_latency():
+    stats = ToolStats()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        stats.record("web_search", seconds, success=seconds != 0.4)
+    stats.record("file_write", 0.01, success=True)
+
+    metrics = stats.snapshot()
+    assert metrics["total_tool_calls"] == 5
+    assert metrics["tool_web_search_calls"] == 4
+    assert metrics["tool_web_search_errors"] == 1
+    assert metrics["tool_web_search_error_rate"] == 0.25
+    assert metrics["tool_web_search_latency_mean"] == pytest.approx(0.25)
+    assert metrics["tool_web_search_latency_p50"] == pytest.approx(0.2, rel=0.01)
+    assert metrics["tool_web_search_latency_max"] == 0.4
+    assert metrics["tool_file_write_latency_p99"] == pytest.approx(0.01, rel=0.01)
+
+    assert stats.snapshot(only_if_changed=True) == {}
+    stats.record("file_write", 0.02, success=True)
+    assert stats.snapshot(only_if_changed=True)["tool_file_write_calls"] == 2
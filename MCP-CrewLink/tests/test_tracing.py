@@ -0,0 +1,76 @@
+import pytest
+
+from run_outputs import record_tool_usage
+from tracing import Tracer, record_span, set_tracer, span
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer(run_id="run-1")
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+
+
+def spans(tracer):
+    return {event["name"]: event["args"] for event in tracer.chrome_trace()["traceEvents"] if event["ph"] == "X"}
+
+
+def test_spans_record_their_parent(tracer):
+    with span("research_run", "run"):
+        with span("tool:web_search", "tool"):
+            with span("brave_search", "http") as http_span:
+                http_span.set(status_code=200)
+            record_span("llm_call", "llm", 0.0, 1.0)
+
+    recorded = spans(tracer)
+    assert "parent_id" not in recorded["research_run"]
+    assert recorded["tool:web_search"]["parent_id"] == recorded["research_run"]["span_id"]
+    assert recorded["brave_search"]["parent_id"] == recorded["tool:web_search"]["span_id"]
+    assert recorded["brave_search"]["status_code"] == 200
+    assert recorded["llm_call"]["parent_id"] == recorded["tool:web_search"]["span_id"]
+
+
+def test_tool_usage_completes_the_open_tool_span(tracer):
+    with span("research_run", "run"):
+        with span("tool:file_write", "tool"):
+            record_tool_usage(None, "file_write", 0.1, True)
+        # Calls outside a tool span still get one after the fact
+        record_tool_usage(None, "image_generate", 0.1, False)
+
+    recorded = [event for event in tracer.chrome_trace()["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in recorded].count("tool:file_write") == 1
+    by_name = {event["name"]: event["args"] for event in recorded}
+    assert by_name["tool:file_write"]["success"] is True
+    assert by_name["tool:image_generate"]["success"] is False
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return {"web": {"results": [{"url": "https://modelcontextprotocol.io", "title": "MCP", "description": "d"}]}}
+
+
+class FakeHttpClient:
+    def get(self, url, headers=None, params=None):
+        return FakeResponse()
+
+
+def test_http_spans_nest_under_the_tool_call(tracer, monkeypatch):
+    pytest.importorskip("crewai")
+    from research_tools import WebSearchTool
+
+    monkeypatch.setenv("BRAVE_API_KEY", "test")
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    tool = WebSearchTool(http_client=FakeHttpClient())
+    with span("research_run", "run"):
+        tool._run("Model Context Protocol")
+
+    recorded = spans(tracer)
+    tool_span = recorded["tool:web_search"]
+    assert tool_span["parent_id"] == recorded["research_run"]["span_id"]
+    assert tool_span["success"] is True
+    assert recorded["rate_limit:brave"]["parent_id"] == tool_span["span_id"]
+    assert recorded["brave_search"]["parent_id"] == tool_span["span_id"]
@@ -0,0 +1,85 @@
+from metrics_sinks import MetricsSink
+from wandb_tracker import WandBTracker, merge_metrics
+
+
+class FakeRunConfig(dict):
+    def update(self, values, allow_val_change=False):
+        assert allow_val_change
+        super().update(values)
+
+
+class FakeRun:
+    def __init__(self):
+        self.config = FakeRunConfig()
+
+
+def test_update_config_reaches_the_wandb_run():
+    tracker = WandBTracker(config={"framework": "CrewAI"}, auto_init=False, buffered=False)
+    tracker.run = FakeRun()
+    tracker.update_config({"tools_count": 5})
+
+    assert tracker.config == {"framework": "CrewAI", "tools_count": 5}
+    assert tracker.run.config == {"tools_count": 5}
+
+
+def test_default_config_counts_the_builtin_tools():
+    tracker = WandBTracker(auto_init=False, buffered=False)
+    assert tracker.config["tools_count"] == 5
+
+
+class ListSink(MetricsSink):
+    name = "list"
+
+    def __init__(self):
+        self.entries = []
+
+    def log(self, metrics, step=None):
+        self.entries.append(metrics)
+
+
+def test_merged_steps_average_rates_and_times_and_keep_the_last_counter():
+    merged = merge_metrics([
+        {"web_search_time": 1.0, "search_cache_hit_rate": 0.5, "search_cache_hits": 1},
+        {"web_search_time": 3.0, "search_cache_hit_rate": 1.0, "search_cache_hits": 2},
+    ])
+
+    assert merged == {
+        "web_search_time": 2.0,
+        "web_search_time_max": 3.0,
+        "search_cache_hit_rate": 0.75,
+        "search_cache_hits": 2,
+    }
+
+
+def test_buffered_logging_writes_nothing_until_flushed_then_keeps_order():
+    sink = ListSink()
+    tracker = WandBTracker(buffered=True, sink=sink, flush_interval=60)
+    tracker.log_tool_usage("web_search", 0.1, True, {"search_cache_hits": 1})
+    tracker.log_tool_usage("web_search", 0.2, True, {"search_cache_hits": 2})
+    tracker.log_metrics({"research_progress": 1})
+    tracker.log_tool_usage("web_search", 0.3, True, {"search_cache_hits": 3})
+    assert sink.entries == []
+
+    tracker.flush()
+
+    assert sink.entries == [
+        {"search_cache_hits": 2, "wandb_batched_entries": 2, "wandb_metrics_dropped": 0},
+        {"research_progress": 1},
+        {"search_cache_hits": 3, "wandb_batched_entries": 1, "wandb_metrics_dropped": 0},
+    ]
+    assert tracker.tool_stats.snapshot()["tool_web_search_calls"] == 3
+
+
+def test_drops_after_the_last_batch_are_reported_at_finish():
+    sink = ListSink()
+    tracker = WandBTracker(buffered=True, sink=sink, flush_interval=60, max_queue_size=1)
+    tracker.run = FakeRun()
+    tracker.run.summary = {}
+    tracker.log_metrics({"research_progress": 1})
+    for _ in range(3):
+        tracker.log_metrics({"research_progress": 2})
+    tracker.finish_run()
+
+    assert {"research_progress": 1} in sink.entries
+    assert sink.entries[-1] == {"wandb_metrics_dropped": 3}
+    assert tracker.run.summary["wandb_metrics_dropped"] == 3
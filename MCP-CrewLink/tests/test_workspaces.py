@@ -0,0 +1,127 @@
+import os
+import threading
+
+import pytest
+
+import main
+from run_outputs import current_files_dir, current_images_dir
+from workspaces import RUNNING_MARKER, Workspace, WorkspaceJanitor, get_workspaces_root, use_workspace
+
+DAY = 24 * 3600
+
+
+def test_run_ids_cannot_escape_the_workspaces_root():
+    for run_id in ("../other", "a/b", ".hidden"):
+        with pytest.raises(ValueError):
+            Workspace(run_id)
+    assert Workspace("20260101-120000-abcd1234").path == os.path.join(get_workspaces_root(), "20260101-120000-abcd1234")
+
+
+def test_concurrent_runs_only_see_their_own_outputs():
+    workspaces = [Workspace(f"run-{index}").create() for index in range(4)]
+    barrier = threading.Barrier(len(workspaces))
+    outputs = {}
+
+    def run(workspace):
+        with use_workspace(workspace):
+            barrier.wait()
+            with open(os.path.join(current_files_dir(), f"{workspace.run_id}.md"), "w") as f:
+                f.write("# Report\n")
+            with open(os.path.join(current_images_dir(), f"{workspace.run_id}.png"), "wb") as f:
+                f.write(b"png")
+            barrier.wait()
+            outputs[workspace.run_id] = main.list_generated_outputs()
+
+    threads = [threading.Thread(target=run, args=(workspace,)) for workspace in workspaces]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for workspace in workspaces:
+        file_paths, image_paths = outputs[workspace.run_id]
+        assert file_paths == [os.path.join(workspace.files_dir, f"{workspace.run_id}.md")]
+        assert image_paths == [os.path.join(workspace.images_dir, f"{workspace.run_id}.png")]
+        workspace.release()
+
+
+def finished_workspace(run_id, age, size=0, marker_pid=None):
+    workspace = Workspace(run_id).create()
+    with open(os.path.join(workspace.files_dir, "report.md"), "wb") as f:
+        f.write(b"x" * size)
+    workspace.release()
+    if marker_pid is not None:
+        with open(os.path.join(workspace.path, RUNNING_MARKER), "w") as f:
+            f.write(str(marker_pid))
+    mtime = os.path.getmtime(workspace.path) - age
+    os.utime(workspace.path, (mtime, mtime))
+    return workspace
+
+
+def dead_pid():
+    pid = os.getpid() + 1
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return pid
+        except PermissionError:
+            pass
+        pid += 1
+
+
+def test_janitor_evicts_old_runs_but_never_active_ones():
+    old = finished_workspace("old", age=2 * DAY)
+    crashed = finished_workspace("crashed", age=2 * DAY, marker_pid=dead_pid())
+    recent = finished_workspace("recent", age=60)
+    running = Workspace("running").create()
+    os.utime(running.path, (0, 0))
+
+    result = WorkspaceJanitor(max_age=DAY).sweep()
+
+    assert result["workspaces_evicted"] == 2
+    assert not os.path.exists(old.path) and not os.path.exists(crashed.path)
+    assert os.path.exists(recent.path) and os.path.exists(running.path)
+    running.release()
+
+
+def test_janitor_evicts_the_oldest_runs_over_the_size_budget():
+    oldest = finished_workspace("oldest", age=300, size=1000)
+    older = finished_workspace("older", age=200, size=1000)
+    newest = finished_workspace("newest", age=100, size=1000)
+
+    result = WorkspaceJanitor(max_age=DAY, max_bytes=1500).sweep()
+
+    assert result == {"workspaces_evicted": 2, "workspaces_kept": 1, "workspace_bytes": 1000}
+    assert not os.path.exists(oldest.path) and not os.path.exists(older.path)
+    assert os.path.exists(newest.path)
+
+
+def test_new_workspaces_are_claimed_before_their_directories_exist(monkeypatch):
+    workspace = Workspace("new-run")
+    created = []
+    makedirs = os.makedirs
+
+    def recording_makedirs(path, exist_ok=False):
+        if path.startswith(workspace.path + os.sep):
+            created.append((path, os.path.exists(os.path.join(workspace.path, RUNNING_MARKER))))
+        makedirs(path, exist_ok=exist_ok)
+
+    monkeypatch.setattr(os, "makedirs", recording_makedirs)
+    workspace.create()
+    monkeypatch.undo()
+
+    assert created == [(workspace.files_dir, True), (workspace.images_dir, True)]
+    workspace.release()
+
+
+def test_janitor_spares_workspaces_being_created():
+    finished_workspace("finished", age=300, size=1000)
+    # A concurrent run between creating its directory and writing the marker
+    unclaimed = os.path.join(get_workspaces_root(), "being-created")
+    os.makedirs(unclaimed)
+
+    result = WorkspaceJanitor(max_age=DAY, max_bytes=0).sweep()
+
+    assert result["workspaces_evicted"] == 1
+    assert os.path.exists(unclaimed)
@@ -0,0 +1,125 @@
+import math
+import threading
+from typing import Any, Dict, Optional
+
+# Reported latency quantiles
+QUANTILES = {"p50": 0.50, "p90": 0.90, "p99": 0.99}
+
+
+class LatencyHistogram:
+    """
+    Streaming latency histogram with logarithmic buckets. Every quantile is
+    within `relative_accuracy` of the true value, and memory only grows with
+    the range of latencies (about 600 buckets from 1 ms to 100 s at 1%),
+    not with the number of calls.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        index = math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same accuracy into this one."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ToolStats:
+    """
+    Per-tool call counts, error counts and latency histograms for a run.
+    Recording a call is a dictionary update under a lock; snapshot() turns
+    the aggregates into flat metrics for WandBTracker.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def record(self, tool_name: str, execution_time: float, success: bool) -> None:
+        with self._lock:
+            stats = self._tools.get(tool_name)
+            if stats is None:
+                stats = self._tools[tool_name] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "latency": LatencyHistogram(self.relative_accuracy),
+                }
+            stats["calls"] += 1
+            if not success:
+                stats["errors"] += 1
+            stats["latency"].add(execution_time)
+            self._dirty = True
+
+    def histogram(self, tool_name: str) -> Optional[LatencyHistogram]:
+        with self._lock:
+            stats = self._tools.get(tool_name)
+            return stats["latency"] if stats else None
+
+    def snapshot(self, only_if_changed: bool = False) -> Dict[str, Any]:
+        """
+        Cumulative metrics per tool: tool_<name>_calls, _errors, _error_rate and
+        _latency_mean/_p50/_p90/_p99/_max, plus total_tool_calls. With
+        only_if_changed, returns {} when nothing was recorded since the last snapshot.
+        """
+        with self._lock:
+            if only_if_changed and not self._dirty:
+                return {}
+            self._dirty = False
+            metrics: Dict[str, Any] = {}
+            total_calls = 0
+            for tool_name, stats in self._tools.items():
+                latency = stats["latency"]
+                prefix = f"tool_{tool_name}"
+                metrics[f"{prefix}_calls"] = stats["calls"]
+                metrics[f"{prefix}_errors"] = stats["errors"]
+                metrics[f"{prefix}_error_rate"] = stats["errors"] / stats["calls"]
+                metrics[f"{prefix}_latency_mean"] = latency.mean
+                for label, q in QUANTILES.items():
+                    metrics[f"{prefix}_latency_{label}"] = latency.quantile(q)
+                metrics[f"{prefix}_latency_max"] = latency.max
+                total_calls += stats["calls"]
+            metrics["total_tool_calls"] = total_calls
+            return metrics
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._dirty = False
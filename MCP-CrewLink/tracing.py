@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import asyncio
+import itertools
+import threading
+import contextvars
+from typing import Any, Dict, List, Optional
+
+# Innermost open span of the current thread or asyncio task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def tracing_enabled_by_env() -> bool:
+    return os.getenv('TRACE_RUNS', 'false').lower() == 'true'
+
+
+def _track() -> Any:
+    """Trace track of the caller: its asyncio task, or else its thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ("task", id(task), task.get_name())
+    thread = threading.current_thread()
+    return ("thread", thread.ident, thread.name)
+
+
+class Span:
+    """An open span; attributes set on it are exported as the event's args."""
+
+    def __init__(self, span_id: int, name: str, attrs: Dict[str, Any]):
+        self.span_id = span_id
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class _NoopSpan:
+    span_id = None
+    name = None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects the spans of one research run and exports them as Chrome trace
+    JSON (chrome://tracing, https://ui.perfetto.dev). Spans on the same track
+    nest by time in the viewer; each also records its parent span id.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id
+        self.pid = os.getpid()
+        self._events: List[Dict[str, Any]] = []
+        self._tracks: Dict[Any, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Thread that created the tracer: the crew's own timeline
+        self._main_track = _track()
+        # End of the last agent step (or task boundary)
+        self._last_mark: Optional[float] = None
+
+    def _tid(self, track: Any) -> int:
+        # Called with the lock held
+        tid = self._tracks.get(track[:2])
+        if tid is None:
+            tid = self._tracks[track[:2]] = len(self._tracks) + 1
+            kind, _, name = track
+            self._events.append({
+                "ph": "M", "name": "thread_name", "pid": self.pid, "tid": tid,
+                "args": {"name": name if kind == "thread" else f"asyncio {name}"},
+            })
+        return tid
+
+    def add_span(self, name: str, category: str, start: float, end: float,
+                 track: Any = None, parent: Optional[int] = None, span_id: Optional[int] = None,
+                 **attrs: Any) -> int:
+        """Record a finished span; start and end are epoch seconds."""
+        span_id = span_id or next(self._ids)
+        args = {"span_id": span_id}
+        if parent is not None:
+            args["parent_id"] = parent
+        args.update(attrs)
+        with self._lock:
+            self._events.append({
+                "ph": "X",
+                "name": name,
+                "cat": category,
+                "ts": start * 1e6,
+                "dur": max(end - start, 0.0) * 1e6,
+                "pid": self.pid,
+                "tid": self._tid(track or self._main_track),
+                "args": args,
+            })
+        return span_id
+
+    def span(self, name: str, category: str, **attrs: Any):
+        return _SpanContext(self, name, category, attrs)
+
+    def mark(self, at: Optional[float] = None) -> None:
+        """Start the next agent step here (kickoff or a task boundary)."""
+        self._last_mark = at if at is not None else time.time()
+
+    def step(self, name: str, **attrs: Any) -> None:
+        """Record an agent step from the previous step or mark to now."""
+        now = time.time()
+        start = self._last_mark if self._last_mark is not None else now
+        self._last_mark = now
+        self.add_span(name, "agent", start, now, **attrs)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self._events)
+        events.sort(key=lambda event: (event.get("ts", 0), -event.get("dur", 0)))
+        return {
+            "traceEvents": [{"ph": "M", "name": "process_name", "pid": self.pid, "tid": 0,
+                             "args": {"name": f"research run {self.run_id or ''}".strip()}}] + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run_id": self.run_id},
+        }
+
+    def export_chrome(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        return path
+
+    def span_count(self) -> int:
+        with self._lock:
+            return sum(1 for event in self._events if event["ph"] == "X")
+
+
+class _SpanContext:
+    def __init__(self, tracer: Tracer, name: str, category: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.span = Span(next(tracer._ids), name, attrs)
+
+    def __enter__(self) -> Span:
+        self.parent = _parent_id()
+        self.track = _track()
+        self.token = _current_span.set(self.span)
+        self.start = time.time()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.time()
+        _current_span.reset(self.token)
+        if exc is not None:
+            self.span.set(error=str(exc))
+        self.tracer.add_span(self.name, self.category, self.start, end, track=self.track,
+                             parent=self.parent, span_id=self.span.span_id, **self.span.attrs)
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+class _NoopContext:
+    def __enter__(self):
+        return _NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+    async def __aenter__(self):
+        return _NOOP_SPAN
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+
+_NOOP_CONTEXT = _NoopContext()
+
+# Tracer of the run in progress; None when tracing is off
+_tracer: Optional[Tracer] = None
+
+
+def _parent_id() -> Optional[int]:
+    parent = _current_span.get()
+    return parent.span_id if parent is not None else None
+
+
+def current_span() -> Optional[Span]:
+    """Innermost span open in this thread or task, or None."""
+    return _current_span.get()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, category: str, **attrs: Any):
+    """Trace a block as a span of the active tracer; a no-op when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_CONTEXT
+    return tracer.span(name, category, **attrs)
+
+
+def record_span(name: str, category: str, start: float, end: float, current_track: bool = False,
+                **attrs: Any) -> None:
+    """
+    Record a span that already finished, e.g. from a callback that only
+    reports start and end times. It goes on the run's main track unless
+    current_track is set.
+    """
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add_span(name, category, start, end, track=_track() if current_track else None,
+                        parent=_parent_id(), **attrs)
@@ -1,8 +1,37 @@
 import random
-import wandb
 import os
-from typing import Dict, Any, Optional
+import time
+import queue
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
+from metrics_sinks import MetricsSink, WandbSink, create_local_sink
+from tool_stats import ToolStats
+
+# Sinks that record metrics without the wandb service
+LOCAL_SINKS = ("jsonl", "sqlite")
+
+# Batched tool metrics: keys with these suffixes are averaged (timings also
+# get a _max), all other keys keep their latest value (counters, gauges)
+AVERAGED_SUFFIXES = ("_time", "_success", "_rate")
+
+
+def merge_metrics(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine a batch of metric dictionaries into a single wandb step."""
+    merged: Dict[str, Any] = {}
+    averaged: Dict[str, List[float]] = {}
+    for metrics in batch:
+        for key, value in metrics.items():
+            numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if numeric and key.endswith(AVERAGED_SUFFIXES):
+                averaged.setdefault(key, []).append(value)
+            else:
+                merged[key] = value
+    for key, values in averaged.items():
+        merged[key] = sum(values) / len(values)
+        if key.endswith("_time") and len(values) > 1:
+            merged[f"{key}_max"] = max(values)
+    return merged
 
 class WandBTracker:
     """
@@ -14,7 +43,13 @@ class WandBTracker:
                  entity: Optional[str] = None,
                  project: str = "demo",
                  config: Optional[Dict[str, Any]] = None,
-                 auto_init: bool = True):
+                 auto_init: bool = True,
+                 buffered: Optional[bool] = None,
+                 flush_interval: Optional[float] = None,
+                 batch_size: Optional[int] = None,
+                 max_queue_size: Optional[int] = None,
+                 sink: Optional[Union[str, MetricsSink]] = None,
+                 tool_stats_interval: Optional[float] = None):
         """
         Initialize the WandB tracker.
         
@@ -23,12 +58,44 @@ class WandBTracker:
             project: WandB project name
             config: Configuration dictionary for hyperparameters
             auto_init: Whether to automatically initialize wandb run
+            buffered: Queue metrics and log them from a background thread
+                (default: WANDB_BUFFERED, on)
+            flush_interval: Seconds between flushes (default: WANDB_FLUSH_INTERVAL, 5)
+            batch_size: Flush early once this many entries are queued (default: WANDB_BATCH_SIZE, 100)
+            max_queue_size: Entries kept before new ones are dropped (default: WANDB_MAX_QUEUE_SIZE, 10000)
+            sink: Where metrics go (default: METRICS_SINK, "auto"): "wandb", "jsonl" or
+                "sqlite" files, "auto" for wandb with a local JSONL fallback when wandb
+                cannot be reached, or a MetricsSink instance
+            tool_stats_interval: Seconds between logging the aggregated per-tool call
+                counts and latency quantiles (default: TOOL_STATS_INTERVAL, 30)
         """
         self.entity = entity or os.getenv('WANDB_ENTITY')  # Let wandb use default user entity if not specified
         self.project = project
         self.config = config or self._get_default_config()
         self.run = None
         self.is_initialized = False
+        self.sink_mode = sink or os.getenv('METRICS_SINK', 'auto')
+        self.sink: Optional[MetricsSink] = None
+        
+        # Buffered logging keeps wandb calls off the tool execution path
+        if buffered is None:
+            buffered = os.getenv('WANDB_BUFFERED', 'true').lower() == 'true'
+        self.buffered = buffered
+        self.flush_interval = flush_interval or float(os.getenv('WANDB_FLUSH_INTERVAL', '5'))
+        self.batch_size = batch_size or int(os.getenv('WANDB_BATCH_SIZE', '100'))
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Optional[int], bool]]" = queue.Queue(
+            maxsize=max_queue_size or int(os.getenv('WANDB_MAX_QUEUE_SIZE', '10000'))
+        )
+        self._log_lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop_flushing = threading.Event()
+        self.metrics_dropped = 0
+        self.steps_logged = 0
+        
+        # Per-tool counts and latency histograms, logged periodically and at finish_run
+        self.tool_stats = ToolStats(relative_accuracy=float(os.getenv('TOOL_STATS_ACCURACY', '0.01')))
+        self.tool_stats_interval = tool_stats_interval or float(os.getenv('TOOL_STATS_INTERVAL', '30'))
+        self._tool_stats_logged_at = time.monotonic()
         
         if auto_init:
             self.initialize_run()
@@ -39,14 +106,24 @@ class WandBTracker:
             "framework": "CrewAI",
             "mcp_version": "1.0.0",
             "project_type": "AI_Agent_Research",
-            "tools_count": 3,  # FileWrite, WebSearch, ImageGenerate
+            "tools_count": 5,  # FileWrite, WebSearch, WebSearchMany, ImageGenerate, ImageBatch
             "timestamp": datetime.now().isoformat(),
             "environment": "development"
         }
     
     def initialize_run(self, run_name: Optional[str] = None) -> None:
-        """Initialize a new wandb run."""
+        """Initialize a new wandb run, or a local sink if configured or wandb is unreachable."""
+        if isinstance(self.sink_mode, MetricsSink):
+            self._activate_sink(self.sink_mode)
+            print(f"📁 Recording metrics to {self.sink.name} sink")
+            return
+        if self.sink_mode in LOCAL_SINKS:
+            self._init_local_sink(self.sink_mode)
+            return
+        
         try:
+            # Imported here: wandb is slow to import and unused with local sinks
+            import wandb
             self.run = wandb.init(
                 entity=self.entity,
                 project=self.project,
@@ -54,23 +131,138 @@ class WandBTracker:
                 config=self.config,
                 reinit=True  # Allow multiple runs in same process
             )
-            self.is_initialized = True
+            self._activate_sink(WandbSink(self.run))
             print(f"✅ WandB run initialized: {self.run.name}")
             print(f"🔗 View run at: {self.run.url}")
         except Exception as e:
             print(f"❌ Failed to initialize WandB: {str(e)}")
             self.is_initialized = False
+            if self.sink_mode == "auto":
+                self._init_local_sink("jsonl")
+    
+    def _init_local_sink(self, kind: str) -> None:
+        try:
+            sink = create_local_sink(kind, self.project, self.entity, self.config)
+        except Exception as e:
+            print(f"❌ Failed to open local metrics sink: {str(e)}")
+            return
+        self._activate_sink(sink)
+        print(f"📁 Recording metrics locally to {sink.path} (replay with: python metrics_sinks.py replay {sink.path})")
+    
+    def _activate_sink(self, sink: MetricsSink) -> None:
+        self.sink = sink
+        self.is_initialized = True
+        if self.buffered:
+            self._start_flush_thread()
     
     def log_metrics(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
-        """Log metrics to wandb."""
-        if not self.is_initialized or not self.run:
+        """Log metrics to wandb. In buffered mode this only enqueues them."""
+        self._log(metrics, step, mergeable=False)
+    
+    def _log(self, metrics: Dict[str, Any], step: Optional[int], mergeable: bool) -> None:
+        if not self.is_initialized or not self.sink:
             print("⚠️ WandB not initialized. Skipping metric logging.")
             return
         
-        try:
-            self.run.log(metrics, step=step)
-        except Exception as e:
-            print(f"❌ Failed to log metrics: {str(e)}")
+        if self.buffered:
+            try:
+                self._queue.put_nowait((metrics, step, mergeable))
+            except queue.Full:
+                # Bounded memory: telemetry is dropped rather than slowing tools down
+                self.metrics_dropped += 1
+            return
+        
+        self._write(metrics, step)
+        self.sink.flush()
+    
+    def _write(self, metrics: Dict[str, Any], step: Optional[int] = None) -> None:
+        with self._log_lock:
+            try:
+                self.sink.log(metrics, step=step)
+                self.steps_logged += 1
+            except Exception as e:
+                print(f"❌ Failed to log metrics: {str(e)}")
+    
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], Optional[int], bool]]) -> None:
+        """
+        Log a batch in order. Consecutive mergeable entries (tool usage) become
+        one step; other entries keep their own step so curves stay intact.
+        """
+        pending: List[Dict[str, Any]] = []
+        
+        def write_pending():
+            if pending:
+                merged = merge_metrics(pending)
+                merged["wandb_batched_entries"] = len(pending)
+                merged["wandb_metrics_dropped"] = self.metrics_dropped
+                self._write(merged)
+                pending.clear()
+        
+        for metrics, step, mergeable in batch:
+            if mergeable and step is None:
+                pending.append(metrics)
+            else:
+                write_pending()
+                self._write(metrics, step)
+        write_pending()
+        if batch:
+            self.sink.flush()
+    
+    def _drain(self, limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], Optional[int], bool]]:
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _flush_loop(self) -> None:
+        while not self._stop_flushing.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            # Wake early when a full batch is waiting
+            while self._queue.qsize() < self.batch_size and time.monotonic() < deadline:
+                if self._stop_flushing.wait(min(0.1, self.flush_interval)):
+                    break
+            self._write_batch(self._drain())
+            self._maybe_log_tool_stats()
+    
+    def _maybe_log_tool_stats(self) -> None:
+        if time.monotonic() - self._tool_stats_logged_at >= self.tool_stats_interval:
+            self._log_tool_stats(only_if_changed=True)
+    
+    def _log_tool_stats(self, only_if_changed: bool = False) -> None:
+        self._tool_stats_logged_at = time.monotonic()
+        stats = self.tool_stats.snapshot(only_if_changed=only_if_changed)
+        if stats and self.sink:
+            self._write(stats)
+            self.sink.flush()
+    
+    def log_tool_stats(self) -> None:
+        """Log the aggregated per-tool counts and latency quantiles now."""
+        if not self.is_initialized or not self.sink:
+            print("⚠️ WandB not initialized. Skipping metric logging.")
+            return
+        self.flush_queue()
+        self._log_tool_stats()
+    
+    def _start_flush_thread(self) -> None:
+        if self._flush_thread is None:
+            self._stop_flushing.clear()
+            self._flush_thread = threading.Thread(target=self._flush_loop, name="wandb-flush", daemon=True)
+            self._flush_thread.start()
+    
+    def flush(self) -> None:
+        """Stop the background flusher and log everything still queued."""
+        if self._flush_thread is not None:
+            self._stop_flushing.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        self._write_batch(self._drain())
+    
+    def flush_queue(self) -> None:
+        """Log everything queued so far without stopping the background flusher."""
+        self._write_batch(self._drain())
     
     def log_agent_performance(self, 
                             agent_name: str,
@@ -88,14 +280,23 @@ class WandBTracker:
         
         self.log_metrics(metrics)
     
-    def log_tool_usage(self, tool_name: str, execution_time: float, success: bool) -> None:
-        """Log tool usage statistics."""
-        metrics = {
-            f"tool_{tool_name}_execution_time": execution_time,
-            f"tool_{tool_name}_success": 1 if success else 0,
-            "total_tool_calls": 1
-        }
-        self.log_metrics(metrics)
+    def log_tool_usage(self,
+                       tool_name: str,
+                       execution_time: float,
+                       success: bool,
+                       extra_metrics: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a tool call in the per-tool latency histograms. The aggregates
+        (tool_<name>_calls, _errors, _latency_p50/_p90/_p99, ...) are logged every
+        tool_stats_interval seconds and at finish_run. Tool-specific metrics such
+        as cache counters are logged as they come; in buffered mode those of one
+        flush interval are merged into a single step.
+        """
+        self.tool_stats.record(tool_name, execution_time, success)
+        if extra_metrics:
+            self._log(dict(extra_metrics), None, mergeable=True)
+        if not self.buffered and self.is_initialized and self.sink:
+            self._maybe_log_tool_stats()
     
     def log_research_progress(self, 
                             research_topic: str,
@@ -134,6 +335,15 @@ class WandBTracker:
             
             print(f"Epoch {epoch}: acc={acc:.4f}, loss={loss:.4f}")
     
+    def update_config(self, values: Dict[str, Any]) -> None:
+        """Add settings known only after the run started, e.g. the number of tools."""
+        self.config.update(values)
+        if self.run is not None:
+            try:
+                self.run.config.update(values, allow_val_change=True)
+            except Exception as e:
+                print(f"❌ Failed to update WandB config: {str(e)}")
+    
     def log_system_info(self) -> None:
         """Log system information and environment details."""
         import platform
@@ -152,16 +362,34 @@ class WandBTracker:
     
     def finish_run(self) -> None:
         """Finish the wandb run and upload any remaining data."""
-        if self.run and self.is_initialized:
+        if self.sink and self.is_initialized:
             try:
-                self.run.finish()
-                print("✅ WandB run finished successfully")
+                self.flush()
+                self._log_tool_stats()
+                self._log_dropped_metrics()
+                self.sink.close()
+                print("✅ WandB run finished successfully" if self.run else "✅ Local metrics run finished")
                 self.is_initialized = False
             except Exception as e:
                 print(f"❌ Error finishing WandB run: {str(e)}")
         else:
             print("⚠️ No active WandB run to finish")
     
+    def _log_dropped_metrics(self) -> None:
+        """
+        Report the final count of entries dropped from the full queue. Batches
+        only carry the count at their time, so drops after the last batch
+        would otherwise go unreported.
+        """
+        if not self.buffered:
+            return
+        self._write({"wandb_metrics_dropped": self.metrics_dropped})
+        if self.run is not None:
+            try:
+                self.run.summary["wandb_metrics_dropped"] = self.metrics_dropped
+            except Exception as e:
+                print(f"❌ Failed to update the run summary: {str(e)}")
+    
     def __enter__(self):
         """Context manager entry."""
         return self
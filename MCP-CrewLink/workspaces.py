@@ -0,0 +1,229 @@
+import os
+import re
+import time
+import uuid
+import shutil
+import threading
+import contextlib
+import contextvars
+from typing import Any, Dict, Iterator, List, Optional
+
+# Runs write their reports and images under workspaces/<run_id>/
+WORKSPACES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workspaces")
+# Marker file holding the pid of the process using a workspace
+RUNNING_MARKER = ".running"
+RUN_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free run id: UTC timestamp plus a random suffix."""
+    return time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + "-" + uuid.uuid4().hex[:8]
+
+
+def get_workspaces_root() -> str:
+    return os.getenv("WORKSPACES_DIR", WORKSPACES_DIR)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Workspace:
+    """
+    A directory private to one research run, with `files/` for reports and
+    `images/` for generated images. While the run is active a marker file
+    holds the owning pid so the janitor never evicts it.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, root: Optional[str] = None):
+        self.run_id = run_id or new_run_id()
+        # Run ids become directory names; never let one escape the workspaces root
+        if not RUN_ID_RE.match(self.run_id):
+            raise ValueError(f"Invalid run id: {self.run_id!r}")
+        self.path = os.path.join(root or get_workspaces_root(), self.run_id)
+        self.files_dir = os.path.join(self.path, "files")
+        self.images_dir = os.path.join(self.path, "images")
+
+    def create(self) -> "Workspace":
+        # Marker first: a janitor sweeping meanwhile must never see the workspace unclaimed
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, RUNNING_MARKER), "w") as f:
+            f.write(str(os.getpid()))
+        os.makedirs(self.files_dir, exist_ok=True)
+        os.makedirs(self.images_dir, exist_ok=True)
+        return self
+
+    def release(self) -> None:
+        """Mark the run finished; the workspace stays until the janitor evicts it."""
+        try:
+            os.remove(os.path.join(self.path, RUNNING_MARKER))
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "Workspace":
+        return self.create()
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+# Workspace of the run executing in the current thread/task
+_current_workspace: contextvars.ContextVar = contextvars.ContextVar("current_workspace", default=None)
+
+
+def set_current_workspace(workspace: Optional[Workspace]) -> contextvars.Token:
+    return _current_workspace.set(workspace)
+
+
+def reset_current_workspace(token: contextvars.Token) -> None:
+    _current_workspace.reset(token)
+
+
+def get_current_workspace() -> Optional[Workspace]:
+    return _current_workspace.get()
+
+
+@contextlib.contextmanager
+def use_workspace(workspace: Optional[Workspace]) -> Iterator[None]:
+    """Make `workspace` current for the block; None leaves the current one."""
+    if workspace is None:
+        yield
+        return
+    token = set_current_workspace(workspace)
+    try:
+        yield
+    finally:
+        reset_current_workspace(token)
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class WorkspaceJanitor:
+    """
+    Evicts finished workspaces older than `max_age` seconds, then the oldest
+    remaining ones until all workspaces fit in `max_bytes`. Workspaces whose
+    owning process is still alive are never touched, so any number of runs
+    and processes can share one workspaces directory. Neither are workspaces
+    modified in the last `grace` seconds, which may still be being created.
+    """
+
+    def __init__(self,
+                 root: Optional[str] = None,
+                 max_age: float = 24 * 3600,
+                 max_bytes: int = 1024 * 1024 * 1024,
+                 interval: float = 600,
+                 grace: float = 60):
+        self.root = root or get_workspaces_root()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.grace = grace
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _is_active(self, path: str) -> bool:
+        try:
+            with open(os.path.join(path, RUNNING_MARKER)) as f:
+                return _pid_alive(int(f.read().strip() or 0))
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def _list(self) -> List[Dict[str, Any]]:
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for run_id in os.listdir(self.root):
+            path = os.path.join(self.root, run_id)
+            if not os.path.isdir(path):
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            entries.append({
+                "run_id": run_id,
+                "path": path,
+                "mtime": mtime,
+                "size": _directory_size(path),
+                "active": self._is_active(path),
+            })
+        # Oldest first
+        entries.sort(key=lambda entry: entry["mtime"])
+        return entries
+
+    def sweep(self) -> Dict[str, int]:
+        """Run one eviction pass. Returns counts of evicted and kept workspaces."""
+        now = time.time()
+        entries = self._list()
+        total_size = sum(entry["size"] for entry in entries)
+        evicted = 0
+        freed = 0
+
+        for entry in entries:
+            if entry["active"] or now - entry["mtime"] < self.grace:
+                continue
+            too_old = now - entry["mtime"] > self.max_age
+            over_budget = total_size > self.max_bytes
+            if not (too_old or over_budget):
+                continue
+            try:
+                shutil.rmtree(entry["path"])
+            except OSError as e:
+                print(f"❌ Error removing workspace {entry['run_id']}: {e}")
+                continue
+            total_size -= entry["size"]
+            freed += entry["size"]
+            evicted += 1
+
+        if evicted:
+            print(f"🧹 Janitor evicted {evicted} workspaces ({freed / (1024 * 1024):.1f} MB)")
+        return {
+            "workspaces_evicted": evicted,
+            "workspaces_kept": len(entries) - evicted,
+            "workspace_bytes": total_size,
+        }
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"⚠️ Workspace janitor failed: {e}")
+
+    def start(self) -> "WorkspaceJanitor":
+        """Sweep once now, then keep sweeping every `interval` seconds in the background."""
+        self.sweep()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="workspace-janitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def get_workspace_janitor() -> WorkspaceJanitor:
+    """Janitor configured from WORKSPACE_MAX_AGE, WORKSPACE_MAX_BYTES and WORKSPACE_JANITOR_INTERVAL."""
+    return WorkspaceJanitor(
+        max_age=float(os.getenv("WORKSPACE_MAX_AGE", str(24 * 3600))),
+        max_bytes=int(os.getenv("WORKSPACE_MAX_BYTES", str(1024 * 1024 * 1024))),
+        interval=float(os.getenv("WORKSPACE_JANITOR_INTERVAL", "600")),
+    )
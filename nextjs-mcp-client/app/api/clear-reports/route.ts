@@ -1,16 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { readdir, unlink, stat } from 'fs/promises';
+import { readdir, unlink, stat, rm } from 'fs/promises';
 import path from 'path';
+import { MCP_PATH, getWorkspacesRoot } from '@/lib/mcpPaths';
 
 export async function POST(request: NextRequest) {
   try {
-    // Path to the MCP-CrewLink files and images directories
-    const mcpPath = path.join(process.cwd(), '..', 'MCP-CrewLink');
-    const filesDir = path.join(mcpPath, 'files');
-    const imagesDir = path.join(mcpPath, 'images');
+    // Path to the MCP-CrewLink files, images and run workspace directories
+    const filesDir = path.join(MCP_PATH, 'files');
+    const imagesDir = path.join(MCP_PATH, 'images');
+    const workspacesDir = getWorkspacesRoot();
 
     let filesRemoved = 0;
     let imagesRemoved = 0;
+    let workspacesRemoved = 0;
     const errors = [];
 
     try {
@@ -53,11 +55,35 @@ export async function POST(request: NextRequest) {
       // Images directory doesn't exist, continue
     }
 
+    try {
+      // Clear run workspaces, leaving runs that are still in progress
+      const runIds = await readdir(workspacesDir);
+
+      for (const runId of runIds) {
+        const workspacePath = path.join(workspacesDir, runId);
+        try {
+          await stat(path.join(workspacePath, '.running'));
+          continue;
+        } catch (error) {
+          // Run finished, safe to remove
+        }
+        try {
+          await rm(workspacePath, { recursive: true, force: true });
+          workspacesRemoved++;
+        } catch (error) {
+          errors.push(`Failed to remove workspace ${runId}: ${error instanceof Error ? error.message : 'Unknown error'}`);
+        }
+      }
+    } catch (error) {
+      // Workspaces directory doesn't exist, continue
+    }
+
     return NextResponse.json({
       success: true,
       message: 'Reports cleared successfully',
       filesRemoved,
       imagesRemoved,
+      workspacesRemoved,
       errors: errors.length > 0 ? errors : undefined
     });
   } catch (error) {
@@ -0,0 +1,60 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { createReadStream } from 'fs';
+import { stat } from 'fs/promises';
+import { Readable } from 'stream';
+import path from 'path';
+import { MCP_PATH, getWorkspacesRoot } from '@/lib/mcpPaths';
+
+const CONTENT_TYPES: Record<string, string> = {
+  '.png': 'image/png',
+  '.jpg': 'image/jpeg',
+  '.jpeg': 'image/jpeg',
+  '.gif': 'image/gif'
+};
+
+// Same rule as workspaces.RUN_ID_RE in MCP-CrewLink
+const RUN_ID_PATTERN = /^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$/;
+
+// Serve generated images straight from disk so results can reference them instead of inlining base64
+export async function GET(
+  request: NextRequest,
+  { params }: { params: { filename: string } }
+) {
+  const filename = path.basename(params.filename);
+  const contentType = CONTENT_TYPES[path.extname(filename).toLowerCase()];
+
+  if (filename !== params.filename || !contentType) {
+    return NextResponse.json({ error: 'Invalid image name' }, { status: 400 });
+  }
+
+  // Images of a run live in its workspace; without a run id use the shared images directory
+  const runId = request.nextUrl.searchParams.get('run');
+  if (runId !== null && !RUN_ID_PATTERN.test(runId)) {
+    return NextResponse.json({ error: 'Invalid run id' }, { status: 400 });
+  }
+
+  const imagePath = runId
+    ? path.join(getWorkspacesRoot(), runId, 'images', filename)
+    : path.join(MCP_PATH, 'images', filename);
+
+  try {
+    const imageStat = await stat(imagePath);
+    const etag = `W/"${imageStat.size.toString(16)}-${imageStat.mtimeMs.toString(16)}"`;
+
+    if (request.headers.get('if-none-match') === etag) {
+      return new Response(null, { status: 304, headers: { ETag: etag } });
+    }
+
+    const body = Readable.toWeb(createReadStream(imagePath)) as ReadableStream;
+    return new Response(body, {
+      headers: {
+        'Content-Type': contentType,
+        'Content-Length': imageStat.size.toString(),
+        'Cache-Control': 'private, max-age=0, must-revalidate',
+        ETag: etag
+      }
+    });
+  } catch (error) {
+    return NextResponse.json({ error: 'Image not found' }, { status: 404 });
+  }
+}
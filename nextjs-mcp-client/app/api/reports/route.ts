@@ -1,112 +1,134 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { readdir, readFile, stat } from 'fs/promises';
 import path from 'path';
+import { MCP_PATH, getWorkspacesRoot } from '@/lib/mcpPaths';
+
+// Load the reports and images of one files/images directory pair; runId is set for run workspaces
+async function loadReports(filesDir: string, imagesDir: string, runId?: string) {
+  const reports = [];
 
-export async function GET(request: NextRequest) {
   try {
-    // Path to the MCP-CrewLink files and images directories
-    const mcpPath = path.join(process.cwd(), '..', 'MCP-CrewLink');
-    const filesDir = path.join(mcpPath, 'files');
-    const imagesDir = path.join(mcpPath, 'images');
+    // Check if files directory exists
+    const filesStat = await stat(filesDir);
+    if (filesStat.isDirectory()) {
+      const files = await readdir(filesDir);
+      
+      for (const filename of files) {
+        if (filename.endsWith('.md') || filename.endsWith('.txt')) {
+          const filePath = path.join(filesDir, filename);
+          const content = await readFile(filePath, 'utf-8');
+          const fileStat = await stat(filePath);
+          
+          // Determine file type
+          const file_type = filename.endsWith('.md') ? 'markdown' : 'text';
+          
+          // Extract topic from filename (remove extension and format)
+          const topic = filename
+            .replace(/\.(md|txt)$/, '')
+            .replace(/_/g, ' ')
+            .replace(/\b\w/g, l => l.toUpperCase());
 
-    const reports = [];
+          reports.push({
+            id: `existing_${runId ? `${runId}_` : ''}${filename}_${fileStat.mtime.getTime()}`,
+            success: true,
+            output: `Loaded existing report: ${filename}`,
+            topic: topic,
+            query: 'Previously generated report',
+            timestamp: fileStat.mtime.toISOString(),
+            files_generated: [{
+              filename: filename,
+              content: content,
+              path: filePath,
+              file_type: file_type
+            }],
+            images_generated: [],
+            isExisting: true
+          });
+        }
+      }
+    }
+  } catch (error) {
+    // Files directory doesn't exist or is empty, continue
+  }
 
-    try {
-      // Check if files directory exists
-      const filesStat = await stat(filesDir);
-      if (filesStat.isDirectory()) {
-        const files = await readdir(filesDir);
-        
-        for (const filename of files) {
-          if (filename.endsWith('.md') || filename.endsWith('.txt')) {
-            const filePath = path.join(filesDir, filename);
-            const content = await readFile(filePath, 'utf-8');
-            const fileStat = await stat(filePath);
-            
-            // Determine file type
-            const file_type = filename.endsWith('.md') ? 'markdown' : 'text';
-            
-            // Extract topic from filename (remove extension and format)
-            const topic = filename
-              .replace(/\.(md|txt)$/, '')
+  try {
+    // Check if images directory exists and has images
+    const imagesStat = await stat(imagesDir);
+    if (imagesStat.isDirectory()) {
+      const images = await readdir(imagesDir);
+      
+      for (const imageName of images) {
+        if (imageName.match(/\.(png|jpg|jpeg|gif|svg)$/i)) {
+          const imagePath = path.join(imagesDir, imageName);
+          const imageStat = await stat(imagePath);
+          // Images are served by /api/images; only send a reference here
+          const imageRef = {
+            filename: imageName,
+            path: imagePath,
+            size_bytes: imageStat.size,
+            version: imageStat.mtimeMs.toString(16),
+            run_id: runId
+          };
+          
+          // Find corresponding report or create standalone image report
+          const correspondingReport = reports.find(report => 
+            imageName.toLowerCase().includes(report.topic.toLowerCase().replace(/\s+/g, '_'))
+          );
+          
+          if (correspondingReport) {
+            correspondingReport.images_generated.push(imageRef);
+          } else {
+            // Create standalone image report
+            const topic = imageName
+              .replace(/\.(png|jpg|jpeg|gif|svg)$/i, '')
               .replace(/_/g, ' ')
               .replace(/\b\w/g, l => l.toUpperCase());
-
+              
             reports.push({
-              id: `existing_${filename}_${fileStat.mtime.getTime()}`,
+              id: `existing_image_${runId ? `${runId}_` : ''}${imageName}_${imageStat.mtime.getTime()}`,
               success: true,
-              output: `Loaded existing report: ${filename}`,
+              output: `Loaded existing image: ${imageName}`,
               topic: topic,
-              query: 'Previously generated report',
-              timestamp: fileStat.mtime.toISOString(),
-              files_generated: [{
-                filename: filename,
-                content: content,
-                path: filePath,
-                file_type: file_type
-              }],
-              images_generated: [],
+              query: 'Previously generated image',
+              timestamp: imageStat.mtime.toISOString(),
+              files_generated: [],
+              images_generated: [imageRef],
               isExisting: true
             });
           }
         }
       }
-    } catch (error) {
-      // Files directory doesn't exist or is empty, continue
     }
+  } catch (error) {
+    // Images directory doesn't exist or is empty, continue
+  }
+
+  return reports;
+}
+
+export async function GET(request: NextRequest) {
+  try {
+    // Path to the MCP-CrewLink files, images and run workspace directories
+    const filesDir = path.join(MCP_PATH, 'files');
+    const imagesDir = path.join(MCP_PATH, 'images');
+    const workspacesDir = getWorkspacesRoot();
+
+    // Legacy shared directories, then one workspace per research run
+    const reports = await loadReports(filesDir, imagesDir);
 
     try {
-      // Check if images directory exists and has images
-      const imagesStat = await stat(imagesDir);
-      if (imagesStat.isDirectory()) {
-        const images = await readdir(imagesDir);
-        
-        for (const imageName of images) {
-          if (imageName.match(/\.(png|jpg|jpeg|gif|svg)$/i)) {
-            const imagePath = path.join(imagesDir, imageName);
-            const imageContent = await readFile(imagePath);
-            const base64 = imageContent.toString('base64');
-            const imageStat = await stat(imagePath);
-            
-            // Find corresponding report or create standalone image report
-            const correspondingReport = reports.find(report => 
-              imageName.toLowerCase().includes(report.topic.toLowerCase().replace(/\s+/g, '_'))
-            );
-            
-            if (correspondingReport) {
-              correspondingReport.images_generated.push({
-                filename: imageName,
-                base64: base64,
-                path: imagePath
-              });
-            } else {
-              // Create standalone image report
-              const topic = imageName
-                .replace(/\.(png|jpg|jpeg|gif|svg)$/i, '')
-                .replace(/_/g, ' ')
-                .replace(/\b\w/g, l => l.toUpperCase());
-                
-              reports.push({
-                id: `existing_image_${imageName}_${imageStat.mtime.getTime()}`,
-                success: true,
-                output: `Loaded existing image: ${imageName}`,
-                topic: topic,
-                query: 'Previously generated image',
-                timestamp: imageStat.mtime.toISOString(),
-                files_generated: [],
-                images_generated: [{
-                  filename: imageName,
-                  base64: base64,
-                  path: imagePath
-                }],
-                isExisting: true
-              });
-            }
-          }
-        }
+      const runIds = await readdir(workspacesDir);
+      for (const runId of runIds) {
+        const workspacePath = path.join(workspacesDir, runId);
+        if (!(await stat(workspacePath)).isDirectory()) continue;
+        reports.push(...await loadReports(
+          path.join(workspacePath, 'files'),
+          path.join(workspacePath, 'images'),
+          runId
+        ));
       }
     } catch (error) {
-      // Images directory doesn't exist or is empty, continue
+      // No run workspaces yet, continue
     }
 
     // Sort reports by timestamp (newest first)
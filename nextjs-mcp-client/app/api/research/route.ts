@@ -1,11 +1,146 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { spawn } from 'child_process';
+import net from 'net';
 import path from 'path';
 
+// Keep only the tail of the Python logs for error reporting
+const MAX_ERROR_OUTPUT = 64 * 1024;
+
+// Give up on a silent worker after this long; research jobs can take several minutes
+const WORKER_TIMEOUT_MS = Number(process.env.RESEARCH_WORKER_TIMEOUT_MS) || 15 * 60 * 1000;
+
+// Send a job to a resident `main.py --socket` worker and resolve with its response
+function runWorkerJob(socketPath: string, job: Record<string, unknown>): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const client = net.createConnection(socketPath, () => {
+      client.write(JSON.stringify(job) + '\n');
+    });
+
+    let buffer = '';
+    let settled = false;
+    const settle = (settleWith: () => void) => {
+      if (settled) return;
+      settled = true;
+      settleWith();
+    };
+
+    client.setTimeout(WORKER_TIMEOUT_MS, () => {
+      client.destroy();
+      settle(() => reject(new Error(`Research worker sent no response for ${WORKER_TIMEOUT_MS} ms`)));
+    });
+
+    client.on('data', (data) => {
+      buffer += data.toString();
+      const newlineIndex = buffer.indexOf('\n');
+      if (newlineIndex !== -1) {
+        client.end();
+        settle(() => {
+          try {
+            resolve(JSON.parse(buffer.slice(0, newlineIndex)));
+          } catch (parseError) {
+            reject(parseError);
+          }
+        });
+      }
+    });
+
+    // The worker died or hung up before a complete response line
+    client.on('close', () => {
+      settle(() => reject(new Error('Research worker closed the connection without a response')));
+    });
+
+    client.on('error', (error) => settle(() => reject(error)));
+  });
+}
+
+// Spawn `main.py --events` and call onEvent for every NDJSON event as it arrives
+function runResearchProcess(
+  topic: string,
+  query: string,
+  onEvent: (event: any, line: string) => void
+): Promise<{ code: number | null; errorOutput: string }> {
+  // Path to the MCP-CrewLink main.py file
+  const mcpPath = path.join(process.cwd(), '..', 'MCP-CrewLink');
+  const pythonScript = path.join(mcpPath, 'main.py');
+
+  return new Promise((resolve, reject) => {
+    // Images are reported by reference and served from /api/images
+    const pythonProcess = spawn('python3', [pythonScript, '--events', '--image-output', 'ref'], {
+      cwd: mcpPath,
+      env: {
+        ...process.env,
+        RESEARCH_TOPIC: topic,
+        RESEARCH_QUERY: query
+      }
+    });
+
+    let buffer = '';
+    let errorOutput = '';
+
+    pythonProcess.stdout.on('data', (data) => {
+      buffer += data.toString();
+      let newlineIndex;
+      while ((newlineIndex = buffer.indexOf('\n')) !== -1) {
+        const line = buffer.slice(0, newlineIndex).trim();
+        buffer = buffer.slice(newlineIndex + 1);
+        if (!line) continue;
+        try {
+          onEvent(JSON.parse(line), line);
+        } catch (parseError) {
+          console.warn('Skipping malformed research event:', parseError);
+        }
+      }
+    });
+
+    pythonProcess.stderr.on('data', (data) => {
+      errorOutput = (errorOutput + data.toString()).slice(-MAX_ERROR_OUTPUT);
+    });
+
+    pythonProcess.on('close', (code) => resolve({ code, errorOutput }));
+    pythonProcess.on('error', reject);
+  });
+}
+
+// Stream research events to the client as NDJSON
+function streamResearch(topic: string, query: string): Response {
+  const encoder = new TextEncoder();
+  const stream = new ReadableStream({
+    async start(controller) {
+      let finished = false;
+      try {
+        const { code, errorOutput } = await runResearchProcess(topic, query, (event, line) => {
+          if (event.type === 'done' || event.type === 'error') finished = true;
+          controller.enqueue(encoder.encode(line + '\n'));
+        });
+        if (!finished) {
+          const error = { type: 'error', error: 'Python script execution failed', details: errorOutput, code };
+          controller.enqueue(encoder.encode(JSON.stringify(error) + '\n'));
+        }
+      } catch (error) {
+        const failure = {
+          type: 'error',
+          error: 'Failed to start Python process',
+          details: error instanceof Error ? error.message : 'Unknown error'
+        };
+        controller.enqueue(encoder.encode(JSON.stringify(failure) + '\n'));
+      } finally {
+        controller.close();
+      }
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'application/x-ndjson',
+      'Cache-Control': 'no-cache'
+    }
+  });
+}
+
 export async function POST(request: NextRequest) {
   try {
-    const { topic, query } = await request.json();
-    
+    const { topic, query, stream } = await request.json();
+
     if (!topic || !query) {
       return NextResponse.json(
         { error: 'Topic and query are required' },
@@ -13,105 +148,95 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Path to the MCP-CrewLink main.py file
-    const mcpPath = path.join(process.cwd(), '..', 'MCP-CrewLink');
-    const pythonScript = path.join(mcpPath, 'main.py');
-
-    return new Promise((resolve) => {
-      const pythonProcess = spawn('python3', [pythonScript], {
-        cwd: mcpPath,
-        env: {
-          ...process.env,
-          RESEARCH_TOPIC: topic,
-          RESEARCH_QUERY: query
+    // Use the resident research worker when one is running
+    const workerSocket = process.env.RESEARCH_WORKER_SOCKET;
+    if (workerSocket) {
+      try {
+        const structuredData = await runWorkerJob(workerSocket, {
+          id: `${Date.now()}`,
+          topic,
+          query
+        });
+
+        if (!structuredData.success) {
+          return NextResponse.json(
+            {
+              error: 'Research worker job failed',
+              details: structuredData.error
+            },
+            { status: 500 }
+          );
         }
-      });
 
-      let output = '';
-      let errorOutput = '';
+        if (stream) {
+          // The worker answers in one piece; send it as a single event
+          return new Response(JSON.stringify({ type: 'done', ...structuredData }) + '\n', {
+            headers: { 'Content-Type': 'application/x-ndjson' }
+          });
+        }
 
-      pythonProcess.stdout.on('data', (data) => {
-        output += data.toString();
-      });
+        return NextResponse.json({
+          success: true,
+          output: structuredData.crew_result || '',
+          topic: topic,
+          query: query,
+          timestamp: new Date().toISOString(),
+          structured_data: structuredData,
+          files_generated: structuredData.files_generated || [],
+          images_generated: structuredData.images_generated || []
+        });
+      } catch (workerError) {
+        console.warn('Research worker unavailable, falling back to spawning main.py:', workerError);
+      }
+    }
 
-      pythonProcess.stderr.on('data', (data) => {
-        errorOutput += data.toString();
-      });
+    if (stream) {
+      return streamResearch(topic, query);
+    }
 
-      pythonProcess.on('close', (code) => {
-        if (code === 0) {
-          try {
-            // Parse structured output from Python script
-            const structuredOutputMatch = output.match(/=== STRUCTURED_OUTPUT_START ===\n([\s\S]*?)\n=== STRUCTURED_OUTPUT_END ===/);            
-            
-            if (structuredOutputMatch) {
-              const structuredData = JSON.parse(structuredOutputMatch[1]);
-              resolve(
-                NextResponse.json({
-                  success: true,
-                  output: output,
-                  topic: topic,
-                  query: query,
-                  timestamp: new Date().toISOString(),
-                  structured_data: structuredData,
-                  files_generated: structuredData.files_generated || [],
-                  images_generated: structuredData.images_generated || []
-                })
-              );
-            } else {
-              // Fallback to original format if no structured output found
-              resolve(
-                NextResponse.json({
-                  success: true,
-                  output: output,
-                  topic: topic,
-                  query: query,
-                  timestamp: new Date().toISOString(),
-                  files_generated: [],
-                  images_generated: []
-                })
-              );
-            }
-          } catch (parseError) {
-            // If JSON parsing fails, return original format
-            resolve(
-              NextResponse.json({
-                success: true,
-                output: output,
-                topic: topic,
-                query: query,
-                timestamp: new Date().toISOString(),
-                files_generated: [],
-                images_generated: [],
-                parse_error: parseError instanceof Error ? parseError.message : 'Unknown parse error'
-              })
-            );
-          }
-        } else {
-          resolve(
-            NextResponse.json(
-              {
-                error: 'Python script execution failed',
-                details: errorOutput,
-                code: code
-              },
-              { status: 500 }
-            )
-          );
-        }
+    // Assemble the classic single JSON response from the event stream
+    const files = new Map<string, any>();
+    const images = new Map<string, any>();
+    let doneEvent: any = null;
+    let errorEvent: any = null;
+
+    try {
+      const { code, errorOutput } = await runResearchProcess(topic, query, (event) => {
+        if (event.type === 'file_ready') files.set(event.filename, event);
+        else if (event.type === 'image_ready') images.set(event.filename, event);
+        else if (event.type === 'done') doneEvent = event;
+        else if (event.type === 'error') errorEvent = event;
       });
 
-      pythonProcess.on('error', (error) => {
-        resolve(
-          NextResponse.json(
-            {
-              error: 'Failed to start Python process',
-              details: error.message
-            },
-            { status: 500 }
-          )
+      if (code !== 0 || !doneEvent) {
+        return NextResponse.json(
+          {
+            error: 'Python script execution failed',
+            details: errorEvent?.error || errorOutput,
+            code: code
+          },
+          { status: 500 }
         );
-      });
+      }
+    } catch (error) {
+      return NextResponse.json(
+        {
+          error: 'Failed to start Python process',
+          details: error instanceof Error ? error.message : 'Unknown error'
+        },
+        { status: 500 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      output: doneEvent.crew_result || '',
+      topic: topic,
+      query: query,
+      timestamp: new Date().toISOString(),
+      structured_data: doneEvent,
+      files_generated: Array.from(files.values()),
+      images_generated: Array.from(images.values())
     });
   } catch (error) {
     return NextResponse.json(
@@ -122,4 +247,4 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
@@ -13,8 +13,11 @@ interface FileData {
 
 interface ImageData {
   filename: string;
-  base64: string;
+  base64?: string;
   path: string;
+  size_bytes?: number;
+  sha256?: string;
+  run_id?: string;
 }
 
 interface ResearchResult {
@@ -78,19 +81,77 @@ export default function Home() {
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ topic, query }),
+        body: JSON.stringify({ topic, query, stream: true }),
       });
 
-      const data = await response.json();
-      const resultWithId = {
-        ...data,
+      if (!response.ok || !response.body) {
+        throw new Error(`Research request failed with status ${response.status}`);
+      }
+
+      // Render files and images as soon as their events arrive
+      const result: ResearchResult = {
+        success: true,
+        output: "",
+        topic,
+        query,
+        timestamp: new Date().toISOString(),
+        files_generated: [],
+        images_generated: [],
         id: Date.now().toString() + Math.random().toString(36).substr(2, 9),
       };
+      const publish = () => {
+        const snapshot = {
+          ...result,
+          files_generated: [...(result.files_generated || [])],
+          images_generated: [...(result.images_generated || [])],
+        };
+        setCurrentResult(snapshot);
+        // Replace history with new result (since we cleared old reports)
+        setResearchHistory([snapshot]);
+      };
+      const upsert = <T extends { filename: string }>(items: T[], item: T) => {
+        const index = items.findIndex((existing) => existing.filename === item.filename);
+        if (index === -1) items.push(item);
+        else items[index] = item;
+      };
 
-      setCurrentResult(resultWithId);
-
-      // Replace history with new result (since we cleared old reports)
-      setResearchHistory([resultWithId]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let newlineIndex;
+        while ((newlineIndex = buffer.indexOf("\n")) !== -1) {
+          const line = buffer.slice(0, newlineIndex).trim();
+          buffer = buffer.slice(newlineIndex + 1);
+          if (!line) continue;
+          const event = JSON.parse(line);
+          if (event.type === "file_ready") {
+            upsert(result.files_generated!, event);
+          } else if (event.type === "image_ready") {
+            upsert(result.images_generated!, event);
+          } else if (event.type === "done") {
+            result.output = event.crew_result || "";
+            // Worker responses carry full file and image data in the done event
+            (event.files_generated || [])
+              .filter((file: FileData) => file.content !== undefined)
+              .forEach((file: FileData) => upsert(result.files_generated!, file));
+            (event.images_generated || [])
+              .filter((image: ImageData) => image.base64 !== undefined || image.sha256 !== undefined)
+              .forEach((image: ImageData) => upsert(result.images_generated!, image));
+          } else if (event.type === "error") {
+            result.success = false;
+            result.error = event.error;
+            result.details = event.details;
+          } else {
+            continue;
+          }
+          publish();
+        }
+      }
+      publish();
     } catch (error) {
       const errorResult = {
         success: false,
@@ -23,10 +23,28 @@ interface FileData {
 
 interface ImageData {
   filename: string;
-  base64: string;
+  base64?: string;
   path: string;
+  size_bytes?: number;
+  sha256?: string;
+  run_id?: string;
+  version?: string;
+  thumbnail_base64?: string;
 }
 
+// Inline images carry base64; referenced images are fetched from /api/images
+const getImageSrc = (imageData: ImageData) => {
+  if (imageData.base64) {
+    return `data:image/png;base64,${imageData.base64}`;
+  }
+  const params = new URLSearchParams();
+  if (imageData.run_id) params.set("run", imageData.run_id);
+  const version = imageData.sha256 || imageData.version;
+  if (version) params.set("v", version);
+  const query = params.toString();
+  return `/api/images/${encodeURIComponent(imageData.filename)}${query ? `?${query}` : ""}`;
+};
+
 interface ResearchResult {
   success: boolean;
   output: string;
@@ -70,6 +88,15 @@ const ResultsPanel: React.FC<ResultsPanelProps> = ({
   };
 
   const handleDownloadImage = (imageData: ImageData) => {
+    if (!imageData.base64) {
+      const a = document.createElement("a");
+      a.href = getImageSrc(imageData);
+      a.download = imageData.filename;
+      document.body.appendChild(a);
+      a.click();
+      document.body.removeChild(a);
+      return;
+    }
     const byteCharacters = atob(imageData.base64);
     const byteNumbers = new Array(byteCharacters.length);
     for (let i = 0; i < byteCharacters.length; i++) {
@@ -716,7 +743,8 @@ const ResultsPanel: React.FC<ResultsPanelProps> = ({
                           </div>
                           <div className="p-3">
                             <img
-                              src={`data:image/png;base64,${imageData.base64}`}
+                              src={getImageSrc(imageData)}
+                              loading="lazy"
                               alt={imageData.filename}
                               className="w-full h-auto rounded border"
                               style={{
@@ -0,0 +1,10 @@
+import path from 'path';
+
+// Directory of the MCP-CrewLink project; the research route runs main.py from here
+export const MCP_PATH = path.join(process.cwd(), '..', 'MCP-CrewLink');
+
+// Root of the run workspaces, resolved like workspaces.get_workspaces_root() in MCP-CrewLink:
+// WORKSPACES_DIR if set (relative to MCP-CrewLink, the Python side's working directory), else MCP-CrewLink/workspaces
+export function getWorkspacesRoot(): string {
+  return path.resolve(MCP_PATH, process.env.WORKSPACES_DIR || 'workspaces');
+}